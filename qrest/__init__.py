@@ -4,4 +4,5 @@ from .resource import JSONResource  # noqa: F401
 from .conf import APIConfig, ResourceConfig, BodyParameter, QueryParameter  # noqa: F401
 from .conf import FileParameter  # noqa: F401
 from .exception import RestClientConfigurationError  # noqa: F401
+from .retry import RetryPolicy  # noqa: F401
 from .resource import API  # noqa: F401
@@ -5,6 +5,7 @@ This module handle authentication against a variety of REST services
 
 import os
 import logging
+import threading
 from typing import Optional
 from netrc import netrc
 from urllib.parse import urlparse
@@ -14,7 +15,9 @@ from abc import ABC, abstractmethod
 
 # ================================================================================================
 # local imports
-from ..exception import RestCredentailsError
+from ..exception import RestCredentailsError, RestClientConfigurationError
+from ..utils import URLValidator
+from .cookies import SessionCookies
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,8 @@ class RESTAuthentication(ABC, requests.auth.HTTPBasicAuth):
     credentials_are_set = False
     username = None
     password = None
+    refresher: Optional["CredentialRefresher"] = None
+    session_cookies: Optional[SessionCookies] = None
 
     def __init__(self, rest_client, auth_config_object=None):
         """
@@ -44,6 +49,34 @@ class RESTAuthentication(ABC, requests.auth.HTTPBasicAuth):
 
         self.rest_client = rest_client
         self.auth_config_object = auth_config_object
+        if getattr(auth_config_object, "session_cookies", False):
+            session = getattr(rest_client, "session", None)
+            if session is None:
+                raise RestClientConfigurationError("session cookies require the session of an API")
+            self.session_cookies = SessionCookies(
+                session,
+                cookie_file=auth_config_object.cookie_file,
+                login_url=auth_config_object.login_url,
+            )
+
+    def __call__(self, r):
+        """Is called by the requests library to authenticate a request.
+
+        Adds the credentials to the request, see :meth:`add_credentials`, unless the request
+        relies on a session cookie, see :class:`SessionCookies`.
+
+        """
+        if self.session_cookies is None:
+            return self.add_credentials(r)
+        logged_in = self.session_cookies.is_logged_in(r.url)
+        if not logged_in:
+            r = self.add_credentials(r)
+        self.session_cookies.register_hook(r, self.add_credentials, logged_in)
+        return r
+
+    def add_credentials(self, r):
+        """Add the credentials to the given request, by default for HTTP basic authentication."""
+        return super().__call__(r)
 
     @property
     def login_tuple(self):
@@ -85,6 +118,121 @@ class RESTAuthentication(ABC, requests.auth.HTTPBasicAuth):
         """
         raise NotImplementedError("Define method set_credentials in subclass")
 
+    # -------------------------------------------------------------------------------
+    def refresh_credentials(self):
+        """Renew the credentials that were obtained by set_credentials, e.g. a login token.
+
+        Subclasses whose credentials expire implement this method to support a
+        :class:`CredentialRefresher`. It is called from the thread of the refresher, so it should
+        replace the credentials in a way that requests in other threads can keep using them.
+
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support refreshing")
+
+    def credentials_lifetime(self) -> Optional[float]:
+        """Return the number of seconds the current credentials are valid after they have been
+        obtained, or None if that is not known."""
+        return None
+
+    def start_refresher(self, interval: Optional[float] = None, fraction: float = 0.75):
+        """Start a :class:`CredentialRefresher` that renews the credentials in the background.
+
+        :param interval: the number of seconds between renewals. By default, the credentials are
+            renewed after the given fraction of their lifetime, see :meth:`credentials_lifetime`
+        :param fraction: the fraction of the lifetime of the credentials after which they are
+            renewed
+        :return: the started refresher
+        :raises RestClientConfigurationError: when this authentication does not support
+            refreshing or when no interval is given and the lifetime is not known
+        """
+        if type(self).refresh_credentials is RESTAuthentication.refresh_credentials:
+            raise RestClientConfigurationError(
+                f"{type(self).__name__} does not support refreshing credentials"
+            )
+        self.stop_refresher()
+        self.refresher = CredentialRefresher(self, interval=interval, fraction=fraction)
+        self.refresher.start()
+        return self.refresher
+
+    def stop_refresher(self):
+        """Stop the refresher of the credentials, if any."""
+        if self.refresher is not None:
+            self.refresher.stop()
+            self.refresher = None
+
+
+# ==========================================================================================
+class CredentialRefresher:
+    """Daemon thread that renews the credentials of a RESTAuthentication on a schedule.
+
+    The credentials are renewed before they expire, so requests do not have to wait for a login
+    when they find that the credentials have expired. A renewal that fails is logged and tried
+    again after the retry interval.
+
+    """
+
+    def __init__(
+        self,
+        authentication: RESTAuthentication,
+        interval: Optional[float] = None,
+        fraction: float = 0.75,
+        retry_interval: float = 30.0,
+    ):
+        """
+        :param authentication: the authentication whose credentials to renew
+        :param interval: the number of seconds between renewals, by default the given fraction of
+            the lifetime of the credentials
+        :param fraction: the fraction of the lifetime after which the credentials are renewed
+        :param retry_interval: the number of seconds after which a failed renewal is tried again
+        :raises RestClientConfigurationError: when the options are invalid
+        """
+        if interval is not None and interval <= 0:
+            raise RestClientConfigurationError("refresh interval must be positive")
+        if not 0 < fraction < 1:
+            raise RestClientConfigurationError("refresh fraction must be between 0 and 1")
+        self.authentication = authentication
+        self.interval = interval
+        self.fraction = fraction
+        self.retry_interval = retry_interval
+        # check that the delay is known before the thread is started
+        self._delay()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{type(authentication).__name__}-refresher", daemon=True
+        )
+
+    def _delay(self) -> float:
+        """Return the number of seconds until the next renewal."""
+        if self.interval is not None:
+            return self.interval
+        lifetime = self.authentication.credentials_lifetime()
+        if lifetime is None:
+            raise RestClientConfigurationError(
+                "refresh interval is required when the lifetime of the credentials is unknown"
+            )
+        return lifetime * self.fraction
+
+    def _run(self):
+        delay = self._delay()
+        while not self._stopped.wait(delay):
+            try:
+                self.authentication.refresh_credentials()
+                delay = self._delay()
+                logger.debug("credentials refreshed, next refresh in %.0f s", delay)
+            except Exception as e:
+                logger.warning("could not refresh credentials: %s", e)
+                delay = self.retry_interval
+
+    def start(self):
+        """Start renewing the credentials."""
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop renewing the credentials and wait for a renewal in progress to finish."""
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
 
 # ==========================================================================================
 class UserPassAuth(RESTAuthentication):
@@ -197,9 +345,7 @@ class UserPassOrNetRCAuth(RESTAuthentication):
             parent_auth = UserPassAuth(rest_client=self.rest_client)
             parent_auth.set_credentials(username=username, password=password)
         elif netrc_path:
-            parent_auth = NetRCAuth(
-                rest_client=self.rest_client, auth_config_object=self.auth_config_object
-            )
+            parent_auth = NetRCAuth(rest_client=self.rest_client)
             parent_auth.set_credentials(netrc_path=netrc_path)
         else:
             raise RestCredentailsError("not enough data is provided to login")
@@ -215,7 +361,26 @@ class AuthConfig(object):
     Configuration and validation for custom authentication schemas
     """
 
-    pass
+    session_cookies = False
+    cookie_file: Optional[str] = None
+    login_url: Optional[str] = None
+
+    def _set_session_cookies(
+        self, session_cookies: bool, cookie_file: Optional[str], login_url: Optional[str]
+    ):
+        """Validate and store the options of the reuse of session cookies, see
+        :class:`SessionCookies`."""
+        if not isinstance(session_cookies, bool):
+            raise RestClientConfigurationError("session_cookies is not True or False")
+        if not session_cookies and (cookie_file is not None or login_url is not None):
+            raise RestClientConfigurationError(
+                "cookie_file and login_url require the reuse of session cookies"
+            )
+        if login_url is not None:
+            URLValidator().check(login_url, require_path=False)
+        self.session_cookies = session_cookies
+        self.cookie_file = os.path.expanduser(cookie_file) if cookie_file else None
+        self.login_url = login_url
 
 
 # ==========================================================================================
@@ -226,9 +391,26 @@ class UserPassAuthConfig(AuthConfig):
 
     authentication_module = UserPassAuth
 
+    def __init__(
+        self,
+        session_cookies: bool = False,
+        cookie_file: Optional[str] = None,
+        login_url: Optional[str] = None,
+    ):
+        """
+        :param session_cookies: if True, the credentials are only sent until the service has set
+            a session cookie, which the session of the API then sends instead
+        :param cookie_file: the path of a file to store the session cookies in, so later
+            processes reuse the session
+        :param login_url: the URL of the login page of the service. A redirect to it, like status
+            401, means that the session has expired and the request is sent once more with
+            credentials
+        """
+        self._set_session_cookies(session_cookies, cookie_file, login_url)
+
 
 # ==========================================================================================
-class NetrcOrUserPassAuthConfig(AuthConfig):
+class NetrcOrUserPassAuthConfig(UserPassAuthConfig):
     """
     Allow authentication via NetRC or User/Password
     """
@@ -1,14 +1,25 @@
 import os
 import logging
+import stat
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
 import requests
 
 from ..exception import RestCredentailsError, RestClientConfigurationError
 from . import NetRCAuth, RESTAuthentication, AuthConfig
-from ..utils import URLValidator
+from .cookies import body_position, resend_request
+from ..utils import URLValidator, lock_file, write_file_atomically
 
 
 logger = logging.getLogger(__name__)
 
+CAS_TICKET_REUSE = ("ticket", "cookie")
+"""supported ways to reuse the authentication of a service ticket, see :class:`CasAuthConfig`"""
+
 
 class CASCredentailsError(RestCredentailsError):
     pass
@@ -19,7 +30,12 @@ class CASGrantingTicketError(CASCredentailsError):
 
 
 class CASServiceTicketError(CASCredentailsError):
-    pass
+    def __init__(self, *args, tgt: Optional[str] = None):
+        """
+        :param tgt: the TGT that the service ticket was requested with, None if there was no TGT
+        """
+        super().__init__(*args)
+        self.tgt = tgt
 
 
 # ==========================================================================================
@@ -44,7 +60,7 @@ class CASAuth(RESTAuthentication):
 
         """
 
-        super(CASAuth, self).__init__(rest_client)
+        super(CASAuth, self).__init__(rest_client, auth_config_object)
 
         config = auth_config_object
 
@@ -56,6 +72,15 @@ class CASAuth(RESTAuthentication):
         self.tgt_volatile_storage = False
         self.tgt_file_name = None
         self.__ticket_granting_ticket = None  # content of the TGT
+        # the TGT file as last read: its identity and modification time, and its content, in a
+        # single tuple so they are always replaced together
+        self._tgt_file: Optional[Tuple[Tuple[int, int, int, int], str]] = None
+        self._tgt_lock = threading.RLock()
+
+        self.ticket_reuse = getattr(config, "ticket_reuse", None)
+        self.tgt_lifetime = getattr(config, "tgt_lifetime", None)
+        self._service_ticket: Optional[str] = None  # the service ticket that is reused
+        self._lock = threading.Lock()
 
     # -------------------------------------------------------------------------------------
     def set_credentials(
@@ -121,10 +146,7 @@ class CASAuth(RESTAuthentication):
                 self.ticket_granting_ticket = ticket_granting_ticket
             except CASGrantingTicketError:
                 # the TGT was not a valid URL: reset local to None to clear out
-                logger.debug(
-                    "[CAS] was provided with unusable TGT: '%s', resettign to None"
-                    % ticket_granting_ticket
-                )
+                logger.debug("[CAS] was provided with unusable TGT, resetting to None")
                 self.ticket_granting_ticket = None
 
         else:
@@ -136,7 +158,7 @@ class CASAuth(RESTAuthentication):
 
         # if username/pass are provided, then always request a new TGT
         if self.are_valid_credentials(username, password):
-            self.ticket_granting_ticket = self.request_new_tgt(username, password)
+            self.renew_tgt(username, password, self._current_tgt())
         elif netrc_path:
             # try to get creds from parent, in case we may need it later
             # if this request fails, its ok for now
@@ -154,11 +176,11 @@ class CASAuth(RESTAuthentication):
                 raise RestCredentailsError(
                     "no username or password is provided via parameters or in netrc file"
                 )
-            self.ticket_granting_ticket = self.request_new_tgt(username, password)
+            self.renew_tgt(username, password, None)
 
         # ok, we should have a TGT, but it may be outdated or otherwise bad
         try:
-            self.request_new_service_ticket()
+            service_ticket = self.request_new_service_ticket()
         except CASServiceTicketError as e:
             # we could not get a service ticket, lets try a new tgt
             logger.debug("[CAS] could not get service ticket with old TGT, try to get a new one")
@@ -170,8 +192,9 @@ class CASAuth(RESTAuthentication):
                     'absent. Exact error msg="%s"' % str(e)
                 )
             try:
-                self.ticket_granting_ticket = self.request_new_tgt(username, password)
-                self.request_new_service_ticket()
+                # replace the TGT that failed, unless another process has already done so
+                self.renew_tgt(username, password, e.tgt)
+                service_ticket = self.request_new_service_ticket()
             except CASGrantingTicketError as e2:
                 raise RestCredentailsError(
                     '[CAS] could not get TGT while using netrc credentials. Exact error msg="%s"'
@@ -183,8 +206,33 @@ class CASAuth(RESTAuthentication):
                     'msg="%s"' % str(e2)
                 )
 
+        if self.ticket_reuse == "ticket":
+            # the service ticket that proved the TGT is the first one to reuse
+            with self._lock:
+                self._service_ticket = service_ticket
+        if self.are_valid_credentials(username, password):
+            # keep the credentials to be able to renew the TGT, see refresh_credentials
+            self.username = username
+            self.password = password
         self.credentials_are_set = True
 
+    # -------------------------------------------------------------------------------------
+    def refresh_credentials(self):
+        """Request a new TGT with the credentials of set_credentials.
+
+        Requests keep using the current TGT until the new one is stored, so they do not wait for
+        the login. See :meth:`qrest.auth.RESTAuthentication.start_refresher`.
+
+        :raises RestCredentailsError: when no username and password are available
+        """
+        if not self.are_valid_credentials(self.username, self.password):
+            raise RestCredentailsError("[CAS] no username or password available to renew the TGT")
+        self.renew_tgt(self.username, self.password, self._current_tgt())
+
+    def credentials_lifetime(self):
+        """Return the lifetime of a TGT as configured by CasAuthConfig, if any."""
+        return self.tgt_lifetime
+
     # -------------------------------------------------------------------------------------
     def request_new_service_ticket(self):
         """Retrieves the service ticket that will ultimately be used inside the
@@ -203,20 +251,20 @@ request to the REST end-point.
         else:
             body = {"service": self.service}
 
-        if not self.ticket_granting_ticket:
+        tgt = self.ticket_granting_ticket
+        if not tgt:
             logger.debug("[CAS] No granting ticket available while asking for a service ticket")
             raise CASServiceTicketError("[CAS] No granting ticket available")
 
-        response = requests.post(
-            url=self.ticket_granting_ticket, data=body, verify=self.verify_ssl
-        )
+        response = self._post(url=tgt, data=body)
         if not response.ok:
             logger.debug("[CAS] Service ticket request failed")
             raise CASServiceTicketError(
                 "Cannot authenticate against CAS service using service name '{service}'. HTTP "
                 "status code: '{status}'".format(
                     status=response.status_code, service=body["service"]
-                )
+                ),
+                tgt=tgt,
             )
 
         return response.text
@@ -229,39 +277,48 @@ request to the REST end-point.
         the request to the CAS end-point for retrieving a service ticket.
         The "tgtPath" parameter has to point to an existing location.
 
+        The TGT file is only read again when it has been replaced or modified since it was last
+        read, e.g. by another process that renewed the TGT.
+
         :return: The URL to be used for retrieving a service ticket from the CAS end-point
         :rtype: ``string_type``
         """
         if self.tgt_volatile_storage:
             if not self.__ticket_granting_ticket:
                 return None
-            logger.debug(
-                "[CAS] Reading TGT from memory: contents are '%s'", self.__ticket_granting_ticket
-            )  # printing credentials here!
             return self.__ticket_granting_ticket
         else:
             if not self.tgt_file_name:
                 logger.warning("[CAS] no tgt file path provided")
                 return None
-            elif not os.path.isfile(self.tgt_file_name):
+            try:
+                file_stat = os.stat(self.tgt_file_name)
+            except OSError:
+                file_stat = None
+            if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+                self._tgt_file = None
                 logger.warning("[CAS] File '%s' does not exist.", self.tgt_file_name)
                 dirname = os.path.dirname(self.tgt_file_name)
                 if not os.path.isdir(dirname):
                     os.mkdir(dirname, 0o700)
                 return None
+            signature = _file_signature(file_stat)
+            tgt_file = self._tgt_file
+            if tgt_file is not None and tgt_file[0] == signature:
+                return tgt_file[1]
             else:
                 with open(self.tgt_file_name, "r") as tgt_file:
                     tgt = tgt_file.read().strip()
-                logger.debug(
-                    "[CAS] Reading TGT from file: contents are '%s'", tgt
-                )  # printing credentials here!
+                logger.debug("[CAS] Read TGT from file '%s'", self.tgt_file_name)
                 if tgt == "":
+                    self._tgt_file = None
                     os.remove(self.tgt_file_name)
                     raise CASGrantingTicketError(
                         "[CAS] TGT file at '%s' was empty and has been removed."
                         % self.tgt_file_name
                     )
                 else:
+                    self._tgt_file = (signature, tgt)
                     return tgt
 
     # -------------------------------------------------------------------------------------
@@ -285,14 +342,49 @@ request to the REST end-point.
             self.__ticket_granting_ticket = tgt
         else:
             # tgt is on file on disk
-            logger.debug("[CAS] TGT URI is '%s'", tgt)
-            tgt_dir = os.path.dirname(self.tgt_file_name)
-            if not os.path.isdir(tgt_dir):
-                os.makedirs(tgt_dir)
-            if os.path.isfile(self.tgt_file_name):
-                os.remove(self.tgt_file_name)
-            with open(self.tgt_file_name, "w") as tgt_file:
-                tgt_file.write(tgt)
+            logger.debug("[CAS] Write TGT to file '%s'", self.tgt_file_name)
+            # other processes never read a partial file
+            write_file_atomically(self.tgt_file_name, tgt)
+            self._tgt_file = (_file_signature(os.stat(self.tgt_file_name)), tgt)
+
+    # -------------------------------------------------------------------------------------
+    def _current_tgt(self):
+        """Return the current TGT, or None if there is no usable TGT."""
+        try:
+            return self.ticket_granting_ticket
+        except CASGrantingTicketError:
+            return None
+
+    @contextmanager
+    def _locked_tgt(self):
+        """Context manager that holds the lock on the TGT.
+
+        The lock is held by at most a single thread of all processes that store the TGT in the
+        same file, through an advisory lock on a lock file next to it.
+
+        """
+        with self._tgt_lock:
+            if self.tgt_volatile_storage or not self.tgt_file_name:
+                yield
+                return
+            with lock_file(self.tgt_file_name + ".lock"):
+                yield
+
+    def renew_tgt(self, username, password, previous_tgt):
+        """Request and store a new TGT, unless another thread or process has replaced the given
+        previous TGT while this one waited for the lock, in which case that TGT is reused.
+
+        :param previous_tgt: the TGT that should be replaced, None if there was no TGT
+        :return: the new TGT
+        """
+        with self._locked_tgt():
+            tgt = self._current_tgt()
+            if tgt and tgt != previous_tgt:
+                logger.debug("[CAS] reuse TGT that was renewed while waiting for the lock")
+                return tgt
+            tgt = self.request_new_tgt(username, password)
+            self.ticket_granting_ticket = tgt
+            return tgt
 
     # -------------------------------------------------------------------------------------
     def request_new_tgt(self, username, password):
@@ -309,11 +401,7 @@ request to the REST end-point.
 
         logger.debug("[CAS] Renewing granting ticket")
         ticket_url = "{server}/{path}".format(server=self.server, path=self.ticket_path)
-        response = requests.post(
-            url=ticket_url,
-            data={"username": username, "password": password},
-            verify=self.verify_ssl,
-        )
+        response = self._post(url=ticket_url, data={"username": username, "password": password})
 
         if response.status_code == 401:
             raise CASGrantingTicketError(
@@ -340,11 +428,76 @@ request to the REST end-point.
         to it.
 
         """
+        if self.ticket_reuse != "ticket":
+            # without reuse, or until the service has set its session cookie, each request
+            # gets a new service ticket, see add_credentials
+            return super().__call__(r)
+
+        service_ticket, is_new = self._get_service_ticket()
+        logger.debug("[CAS] add service ticket to request header")
+        r.headers["Authorization"] = "CAS {service_ticket}".format(service_ticket=service_ticket)
+
+        r.register_hook(
+            "response",
+            partial(
+                self._handle_response,
+                service_ticket=service_ticket,
+                retry=not is_new,
+                position=body_position(r),
+            ),
+        )
+        return r
+
+    def add_credentials(self, r):
+        """Add a new service ticket to the Authorization header of the given request."""
         service_ticket = self.request_new_service_ticket()
         logger.debug("[CAS] add service ticket to request header")
         r.headers["Authorization"] = "CAS {service_ticket}".format(service_ticket=service_ticket)
         return r
 
+    # -------------------------------------------------------------------------------------
+    def _post(self, url, data):
+        """Send a POST request to the CAS server through the session of the API, if any, so
+        the connection to the CAS server is reused."""
+        session = getattr(self.rest_client, "session", None) or requests
+        return session.post(url=url, data=data, verify=self.verify_ssl)
+
+    def _get_service_ticket(self, expired: Optional[str] = None):
+        """Return the service ticket to reuse and whether it has been requested for this call.
+
+        :param expired: a service ticket that has been rejected, which is replaced by a new one
+        """
+        with self._lock:
+            if self._service_ticket is None or self._service_ticket == expired:
+                self._service_ticket = self.request_new_service_ticket()
+                return self._service_ticket, True
+            return self._service_ticket, False
+
+    def _handle_response(self, response, service_ticket, retry, position, **kwargs):
+        """Response hook that resends a request once with a new service ticket when the reused
+        service ticket has been rejected."""
+        if response.status_code != 401 or not retry:
+            return response
+
+        host = urlparse(response.request.url).netloc
+        logger.debug("[CAS] reused service ticket rejected by %s, request new ticket", host)
+
+        def add_new_service_ticket(request):
+            new_service_ticket, _ = self._get_service_ticket(expired=service_ticket)
+            request.headers["Authorization"] = "CAS {service_ticket}".format(
+                service_ticket=new_service_ticket
+            )
+            return request
+
+        return resend_request(response, add_new_service_ticket, position, **kwargs)
+
+
+# ==========================================================================================
+def _file_signature(file_stat) -> Tuple[int, int, int, int]:
+    """Return the identity, modification time and size of a file, which change when the file is
+    replaced or modified."""
+    return (file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
 
 # ==========================================================================================
 class CasAuthConfig(AuthConfig):
@@ -355,7 +508,15 @@ class CasAuthConfig(AuthConfig):
     authentication_module = CASAuth
 
     # -------------------------------------------------------------------------------------
-    def __init__(self, path, service_name):
+    def __init__(
+        self,
+        path,
+        service_name,
+        ticket_reuse=None,
+        tgt_lifetime=None,
+        cookie_file=None,
+        login_url=None,
+    ):
         """
         :param path: The absolute path for the ticket granting tickets
         :type path: ``list``
@@ -363,7 +524,42 @@ class CasAuthConfig(AuthConfig):
         :param service: The service name used to authenticate with the CAS end-point
         :type service: ``string_type``
 
+        :param ticket_reuse: How to reuse the authentication of a service ticket, if at all.
+            With "ticket", a service ticket is sent with each request until the service rejects
+            it. With "cookie", a service ticket is only sent until the service has set a session
+            cookie. By default, each request requests a new service ticket. When reused
+            authentication is rejected with status 401, the request is sent once more with a new
+            service ticket
+        :type ticket_reuse: ``string_type_or_none``
+
+        :param tgt_lifetime: The number of seconds a TGT is valid, which lets
+            :meth:`CASAuth.start_refresher` renew the TGT before it expires
+        :type tgt_lifetime: ``float_or_none``
+
+        :param cookie_file: With ticket_reuse "cookie", the path of a file to store the session
+            cookies in, so later processes reuse the session
+        :type cookie_file: ``string_type_or_none``
+
+        :param login_url: With ticket_reuse "cookie", the URL of the login page of the service. A
+            redirect to it, like status 401, means that the session has expired
+        :type login_url: ``string_type_or_none``
+
         """
 
+        if ticket_reuse is not None and ticket_reuse not in CAS_TICKET_REUSE:
+            raise RestClientConfigurationError(
+                "ticket_reuse '{}' is not supported: pick from {}".format(
+                    ticket_reuse, ", ".join(CAS_TICKET_REUSE)
+                )
+            )
+        if tgt_lifetime is not None and (
+            isinstance(tgt_lifetime, bool)
+            or not isinstance(tgt_lifetime, (int, float))
+            or tgt_lifetime <= 0
+        ):
+            raise RestClientConfigurationError("tgt_lifetime must be a positive number")
         self.path = path
         self.service_name = service_name
+        self.ticket_reuse = ticket_reuse
+        self.tgt_lifetime = tgt_lifetime
+        self._set_session_cookies(ticket_reuse == "cookie", cookie_file, login_url)
@@ -0,0 +1,205 @@
+"""
+This module lets an authentication rely on the session cookie that a service sets after a login,
+instead of logging in with every request.
+"""
+
+import json
+import logging
+import threading
+from functools import partial
+from typing import Callable, Optional
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.cookies import create_cookie, extract_cookies_to_jar
+
+from ..utils import lock_file, write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+COOKIE_FILE_FORMAT = 1
+"""version of the layout of the cookie file"""
+
+
+# ==========================================================================================
+def body_position(request) -> Optional[int]:
+    """Return the position of the streamed body of the given prepared request, if any, to be
+    able to send the body again, see :func:`resend_request`."""
+    return request.body.tell() if hasattr(request.body, "tell") else None
+
+
+def resend_request(
+    response: requests.Response, prepare: Callable, position: Optional[int], **kwargs
+) -> requests.Response:
+    """Send the request of the given response once more, from a response hook.
+
+    :param response: the response that the hook received
+    :param prepare: function that adds the credentials to a copy of the prepared request and
+        returns it
+    :param position: the position of the streamed body when the request was sent, if any, see
+        :func:`body_position`
+    :param kwargs: the keyword arguments that the hook received, which are passed to the adapter
+    :return: the response to the new request, with the given response in its history
+    """
+    if position is not None:
+        response.request.body.seek(position)
+
+    # consume the content and release the connection, as requests does for digest auth
+    response.content
+    response.close()
+    request = response.request.copy()
+    extract_cookies_to_jar(request._cookies, response.request, response.raw)
+    request.prepare_cookies(request._cookies)
+
+    request = prepare(request)
+    retry_response = response.connection.send(request, **kwargs)
+    retry_response.history.append(response)
+    retry_response.request = request
+    return retry_response
+
+
+# ==========================================================================================
+class SessionCookies:
+    """The session cookies of the hosts that an authentication has logged in to.
+
+    A request to a host with a session cookie is sent without credentials, so the session of the
+    API only sends the cookie. When the service rejects the cookie, because the session has
+    expired, the request is sent once more with credentials, after which the service sets a new
+    session cookie.
+
+    The cookies can be stored in a file, so later processes reuse the session instead of logging
+    in again. The file is read when the session cookies are created and written after each login,
+    under a lock on the file.
+
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cookie_file: Optional[str] = None,
+        login_url: Optional[str] = None,
+    ):
+        """
+        :param session: the session of the API, whose cookie jar holds the session cookies
+        :param cookie_file: the path of the file to store the session cookies in, if any
+        :param login_url: the URL of the login page of the service, if any. A redirect to a URL
+            that starts with it means that the session has expired, just like status 401
+        """
+        self.session = session
+        self.cookie_file = cookie_file
+        self.login_url = login_url
+        self._hosts = set()  # the hosts that authenticate through a session cookie
+        self._lock = threading.Lock()
+        if cookie_file is not None:
+            self.load()
+
+    # -------------------------------------------------------------------------------------
+    def is_logged_in(self, url: str) -> bool:
+        """Return True if and only if requests to the given URL rely on a session cookie."""
+        return urlparse(url).netloc in self._hosts
+
+    def is_expired(self, response: requests.Response) -> bool:
+        """Return True if and only if the given response rejects the session cookie."""
+        if response.status_code == 401:
+            return True
+        if self.login_url is None or not response.is_redirect:
+            return False
+        location = urljoin(response.url, response.headers["location"])
+        return location.startswith(self.login_url)
+
+    # -------------------------------------------------------------------------------------
+    def register_hook(self, request, login: Callable, logged_in: bool):
+        """Register the response hook that handles the session cookie of the given request.
+
+        :param request: the prepared request
+        :param login: function that adds the credentials to a prepared request
+        :param logged_in: whether the request relies on a session cookie
+        """
+        request.register_hook(
+            "response",
+            partial(
+                self._handle_response,
+                login=login,
+                logged_in=logged_in,
+                position=body_position(request),
+            ),
+        )
+
+    def _handle_response(self, response, login, logged_in, position, **kwargs):
+        """Response hook that registers a new session cookie, and that resends a request once
+        with credentials when its session cookie has been rejected."""
+        host = urlparse(response.request.url).netloc
+        if not logged_in or not self.is_expired(response):
+            if not logged_in:
+                self._register(host, response)
+            return response
+
+        logger.debug("[session] session cookie rejected by %s, login again", host)
+        with self._lock:
+            self._hosts.discard(host)
+        retry_response = resend_request(response, login, position, **kwargs)
+        self._register(host, retry_response)
+        return retry_response
+
+    def _register(self, host: str, response: requests.Response):
+        """Rely on the session cookie of the given host if the response has set one."""
+        if not response.ok or not response.cookies:
+            return
+        # the session only extracts the cookies after the hooks, so extract them here to store
+        extract_cookies_to_jar(self.session.cookies, response.request, response.raw)
+        with self._lock:
+            self._hosts.add(host)
+        if self.cookie_file is not None:
+            self.save()
+
+    # -------------------------------------------------------------------------------------
+    def load(self):
+        """Add the session cookies in the cookie file to the session.
+
+        A file that does not exist, cannot be read or has a different format is ignored, as are
+        the cookies in it that have expired.
+
+        """
+        with self._lock:
+            try:
+                with lock_file(self.cookie_file + ".lock"):
+                    with open(self.cookie_file, "r", encoding="utf-8") as cookie_file:
+                        content = json.load(cookie_file)
+                if content["format"] != COOKIE_FILE_FORMAT:
+                    return
+                cookies = [create_cookie(**cookie) for cookie in content["cookies"]]
+                hosts = set(content["hosts"])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.debug("[session] cookie file %s cannot be read: %s", self.cookie_file, e)
+                return
+            for cookie in cookies:
+                if not cookie.is_expired():
+                    self.session.cookies.set_cookie(cookie)
+            self._hosts.update(hosts)
+
+    def save(self):
+        """Store the session cookies and the hosts they authenticate in the cookie file."""
+        with self._lock:
+            content = {
+                "format": COOKIE_FILE_FORMAT,
+                "hosts": sorted(self._hosts),
+                "cookies": [
+                    {
+                        "name": cookie.name,
+                        "value": cookie.value,
+                        "domain": cookie.domain,
+                        "path": cookie.path,
+                        "secure": cookie.secure,
+                        "expires": cookie.expires,
+                        "rest": cookie._rest,
+                    }
+                    for cookie in self.session.cookies
+                ],
+            }
+            try:
+                with lock_file(self.cookie_file + ".lock"):
+                    write_file_atomically(self.cookie_file, json.dumps(content))
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(
+                    "[session] cookie file %s cannot be written: %s", self.cookie_file, e
+                )
@@ -0,0 +1,330 @@
+"""
+OAuth2 authentication with the client credentials grant: the client requests a
+bearer token from a token endpoint with its client id and secret, and sends the
+token with each request until it expires.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+from ..exception import RestClientConfigurationError, RestCredentailsError
+from ..utils import URLValidator, lock_file, write_file_atomically
+from . import AuthConfig, RESTAuthentication, UserPassOrNetRCAuth
+
+logger = logging.getLogger(__name__)
+
+
+class OAuth2TokenError(RestCredentailsError):
+    pass
+
+
+# ==========================================================================================
+class OAuth2Token:
+    """Bearer token with the time at which it expires and its lifetime."""
+
+    def __init__(
+        self,
+        access_token: str,
+        expires_at: Optional[float] = None,
+        expires_in: Optional[float] = None,
+    ):
+        """
+        :param access_token: the token to send in the Authorization header
+        :param expires_at: the time at which the token expires, in seconds since the epoch, or
+            None if the token does not expire
+        :param expires_in: the lifetime of the token in seconds, as reported by the token
+            endpoint, if known
+        """
+        self.access_token = access_token
+        self.expires_at = expires_at
+        self.expires_in = expires_in
+
+    def is_valid(self, margin: float = 0) -> bool:
+        """Return True if and only if the token does not expire in the given number of seconds.
+
+        The margin is at most half the lifetime of the token, otherwise a token with a lifetime
+        shorter than the margin would never be valid and every request would renew it.
+
+        """
+        if self.expires_at is None:
+            return True
+        if self.expires_in is not None:
+            margin = min(margin, self.expires_in / 2)
+        return time.time() + margin < self.expires_at
+
+
+# ==========================================================================================
+class OAuth2TokenCache:
+    """Cache of the token of a client that requests a new token only when the cached one is about
+    to expire.
+
+    The cache is shared by all resources of an API, and optionally by all processes that use the
+    same cache file. The file is locked while the token is renewed, so of all processes that find
+    the token expired, only one requests a new token and the others read it from the file.
+
+    """
+
+    def __init__(
+        self,
+        request_token: Callable[[], OAuth2Token],
+        key: str,
+        cache_file: Optional[str] = None,
+        expiry_margin: float = 30,
+    ):
+        """
+        :param request_token: function that requests a new token from the token endpoint
+        :param key: identifies the client and scope of the token in the cache file
+        :param cache_file: the path of the file to share the token through, if any
+        :param expiry_margin: the number of seconds before its expiry that a token is renewed, at
+            most half the lifetime of the token
+        """
+        self._request_token = request_token
+        self.key = key
+        self.cache_file = cache_file
+        self.expiry_margin = expiry_margin
+        self._token: Optional[OAuth2Token] = None
+        self._lock = threading.Lock()
+
+    @property
+    def token(self) -> Optional[OAuth2Token]:
+        """The cached token, or None if no token has been obtained yet."""
+        return self._token
+
+    def get(self) -> OAuth2Token:
+        """Return a valid token, the cached one if it does not expire within the margin."""
+        token = self._token
+        if token is not None and token.is_valid(self.expiry_margin):
+            return token
+        return self.renew(expired=token)
+
+    def renew(self, expired: Optional[OAuth2Token] = None) -> OAuth2Token:
+        """Request a new token, unless another thread or process already replaced the given
+        expired token with a valid one."""
+        with self._lock:
+            token = self._token
+            if token is not None and token is not expired and token.is_valid(self.expiry_margin):
+                return token
+            return self._replace(expired)
+
+    def refresh(self) -> OAuth2Token:
+        """Replace the cached token by a new one, or by the one in the cache file if another
+        process already replaced it."""
+        with self._lock:
+            return self._replace(self._token)
+
+    def _replace(self, expired: Optional[OAuth2Token]) -> OAuth2Token:
+        """Replace the given expired token, the caller should hold the lock."""
+        if self.cache_file is None:
+            self._token = self._request_token()
+            return self._token
+        with lock_file(self.cache_file + ".lock"):
+            token = self._read()
+            expired_token = expired.access_token if expired is not None else None
+            if token is not None and token.access_token == expired_token:
+                # no other process replaced the expired token
+                token = None
+            if token is None or not token.is_valid(self.expiry_margin):
+                token = self._request_token()
+                self._write(token)
+            self._token = token
+            return token
+
+    def _read(self) -> Optional[OAuth2Token]:
+        """Return the token in the cache file, or None if there is no token for the key."""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as cache_file:
+                content = json.load(cache_file)
+            if content["key"] != self.key:
+                return None
+            return OAuth2Token(
+                content["access_token"], content["expires_at"], content.get("expires_in")
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, token: OAuth2Token):
+        """Store the given token in the cache file."""
+        content = {
+            "key": self.key,
+            "access_token": token.access_token,
+            "expires_at": token.expires_at,
+            "expires_in": token.expires_in,
+        }
+        try:
+            write_file_atomically(self.cache_file, json.dumps(content))
+        except OSError as e:
+            logger.warning("[OAuth2] token cache %s cannot be written: %s", self.cache_file, e)
+
+
+# ==========================================================================================
+class OAuth2ClientCredentialsAuth(RESTAuthentication):
+    """
+    Subclass of the RESTAuthentication that requests bearer tokens with the OAuth2 client
+    credentials grant and adds them to the requests.
+    """
+
+    # -------------------------------------------------------------------------------------
+    def __init__(self, rest_client, auth_config_object):
+        """
+        :param rest_client: A reference to the RESTclient object
+        :param auth_config_object: The OAuth2ClientCredentialsAuthConfig
+        """
+        super().__init__(rest_client, auth_config_object)
+        config = auth_config_object
+        self.token_url = config.token_url
+        self.scope = config.scope
+        self.credentials_in_body = config.credentials_in_body
+        self.verify_ssl = getattr(getattr(rest_client, "config", None), "verify_ssl", True)
+        self.token_cache: Optional[OAuth2TokenCache] = None
+
+    # -------------------------------------------------------------------------------------
+    def set_credentials(
+        self,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        netrc_path: Optional[str] = os.path.expanduser("~/.netrc"),
+    ):
+        """Set the client credentials and request the first token, unless a valid token is
+        cached.
+
+        If no client id and secret are given, they are read from the netrc file as login and
+        password of the host of the API.
+
+        :param client_id: the id of the client
+        :param client_secret: the secret of the client
+        :param netrc_path: the path to the netrc file
+        :raises OAuth2TokenError: when no token can be obtained with the credentials
+        """
+        parent_auth = UserPassOrNetRCAuth(
+            rest_client=self.rest_client, auth_config_object=self.auth_config_object
+        )
+        try:
+            parent_auth.set_credentials(
+                netrc_path=netrc_path, username=client_id, password=client_secret
+            )
+        except (ValueError, OSError) as e:
+            raise RestCredentailsError(f"[OAuth2] no client credentials available: {e}")
+        self.username = parent_auth.username
+        self.password = parent_auth.password
+
+        config = self.auth_config_object
+        key = hashlib.sha256(
+            json.dumps([self.token_url, self.username, self.scope]).encode("utf-8")
+        ).hexdigest()
+        self.token_cache = OAuth2TokenCache(
+            self.request_new_token,
+            key,
+            cache_file=config.cache_file,
+            expiry_margin=config.expiry_margin,
+        )
+        self.token_cache.get()
+        self.credentials_are_set = True
+
+    # -------------------------------------------------------------------------------------
+    def request_new_token(self) -> OAuth2Token:
+        """Request a new token from the token endpoint.
+
+        :raises OAuth2TokenError: when the token endpoint does not return a token
+        """
+        logger.debug("[OAuth2] Requesting new token")
+        data = {"grant_type": "client_credentials"}
+        if self.scope:
+            data["scope"] = self.scope
+        auth = None
+        if self.credentials_in_body:
+            data.update({"client_id": self.username, "client_secret": self.password})
+        else:
+            auth = requests.auth.HTTPBasicAuth(self.username, self.password)
+
+        session = getattr(self.rest_client, "session", None) or requests
+        response = session.post(self.token_url, data=data, auth=auth, verify=self.verify_ssl)
+        if not response.ok:
+            raise OAuth2TokenError(
+                "[OAuth2] Cannot obtain token for client '{client}'. HTTP status code: "
+                "'{status}'".format(client=self.username, status=response.status_code)
+            )
+        try:
+            content = response.json()
+            access_token = content["access_token"]
+            expires_in = content.get("expires_in")
+            expires_in = float(expires_in) if expires_in is not None else None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise OAuth2TokenError("[OAuth2] token endpoint did not return a valid token")
+        if str(content.get("token_type", "bearer")).lower() != "bearer":
+            raise OAuth2TokenError("[OAuth2] token endpoint did not return a bearer token")
+
+        expires_at = time.time() + expires_in if expires_in is not None else None
+        return OAuth2Token(access_token, expires_at, expires_in)
+
+    # -------------------------------------------------------------------------------------
+    def refresh_credentials(self):
+        """Replace the cached token by a new one, see :meth:`start_refresher`."""
+        if self.token_cache is None:
+            raise RestCredentailsError("[OAuth2] credentials are not set")
+        self.token_cache.refresh()
+
+    def credentials_lifetime(self) -> Optional[float]:
+        """Return the lifetime of the cached token, if it expires.
+
+        The lifetime is stored with the token in the cache file, so it is also known for a token
+        that another process requested.
+
+        """
+        token = self.token_cache.token if self.token_cache is not None else None
+        return token.expires_in if token is not None else None
+
+    # -------------------------------------------------------------------------------------
+    def __call__(self, r):
+        """Add the bearer token to the Authorization header of the request."""
+        if self.token_cache is None:
+            raise RestCredentailsError("[OAuth2] credentials are not set")
+        token = self.token_cache.get()
+        r.headers["Authorization"] = "Bearer {token}".format(token=token.access_token)
+        return r
+
+
+# ==========================================================================================
+class OAuth2ClientCredentialsAuthConfig(AuthConfig):
+    """
+    Authentication with bearer tokens of the OAuth2 client credentials grant
+    """
+
+    authentication_module = OAuth2ClientCredentialsAuth
+
+    # -------------------------------------------------------------------------------------
+    def __init__(
+        self,
+        token_url: str,
+        scope: Optional[str] = None,
+        cache_file: Optional[str] = None,
+        expiry_margin: float = 30,
+        credentials_in_body: bool = False,
+    ):
+        """
+        :param token_url: the URL of the token endpoint
+        :param scope: the space-separated scopes to request the token for, if any
+        :param cache_file: the path of a file to share the token with other processes, so they do
+            not each request a token
+        :param expiry_margin: the number of seconds before it expires that a token is renewed, at
+            most half the lifetime of the token
+        :param credentials_in_body: if True, the client id and secret are sent in the body of the
+            token request instead of with HTTP basic authentication
+        """
+        URLValidator().check(token_url)
+        if not isinstance(expiry_margin, (int, float)) or expiry_margin < 0:
+            raise RestClientConfigurationError("expiry_margin must be a non-negative number")
+        if not isinstance(credentials_in_body, bool):
+            raise RestClientConfigurationError("credentials_in_body is not True or False")
+
+        self.token_url = token_url
+        self.scope = scope
+        self.cache_file = os.path.expanduser(cache_file) if cache_file else None
+        self.expiry_margin = expiry_margin
+        self.credentials_in_body = credentials_in_body
@@ -0,0 +1,224 @@
+"""This module converts the records of a response to columnar data, i.e. to a NumPy
+array per field. The records are converted in blocks, so the Python objects of at
+most a single block of records are in memory at the same time.
+
+NumPy is only required when columnar output is configured.
+
+"""
+
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# ================================================================================================
+# local imports
+from .exception import RestClientConfigurationError, RestResourceMissingContentError
+
+COLUMNAR_FORMATS = ("dict", "structured")
+"""supported formats of columnar data: a dict of arrays or a single structured array"""
+
+_BLOCK_SIZE = 4096
+
+
+# =================================================================================================
+def _import_numpy():
+    """Return the numpy module.
+
+    :raises RestClientConfigurationError: when numpy is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RestClientConfigurationError("columnar output requires numpy, which is missing")
+    return numpy
+
+
+def check_columnar_options(columnar: Optional[str], dtypes: Optional[Dict[str, Any]]):
+    """Check the options for columnar output.
+
+    :raises RestClientConfigurationError: when the options are invalid or when columnar output is
+        configured and numpy is not installed
+    """
+    if columnar is None:
+        if dtypes is not None:
+            raise RestClientConfigurationError("dtypes option requires the columnar option")
+        return
+    if columnar not in COLUMNAR_FORMATS:
+        raise RestClientConfigurationError(
+            "columnar option '{}' is not supported: pick from {}".format(
+                columnar, ", ".join(COLUMNAR_FORMATS)
+            )
+        )
+    if dtypes is not None and not isinstance(dtypes, dict):
+        raise RestClientConfigurationError("dtypes option is not a dictionary")
+    _import_numpy()
+
+
+# -------------------------------------------------------------------------------------------------
+def columns_from_rows(
+    names: List[str],
+    rows: Iterable[Sequence[Any]],
+    columnar: str,
+    dtypes: Optional[Dict[str, Any]] = None,
+    from_text: bool = False,
+):
+    """Return the given rows as columnar data.
+
+    The dtype of a column is the declared one, if any, or inferred from its values otherwise. If
+    the values are text, such as the fields of a CSV row, a column that only contains integers or
+    floating-point numbers gets an integer or float dtype and a string dtype otherwise.
+
+    :param names: the name of each column
+    :param rows: the values of each row, in the order of the names
+    :param columnar: the format of the data, one of :data:`COLUMNAR_FORMATS`
+    :param dtypes: the declared dtype of each column, by name
+    :param from_text: True if and only if the values are text
+    :raises RestResourceMissingContentError: when a row does not have a value for each column
+    """
+    numpy = _import_numpy()
+    dtypes = dtypes or {}
+    declared = [dtypes.get(name) for name in names]
+
+    blocks: List[Any] = [
+        _TextColumn(numpy) if dtype is None and from_text else [] for dtype in declared
+    ]
+    rows = iter(rows)
+    start = 0
+    while True:
+        block = list(itertools.islice(rows, _BLOCK_SIZE))
+        lengths = set(map(len, block))
+        if lengths - {len(names)}:
+            index, row = next((i, row) for i, row in enumerate(block) if len(row) != len(names))
+            raise RestResourceMissingContentError(
+                f"row {start + index} has {len(row)} values instead of {len(names)}"
+            )
+        # transpose the rows of the block to columns
+        column_values = zip(*block) if block else [[] for _ in names]
+        for dtype, column_blocks, values in zip(declared, blocks, column_values):
+            if isinstance(column_blocks, _TextColumn):
+                column_blocks.append(values)
+            else:
+                column_blocks.append(numpy.array(values, dtype=dtype))
+        if len(block) < _BLOCK_SIZE:
+            break
+        start += len(block)
+
+    columns = {}
+    for name, column_blocks in zip(names, blocks):
+        if isinstance(column_blocks, _TextColumn):
+            columns[name] = column_blocks.concatenate()
+        else:
+            columns[name] = numpy.concatenate(column_blocks)
+        column_blocks.clear()
+
+    if columnar == "structured":
+        return _to_structured(numpy, columns)
+    return columns
+
+
+def columns_from_records(
+    records: Iterable[Dict[str, Any]], columnar: str, dtypes: Optional[Dict[str, Any]] = None
+):
+    """Return the given JSON objects as columnar data with a column per key of the first object.
+
+    :raises RestResourceMissingContentError: when the records are not JSON objects or when a
+        record does not have a key of the first record
+    """
+    if not isinstance(records, (list, Iterator)):
+        raise RestResourceMissingContentError("the selected JSON section is not an array")
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        return columns_from_rows([], [], columnar, dtypes)
+    if not isinstance(first, dict):
+        raise RestResourceMissingContentError("the JSON section is not an array of objects")
+
+    names = list(first)
+
+    def iter_rows():
+        for record in itertools.chain([first], records):
+            try:
+                yield [record[name] for name in names]
+            except (KeyError, TypeError):
+                raise RestResourceMissingContentError(f"record {record} does not match {names}")
+
+    return columns_from_rows(names, iter_rows(), columnar, dtypes)
+
+
+# -------------------------------------------------------------------------------------------------
+class _TextColumn:
+    """The blocks of a column of strings whose dtype is inferred from its values.
+
+    The dtype of a column is the first of integer, float and string that all its values can be
+    converted to, so it is only settled when all blocks have been read. Each block is converted
+    to the dtype inferred so far, and also keeps its strings unless they can be recovered from
+    the converted block. As such, a column of "007" that turns out to contain text as well keeps
+    its strings instead of "7", independent of the blocks in which the values arrive.
+
+    An empty value is missing: it makes a numeric column a float column, in which it is NaN. A
+    number that can only be stored with a loss, i.e. an integer that does not fit in 64 bits or a
+    number beyond the range of a float, makes the column a string column.
+
+    """
+
+    def __init__(self, numpy):
+        self._numpy = numpy
+        self._dtypes = [numpy.int64, numpy.float64, str]
+        self.dtype = numpy.int64
+        # the converted blocks and, if they cannot be recovered from those, their strings
+        self._blocks: List[Tuple[Any, Optional[Any]]] = []
+
+    def append(self, values: Sequence[str]):
+        """Add a block with the given strings."""
+        numpy = self._numpy
+        strings = numpy.array(values, dtype=str)
+        stripped = numpy.char.strip(strings)
+        # an empty value is missing, which is NaN in a float column
+        numbers = numpy.where(stripped == "", "nan", strings)
+        start = self._dtypes.index(self.dtype)
+        for dtype in self._dtypes[start:]:
+            try:
+                block = strings if dtype is str else numbers.astype(dtype)
+            except (ValueError, OverflowError):
+                continue
+            if dtype is numpy.float64 and not self._is_exact(stripped, block):
+                continue
+            break
+        self.dtype = dtype
+        if dtype is str or self._numpy.array_equal(block.astype(str), strings):
+            strings = None
+        self._blocks.append((block, strings))
+
+    def _is_exact(self, stripped, block) -> bool:
+        """Return True if and only if the given floats do not lose the integers beyond 64 bits or
+        the numbers beyond the range of a float of the given stripped strings."""
+        numpy = self._numpy
+        unsigned = numpy.char.lstrip(stripped, "+-")
+        integers = numpy.char.isdigit(unsigned)
+        if numpy.any(numpy.abs(block[integers]) >= 2.0**63):
+            return False
+        infinite = numpy.isinf(block)
+        if numpy.any(infinite):
+            literals = numpy.isin(numpy.char.lower(unsigned[infinite]), ["inf", "infinity"])
+            return bool(numpy.all(literals))
+        return True
+
+    def concatenate(self):
+        """Return the values of all blocks as a single array of the inferred dtype."""
+        arrays = [
+            strings if self.dtype is str and strings is not None else block.astype(self.dtype)
+            for block, strings in self._blocks
+        ]
+        return self._numpy.concatenate(arrays)
+
+    def clear(self):
+        self._blocks.clear()
+
+
+def _to_structured(numpy, columns: Dict[str, Any]):
+    """Return the given dict of columns as a single structured array."""
+    dtype = [(name, column.dtype) for name, column in columns.items()]
+    length = len(next(iter(columns.values()))) if columns else 0
+    structured = numpy.empty(length, dtype=dtype)
+    for name, column in columns.items():
+        structured[name] = column
+    return structured
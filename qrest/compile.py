@@ -0,0 +1,228 @@
+"""This module generates a Python module with a specialized check and query_parameters
+function for each endpoint of a configuration module. In the generated functions,
+the checks and the assembly of the request parameters are unrolled for the
+parameters of their endpoint, so they do not have to inspect the configuration of
+every parameter on every call.
+
+Generate the module for configuration module ``mymodule`` with::
+
+  python -m qrest.compile mymodule -o mymodule_compiled.py
+
+and let the API use it with::
+
+  api = qrest.API(mymodule, compiled_module=mymodule_compiled)
+
+The generated functions only determine whether the parameters of a call are
+valid. If they are not, the generic :meth:`qrest.resource.Resource.check` raises
+the exception, so the error messages are the same.
+
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import sys
+from typing import Any, List, Optional
+
+# ================================================================================================
+# local imports
+from .resource import create_api_config
+
+_HEADER = '''"""Generated by qrest.compile from module {module}, do not edit."""
+
+from io import BufferedReader
+
+from qrest.query import Query
+
+
+def _check(self, kwargs):
+    # let the generic check raise the exception for the invalid parameters
+    return type(self).check(self, **kwargs)
+
+
+def _is_file(value):
+    return (
+        isinstance(value, tuple)
+        and len(value) == 2
+        and isinstance(value[0], str)
+        and isinstance(value[1], BufferedReader)
+    )'''
+
+
+# =================================================================================================
+def fingerprint(config) -> str:
+    """Return a fingerprint of the parts of the given ResourceConfig that the generated functions
+    depend on.
+
+    :param config: the ResourceConfig to fingerprint
+    """
+    description = [list(config.path)]
+    for key, parameter in config.parameters.items():
+        description.append(
+            [
+                key,
+                parameter.call_location,
+                parameter.name,
+                parameter.required,
+                parameter.multiple,
+                parameter.exclusion_group,
+                repr(parameter.default),
+                repr(parameter.choices),
+                json.dumps(parameter.schema, sort_keys=True, default=repr),
+            ]
+        )
+    encoded = json.dumps(description, default=repr).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def generate(imported_module) -> str:
+    """Return the source code of the module with the generated functions for the endpoints of the
+    given configuration module.
+
+    :raises RestClientConfigurationError: when the configuration is not valid
+    """
+    api_config = create_api_config(imported_module)
+
+    lines = [_HEADER.format(module=imported_module.__name__)]
+    endpoints = []
+    for name, config in api_config.endpoints.items():
+        lines.extend(_generate_endpoint(name, config))
+        endpoints.extend(
+            [
+                f"    {name!r}: (",
+                f"        {fingerprint(config)!r},",
+                f"        check_{name},",
+                f"        parameters_{name},",
+                "    ),",
+            ]
+        )
+
+    lines.extend(["", "", "ENDPOINTS = {"])
+    lines.extend(endpoints)
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------------------------------------------------------
+def _literal(value: Any) -> Optional[str]:
+    """Return the source code of the given value if it is a literal, and None otherwise."""
+    source = repr(value)
+    try:
+        if ast.literal_eval(source) == value:
+            return source
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        pass
+    return None
+
+
+def _generate_endpoint(name: str, config) -> List[str]:
+    """Return the lines of source code of the functions of the given endpoint."""
+    plan = config.validation_plan
+    parameters = config.parameters
+    single = sorted(key for key in parameters if key not in plan.multiple)
+
+    lines = [
+        "",
+        "",
+        f"# {'-' * 97}",
+        f"# endpoint {name}",
+        f"_ALL_{name} = frozenset({sorted(plan.all_parameters)!r})",
+    ]
+    if single:
+        lines.append(f"_SINGLE_{name} = frozenset({single!r})")
+    lines.extend(["", "", f"def check_{name}(self, **kwargs):"])
+
+    def if_present(key):
+        # a required parameter is always present after the check on required parameters
+        return "" if key in plan.required_set else f"{key!r} in kwargs and "
+
+    conditions = [f"not _ALL_{name}.issuperset(kwargs)"]
+    conditions.extend(f"{key!r} not in kwargs" for key in plan.required)
+    for key, choices in plan.choices.items():
+        source = _literal(tuple(choices)) or f"self.config.parameters[{key!r}].choices"
+        conditions.append(f"{if_present(key)}kwargs[{key!r}] not in {source}")
+    for key in plan.schemas:
+        conditions.append(
+            f"{if_present(key)}not self.config.parameters[{key!r}].obeys_schema(kwargs[{key!r}])"
+        )
+    groups = {}
+    for key, group in plan.groups.items():
+        groups.setdefault(group, []).append(key)
+    for keys in groups.values():
+        conditions.append(" + ".join(f"({key!r} in kwargs)" for key in keys) + " > 1")
+    for key in sorted(plan.files):
+        conditions.append(f"{if_present(key)}not _is_file(kwargs[{key!r}])")
+    for condition in conditions:
+        lines.extend([f"    if {condition}:", "        return _check(self, kwargs)"])
+
+    if single:
+        lines.extend(
+            [
+                "    for name, value in kwargs.items():",
+                f"        if isinstance(value, list) and name in _SINGLE_{name}:",
+                "            return _check(self, kwargs)",
+            ]
+        )
+
+    for key, default in plan.defaults.items():
+        source = _literal(default) or f"self.config.parameters[{key!r}].default"
+        lines.extend([f"    if {key!r} not in kwargs:", f"        kwargs[{key!r}] = {source}"])
+    lines.append("    return Query(self.name, kwargs)")
+
+    lines.extend(_generate_parameters(name, config))
+    return lines
+
+
+def _generate_parameters(name: str, config) -> List[str]:
+    """Return the lines of source code of the query_parameters function of the given endpoint."""
+    lines = [
+        "",
+        "",
+        f"def parameters_{name}(self, query):",
+        "    request = {}",
+        "    body = {}",
+        "    file = []",
+    ]
+    branches = []
+    for key, parameter in config.parameters.items():
+        if parameter.call_location == "query":
+            statement = f"request[{parameter.name!r}] = value"
+        elif parameter.call_location == "body":
+            if parameter.name:
+                statement = f"body[{parameter.name!r}] = value"
+            else:
+                statement = "body = value"
+        else:
+            statement = f"file.append(({parameter.name!r}, value))"
+        keyword = "if" if not branches else "elif"
+        branches.extend([f"        {keyword} name == {key!r}:", f"            {statement}"])
+    if branches:
+        lines.append("    for name, value in query.items():")
+        lines.extend(branches)
+    lines.append('    return {"request": request, "body": body, "file": file}')
+    return lines
+
+
+# -------------------------------------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None):
+    """Generate the module for the configuration module given on the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m qrest.compile",
+        description="generate specialized endpoint functions for a qrest configuration module",
+    )
+    parser.add_argument("module", help="the name of the configuration module to import")
+    parser.add_argument("-o", "--output", help="the file to write to, by default standard output")
+    args = parser.parse_args(argv)
+
+    source = generate(importlib.import_module(args.module))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(source)
+    else:
+        sys.stdout.write(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,22 @@
 """
 Contains the configuration classes to create a :class:`qrest.resource.API`.
 """
+import threading
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple, Type
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional
+from typing import Tuple, Type
 
 import logging
-import jsonschema
 
 # ================================================================================================
 # local imports
-from .auth import AuthConfig
-from .resource import Resource, JSONResource
+from .resource import API, Resource, JSONResource
 from .exception import RestClientConfigurationError
+from .schema import SCHEMA_BACKENDS, compile_schema
 from .utils import URLValidator
+from .json_backend import get_json_backend
+from .retry import RetryBudget, RetryPolicy
 
 # ================================================================================================
 #  Interface tweak
@@ -44,6 +48,7 @@ class ParameterConfig:
         description: Optional[str] = None,
         schema: Optional[Dict[any, any]] = None,
         example: Optional[any] = None,
+        schema_backend: str = "jsonschema",
     ):
         """
         Parameter configuration. Details the name and limitations on the REST parameter and how it
@@ -59,6 +64,9 @@ class ParameterConfig:
         :param description: any information about the parameter, such as data format
         :param schema: a jsonschema describing how the value for this parameter should be formatted
         :param example: an example value for the parameter
+        :param schema_backend: the library to validate values against the schema with, see
+            :func:`qrest.schema.compile_schema`. The schema is compiled only once, see
+            :meth:`compile`
         """
 
         self.name = name
@@ -70,6 +78,8 @@ class ParameterConfig:
         self.description = description or ""
         self.schema = schema
         self.example = example
+        self.schema_backend = schema_backend
+        self._schema_validator: Optional[Callable[[Any], bool]] = None
         self._validate()
 
     # -----------------------------------------------------------------------------------------------------
@@ -84,6 +94,10 @@ class ParameterConfig:
             raise RestClientConfigurationError('parameter "multiple" must be boolean')
         if not isinstance(self.description, str):
             raise RestClientConfigurationError('parameter "description" must be string')
+        if self.schema_backend not in SCHEMA_BACKENDS:
+            raise RestClientConfigurationError(
+                'parameter "schema_backend" must be one of {}'.format(", ".join(SCHEMA_BACKENDS))
+            )
 
         if self.exclusion_group:
             if not isinstance(self.exclusion_group, str):
@@ -111,25 +125,40 @@ class ParameterConfig:
         if self.schema is not None:
             if not isinstance(self.schema, dict):
                 raise RestClientConfigurationError("parameter schema must be dict")
-            try:
-                #  Select the correct validator for the provided schema
-                schema_validator_cls = jsonschema.validators.validator_for(self.schema)
-                schema_validator_cls.check_schema(self.schema)
-            except jsonschema.SchemaError:
-                raise RestClientConfigurationError("provided schema is not a valid schema")
-            if self.example is not None:
-                try:
-                    schema_validator_cls(self.schema).validate(self.example)
-                except jsonschema.ValidationError:
-                    raise RestClientConfigurationError("example does not obey schema")
-            if self.default is not None:
-                try:
-                    schema_validator_cls(self.schema).validate(self.default)
-                except jsonschema.ValidationError:
-                    raise RestClientConfigurationError("default does not obey schema")
             if self.choices is not None:
                 raise RestClientConfigurationError("choices and schema can't be combined")
 
+    # -----------------------------------------------------------------------------------------------------
+    def compile(self):
+        """Compile the schema, if any, and check that the example and default obey it.
+
+        The schema is compiled once, when the ResourceConfig of the parameter is validated or
+        when a value is checked against it for the first time. As such, a configuration module
+        can be imported without compiling the schemas of endpoints that are not used.
+
+        :raises RestClientConfigurationError: when the schema is not valid or when the example or
+            the default does not obey it
+        """
+        if self.schema is None or self._schema_validator is not None:
+            return
+        schema_validator = compile_schema(self.schema, self.schema_backend)
+        if self.example is not None:
+            if not schema_validator(self.example):
+                raise RestClientConfigurationError("example does not obey schema")
+        if self.default is not None:
+            if not schema_validator(self.default):
+                raise RestClientConfigurationError("default does not obey schema")
+        self._schema_validator = schema_validator
+
+    # -----------------------------------------------------------------------------------------------------
+    def obeys_schema(self, value: Any) -> bool:
+        """Return True if and only if the parameter has no schema or the given value obeys it."""
+        if self.schema is None:
+            return True
+        if self._schema_validator is None:
+            self.compile()
+        return self._schema_validator(value)
+
 
 # ================================================================================================
 class QueryParameter(ParameterConfig):
@@ -206,6 +235,54 @@ class FileParameter(ParameterConfig):
             )
 
 
+# ================================================================================================
+class ValidationPlan(NamedTuple):
+    """Immutable summary of a ResourceConfig that is used to validate the parameters of a call.
+
+    The plan is compiled once from the ResourceConfig, so the validation of a call does not have
+    to rebuild the lists and dicts of the ResourceConfig properties.
+
+    """
+
+    all_parameters: FrozenSet[str]
+    """the names of all parameters, including the path parameters"""
+
+    config_parameters: FrozenSet[str]
+    """the names of the query, body and file parameters"""
+
+    path_parameters: FrozenSet[str]
+    """the names of the path parameters"""
+
+    required: Tuple[str, ...]
+    """the names of the required parameters, in the order in which they are checked"""
+
+    required_set: FrozenSet[str]
+    """the names of the required parameters"""
+
+    multiple: FrozenSet[str]
+    """the names of the parameters whose value can be a list"""
+
+    groups: Mapping[str, str]
+    """exclusion group of each parameter that belongs to an exclusion group"""
+
+    choices: Mapping[str, list]
+    """choices of each parameter that has a list of choices"""
+
+    schemas: Mapping[str, "ParameterConfig"]
+    """config of each parameter that has a schema"""
+
+    files: FrozenSet[str]
+    """the names of the file parameters"""
+
+    defaults: Mapping[str, object]
+    """default value of each parameter that has one"""
+
+    @property
+    def is_simple(self) -> bool:
+        """True if and only if no parameter uses choices, a schema, a group or a file."""
+        return not (self.choices or self.schemas or self.groups or self.files)
+
+
 # ================================================================================================
 class ResourceConfig:
     """contain and validate details for a REST endpoint. Effectively this creates
@@ -224,6 +301,7 @@ class ResourceConfig:
         description: Optional[str] = None,
         path_description: Optional[Dict[str, str]] = None,
         timeout: Tuple[int, int] = (0, 0),
+        retry: Optional[RetryPolicy] = None,
     ):
         """
         Constructor, stores externally supplied parameters and validate the quality of it
@@ -246,8 +324,36 @@ class ResourceConfig:
             read timeout), where both timeouts are an integer, indicating the timeout duration
             in milliseconds. A timeout of 0 (default) indicates that there shouldn't be a timeout
             on the request.
+        :param retry: the policy to retry failed requests with. If None, the retry policy of the
+            APIConfig is used
 
         """
+        self._assign(
+            path,
+            method,
+            parameters,
+            headers,
+            processor,
+            description,
+            path_description,
+            timeout,
+            retry,
+        )
+        self.validate()
+
+    def _assign(
+        self,
+        path,
+        method,
+        parameters,
+        headers,
+        processor,
+        description,
+        path_description,
+        timeout,
+        retry=None,
+    ):
+        """Store the given arguments of the constructor without validating them."""
         self.path = path
         self.description = description
         self.path_description: Dict[str, str] = (
@@ -257,6 +363,7 @@ class ResourceConfig:
         self.parameters = parameters or {}
         self.headers = headers
         self.timeout = timeout
+        self.retry = retry
 
         if processor is not None:
             if not isinstance(processor, Resource):
@@ -266,12 +373,85 @@ class ResourceConfig:
         # avoid that, we use a new Resource instance that is created in the
         # same way as the given one.
         self.processor = processor.create_new() if processor is not None else JSONResource()
-        self.validate()
+        self._validation_plan: Optional[ValidationPlan] = None
 
     @classmethod
     def create(cls):
         """Return a ResourceConfig initialized from its class attributes.
 
+        :raises RestClientConfigurationError: when one of the required
+            class attributes ``method`` or ``path`` is missing
+
+        """
+        args, kwargs = cls._class_arguments()
+        return cls(*args, **kwargs)
+
+    @classmethod
+    def restore(cls, state: dict):
+        """Return a ResourceConfig initialized from its class attributes and the given state of a
+        validated ResourceConfig of the same class, without validating it again.
+
+        :param state: the state returned by :meth:`get_state`
+        :raises KeyError: when the state is not complete
+        """
+        args, kwargs = cls._class_arguments()
+        config = cls.__new__(cls)
+        kwargs.setdefault("parameters", None)
+        kwargs["headers"] = dict(state["headers"])
+        kwargs["timeout"] = tuple(state["timeout"])
+        for attribute in ["processor", "description", "path_description"]:
+            kwargs.setdefault(attribute, None)
+        config._assign(*args, **kwargs)
+
+        plan = state["plan"]
+        parameters = config.parameters
+        config._validation_plan = ValidationPlan(
+            all_parameters=frozenset(plan["all_parameters"]),
+            config_parameters=frozenset(plan["config_parameters"]),
+            path_parameters=frozenset(plan["path_parameters"]),
+            required=tuple(plan["required"]),
+            required_set=frozenset(plan["required"]),
+            multiple=frozenset(plan["multiple"]),
+            groups=MappingProxyType(
+                {key: parameters[key].exclusion_group for key in plan["groups"]}
+            ),
+            choices=MappingProxyType({key: parameters[key].choices for key in plan["choices"]}),
+            schemas=MappingProxyType({key: parameters[key] for key in plan["schemas"]}),
+            files=frozenset(plan["files"]),
+            defaults=MappingProxyType({key: parameters[key].default for key in plan["defaults"]}),
+        )
+        return config
+
+    def get_state(self) -> dict:
+        """Return the state of the current, validated ResourceConfig as JSON-serializable data.
+
+        The state contains the settings that may differ from the class attributes, such as the
+        headers after the defaults of the APIConfig are applied, and the names of the parameters
+        in its :class:`ValidationPlan`. See :meth:`restore`.
+
+        """
+        plan = self.validation_plan
+        return {
+            "headers": self.headers,
+            "timeout": list(self.timeout),
+            "plan": {
+                "all_parameters": sorted(plan.all_parameters),
+                "config_parameters": sorted(plan.config_parameters),
+                "path_parameters": sorted(plan.path_parameters),
+                "required": list(plan.required),
+                "multiple": sorted(plan.multiple),
+                "groups": list(plan.groups),
+                "choices": list(plan.choices),
+                "schemas": list(plan.schemas),
+                "files": sorted(plan.files),
+                "defaults": list(plan.defaults),
+            },
+        }
+
+    @classmethod
+    def _class_arguments(cls) -> Tuple[list, dict]:
+        """Return the arguments of the constructor that are set as class attributes.
+
         :raises RestClientConfigurationError: when one of the required
             class attributes ``method`` or ``path`` is missing
 
@@ -290,6 +470,7 @@ class ResourceConfig:
             "headers",
             "path_description",
             "processor",
+            "retry",
             "timeout",
         ]
 
@@ -303,7 +484,7 @@ class ResourceConfig:
                 parameters = kwargs.setdefault("parameters", {})
                 parameters[attribute_name] = attribute
 
-        return cls(*args, **kwargs)
+        return args, kwargs
 
     # ----------------------------------------------------
     def validate(self):
@@ -315,6 +496,8 @@ class ResourceConfig:
         :raises RestClientConfigurationError: No response is provided if there is no problem
 
         """
+        # the configuration may have changed since the plan was compiled
+        self._validation_plan = None
 
         # description --------------------
         if self.description and not isinstance(self.description, str):
@@ -346,6 +529,7 @@ class ResourceConfig:
                 raise RestClientConfigurationError(
                     "Parameter '%s' must be ParameterConfig instance" % str(key)
                 )
+            val.compile()
 
         # timeout -----------------------------
         err_msg = (
@@ -366,6 +550,10 @@ class ResourceConfig:
             else:
                 raise RestClientConfigurationError(err_msg)
 
+        # retry policy -----------------------------
+        if self.retry is not None and not isinstance(self.retry, RetryPolicy):
+            raise RestClientConfigurationError("retry must be a RetryPolicy")
+
         #  resource class ----------------------------------
         if self.processor:
             if not isinstance(self.processor, Resource):
@@ -409,6 +597,50 @@ class ResourceConfig:
         # re-validate to be sure current data is OK
         self.validate()
 
+    # ---------------------------------------------------------------------------------------------
+    def compile(self) -> ValidationPlan:
+        """Compile and return the plan to validate the parameters of a call.
+
+        The plan is stored, so it is compiled only once, unless the configuration is validated
+        again.
+
+        """
+        path_parameters = self.path_parameters
+        parameters = self.parameters
+        self._validation_plan = ValidationPlan(
+            all_parameters=frozenset(self.all_parameters),
+            config_parameters=frozenset(parameters),
+            path_parameters=frozenset(path_parameters),
+            required=tuple(self.required_parameters),
+            required_set=frozenset(self.required_parameters),
+            multiple=frozenset(self.multiple_parameters),
+            groups=MappingProxyType(
+                {
+                    key: item.exclusion_group
+                    for key, item in parameters.items()
+                    if item.exclusion_group
+                }
+            ),
+            choices=MappingProxyType(
+                {key: item.choices for key, item in parameters.items() if item.choices}
+            ),
+            schemas=MappingProxyType(
+                {key: item for key, item in parameters.items() if item.schema}
+            ),
+            files=frozenset(
+                key for key, item in parameters.items() if item.call_location == "file"
+            ),
+            defaults=MappingProxyType(self.defaults),
+        )
+        return self._validation_plan
+
+    @property
+    def validation_plan(self) -> ValidationPlan:
+        """The plan to validate the parameters of a call, see :meth:`compile`."""
+        if self._validation_plan is None:
+            return self.compile()
+        return self._validation_plan
+
     # ---------------------------------------------------------------------------------------------
     @property
     def path_parameters(self) -> List[str]:
@@ -543,6 +775,56 @@ class ResourceConfig:
         return defaults
 
 
+# ==================================================================================================
+class LazyEndpoints(Mapping):
+    """Read-only mapping of endpoint name to ResourceConfig that creates each ResourceConfig on
+    first access.
+
+    An APIConfig that is created for a LazyEndpoints does not create and validate all its
+    endpoints at once, but only an endpoint that is requested, so the cost of an API does not
+    depend on the number of endpoints it could use but on the number of endpoints it does use.
+
+    """
+
+    def __init__(self, config_classes: Dict[str, Type[ResourceConfig]]):
+        """
+        :param config_classes: the ResourceConfig subclass of each endpoint, by name, see
+            :meth:`ResourceConfig.create`
+        """
+        self._config_classes = dict(config_classes)
+        self._endpoints: Dict[str, ResourceConfig] = {}
+        self._lock = threading.Lock()
+        self.prepare: Optional[Callable[[ResourceConfig], None]] = None
+        """function that is called for each ResourceConfig after its creation"""
+
+    def __getitem__(self, name: str) -> ResourceConfig:
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            config_class = self._config_classes[name]
+            with self._lock:
+                endpoint = self._endpoints.get(name)
+                if endpoint is None:
+                    endpoint = config_class.create()
+                    if self.prepare is not None:
+                        self.prepare(endpoint)
+                    self._endpoints[name] = endpoint
+        return endpoint
+
+    def __contains__(self, name) -> bool:
+        # unlike the check of Mapping, this check does not create the ResourceConfig
+        return name in self._config_classes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._config_classes)
+
+    def __len__(self) -> int:
+        return len(self._config_classes)
+
+    def is_created(self, name: str) -> bool:
+        """Return True if and only if the ResourceConfig of the given endpoint has been created."""
+        return name in self._endpoints
+
+
 # ==================================================================================================
 class APIConfig:
     """
@@ -557,19 +839,64 @@ class APIConfig:
     verify_ssl = False
     """False if and only if verification of the SSL certificate should be ignored"""
 
+    pool_connections = 10
+    """number of connection pools, i.e. hosts, the session of the API keeps connections for"""
+
+    pool_maxsize = 10
+    """maximum number of connections the session of the API keeps open per host"""
+
+    pool_block = False
+    """True if and only if a request should wait for a free connection when the pool is full"""
+
+    keep_alive = True
+    """False if and only if each connection should be closed after its response"""
+
+    json_backend = None
+    """name of the JSON library to encode and decode JSON with, by default the fastest one"""
+
+    retry: Optional[RetryPolicy] = None
+    """policy to retry failed requests with, unless the endpoint sets its own, by default None"""
+
+    retry_budget: Optional[float] = 0.2
+    """maximum ratio of retries to requests of the API, see RetryBudget, or None for no limit"""
+
+    retry_budget_reserve = 10
+    """number of retries the API can do at once, before the ratio of the retry budget applies"""
+
     endpoints: Dict[str, ResourceConfig]
 
-    def __init__(self, endpoints: Dict[str, ResourceConfig]):
+    def __init__(self, endpoints: Mapping[str, ResourceConfig], validated: bool = False):
         """Configure and validate the current APIConfig for the given endpoints.
 
+        If the endpoints are a :class:`LazyEndpoints`, each endpoint is configured and validated
+        when it is requested for the first time.
+
+        :param validated: if True, the endpoints have been configured, validated and compiled
+            already, for example because they are restored from a cache, and only the settings of
+            the API are validated
         :raises RestClientConfigurationError: when validation fails
 
         """
         if not endpoints:
             raise RestClientConfigurationError("no endpoints defined for this REST client at all!")
         self.endpoints = endpoints
+        if validated or isinstance(endpoints, LazyEndpoints):
+            self._validate()
+            if isinstance(endpoints, LazyEndpoints):
+                endpoints.prepare = self._prepare_endpoint
+            return
         self._apply_defaults()
         self._validate()
+        for endpoint in self.endpoints.values():
+            endpoint.compile()
+
+    def _prepare_endpoint(self, endpoint: ResourceConfig):
+        """Apply the default settings to the given endpoint and compile it."""
+        if "default_headers" in dir(self):
+            endpoint.apply_default_headers(self.default_headers)
+        if "default_timeout" in dir(self):
+            endpoint.apply_default_timeout(self.default_timeout)
+        endpoint.compile()
 
     def _apply_defaults(self):
         """
@@ -587,9 +914,15 @@ class APIConfig:
         """
         Validates a resources configuration and raises appropriate exceptions
         """
-        for resource_name, resource_config in self.endpoints.items():
+        for resource_name in self.endpoints:
             if resource_name == "data":
                 raise RestClientConfigurationError("resource name may not be named 'data'")
+            # a resource is set as attribute of the API, so it may not replace one of its own
+            if resource_name.startswith("_") or hasattr(API, resource_name):
+                raise RestClientConfigurationError(
+                    f"resource name may not be named '{resource_name}', which is an attribute "
+                    "of the API"
+                )
 
         # check url definition
         if not self.url:
@@ -599,7 +932,28 @@ class APIConfig:
         if not isinstance(self.verify_ssl, bool):
             raise RestClientConfigurationError("verify_ssl is not True or False")
 
+        # connection pool of the session
+        for attribute in ["pool_connections", "pool_maxsize"]:
+            value = getattr(self, attribute)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise RestClientConfigurationError(f"{attribute} must be a positive integer")
+        for attribute in ["pool_block", "keep_alive"]:
+            if not isinstance(getattr(self, attribute), bool):
+                raise RestClientConfigurationError(f"{attribute} is not True or False")
+
+        # raises an exception for an unsupported JSON library
+        get_json_backend(self.json_backend)
+
+        # retry policy and budget
+        if self.retry is not None and not isinstance(self.retry, RetryPolicy):
+            raise RestClientConfigurationError("retry must be a RetryPolicy")
+        if self.retry_budget is not None:
+            # raises an exception for an invalid budget
+            RetryBudget(self.retry_budget, self.retry_budget_reserve)
+
         # optional auth module
+        from .auth import AuthConfig
+
         if self.authentication and not isinstance(self.authentication, AuthConfig):
             raise RestClientConfigurationError(
                 "authentication attribute is not an initiated instance of AuthConfig"
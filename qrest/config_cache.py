@@ -0,0 +1,70 @@
+"""This module stores the state of the validated endpoints of a configuration
+module in a cache file, so a later process can restore the endpoints without
+validating the configuration again.
+
+The cache is keyed by a hash of the source of the configuration module and the
+version of qrest. When either changes, the cache is ignored and rewritten. Note
+that changes to other modules that the configuration module imports settings
+from are not detected, so remove the cache file when you change those.
+
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Optional
+
+# ================================================================================================
+# local imports
+from . import __version__
+from .utils import write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1
+"""version of the layout of the cache file"""
+
+
+# =================================================================================================
+def cache_key(imported_module) -> Optional[str]:
+    """Return the key of the cache of the given configuration module, or None if the source of the
+    module is not available."""
+    path = getattr(imported_module, "__file__", None)
+    if not path or not path.endswith(".py"):
+        return None
+    try:
+        with open(path, "rb") as source:
+            digest = hashlib.sha256(source.read())
+    except OSError:
+        return None
+    digest.update(f"{CACHE_FORMAT}:{__version__}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load(path: str, key: str) -> Optional[Dict[str, dict]]:
+    """Return the state of each endpoint that is stored in the given cache file, by name, or None
+    if the file does not exist, cannot be read or has a different key."""
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            content = json.load(cache_file)
+    except (OSError, ValueError) as e:
+        logger.debug("configuration cache %s cannot be read: %s", path, e)
+        return None
+    if not isinstance(content, dict) or content.get("key") != key:
+        logger.debug("configuration cache %s is outdated", path)
+        return None
+    endpoints = content.get("endpoints")
+    return endpoints if isinstance(endpoints, dict) else None
+
+
+def store(path: str, key: str, endpoints: Dict[str, dict]):
+    """Store the given state of each endpoint in the given cache file.
+
+    The file is replaced atomically, so concurrent processes never read a partial file. A file
+    that cannot be written is logged and otherwise ignored.
+
+    """
+    try:
+        write_file_atomically(path, json.dumps({"key": key, "endpoints": endpoints}))
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("configuration cache %s cannot be written: %s", path, e)
@@ -0,0 +1,106 @@
+"""This module selects the library that encodes and decodes JSON. By default qrest
+uses the JSON module of the standard library. The faster orjson and ujson libraries
+can be selected instead, but only if they are installed.
+
+Note that orjson and ujson do not behave exactly like the JSON module, e.g. orjson
+decodes integers that do not fit in 64 bits as floats, rejects NaN and dictionary
+keys that are not strings, and encodes NaN as null. That is why they are opt-in.
+
+"""
+
+import importlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+
+# ================================================================================================
+# local imports
+from .exception import RestClientConfigurationError
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("orjson", "ujson", "json")
+"""names of the supported JSON libraries, from fastest to slowest"""
+
+_backends: Dict[str, "JSONBackend"] = {}
+
+
+# =================================================================================================
+class JSONBackend:
+    """Wrapper around a JSON library that decodes from and encodes to bytes."""
+
+    def __init__(self, name: str, module):
+        """
+        :param name: the name of the JSON library
+        :param module: the imported JSON library
+        """
+        self.name = name
+        self._module = module
+
+    def loads(self, content: bytes) -> Any:
+        """Return the Python object of the given JSON document."""
+        return self._module.loads(content)
+
+    def dumps(self, data: Any) -> bytes:
+        """Return the given Python object as an UTF-8 encoded JSON document.
+
+        As requests does, the JSON module of the standard library rejects NaN and infinity, which
+        are not valid JSON.
+
+        """
+        if self._module is json:
+            encoded = json.dumps(data, allow_nan=False)
+        else:
+            encoded = self._module.dumps(data)
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        return encoded
+
+    def loads_response(self, response: requests.Response) -> Any:
+        """Return the Python object of the JSON document in the given response.
+
+        The JSON module of the standard library lets requests decode the response, as requests
+        also detects the encoding of the content. The faster libraries decode the content as is.
+
+        """
+        if self._module is json:
+            return response.json()
+        return self.loads(response.content)
+
+    def __repr__(self) -> str:
+        return f"JSONBackend({self.name!r})"
+
+
+# -------------------------------------------------------------------------------------------------
+def get_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """Return the JSONBackend for the JSON library with the given name.
+
+    If no name is given, this function returns the backend of the JSON module of the standard
+    library. If the library with the given name is not installed, it falls back to the fastest
+    library that is installed. As the JSON module of the standard library is always available,
+    this function always returns a backend.
+
+    :param name: the name of the JSON library, one of :data:`JSON_BACKENDS`, or None
+    :raises RestClientConfigurationError: when the name is not that of a supported library
+    """
+    if name is not None and name not in JSON_BACKENDS:
+        raise RestClientConfigurationError(
+            "json backend '{}' is not supported: pick from {}".format(
+                name, ", ".join(JSON_BACKENDS)
+            )
+        )
+
+    key = name or "json"
+    if key not in _backends:
+        candidates = (key,) + JSON_BACKENDS
+        for candidate in candidates:
+            try:
+                module = importlib.import_module(candidate)
+            except ImportError:
+                logger.debug("json backend '%s' is not installed", candidate)
+                continue
+            _backends[key] = JSONBackend(candidate, module)
+            break
+    return _backends[key]
@@ -0,0 +1,220 @@
+"""This module extracts a section of a JSON document while the document is being
+received. Only the selected section is decoded into Python objects, everything
+else is skipped as soon as it has been read, so the memory use does not depend
+on the size of the document but on the size of the section.
+
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List
+
+# ================================================================================================
+# local imports
+from .exception import RestResourceMissingContentError
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+# the part of a number that may follow its decoded part when the number is cut off by the end of
+# the buffer, e.g. the "." of "12." or the "e-" of "3e-"
+_NUMBER_TAIL = re.compile(r"[.eE+\-]*")
+
+
+# =================================================================================================
+def extract_json_section(chunks: Iterable[str], path: List[str]) -> Any:
+    """Return the value at the given path of the JSON document in the given chunks.
+
+    As for :class:`qrest.response.JSONResponse`, the path is only followed if the document is a
+    JSON object, otherwise the complete document is returned.
+
+    :raises RestResourceMissingContentError: when the path is not in the document
+    """
+    reader = _JSONStreamReader(chunks)
+    reader.move_to(path)
+    return reader.read_value()
+
+
+def iter_json_section(chunks: Iterable[str], path: List[str]) -> Iterator[Any]:
+    """Yield the elements of the array at the given path of the JSON document in the given chunks.
+
+    Each element is decoded only when it is requested, so at most a single element is in memory.
+
+    :raises RestResourceMissingContentError: when the path is not in the document or when the
+        value at the path is not an array
+    """
+    reader = _JSONStreamReader(chunks)
+    if not reader.move_to(path) and path:
+        raise RestResourceMissingContentError("the JSON document is not an object")
+    yield from reader.iter_array()
+
+
+# =================================================================================================
+class _JSONStreamReader:
+    """Reader of a JSON document that arrives in text chunks.
+
+    The reader keeps a buffer of the text that has been received but not yet consumed. Values
+    that are read are decoded by the JSON decoder of the standard library, values that are
+    skipped are scanned for their end without being decoded.
+
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+        self._decoder = json.JSONDecoder()
+
+    # ---------------------------------------------------------------------------------------------
+    def _fill(self, minimum_size: int = 0) -> bool:
+        """Append the next chunk to the buffer and drop the text that has been consumed.
+
+        :param minimum_size: keep appending chunks until the unconsumed text has this size
+        :return: False if and only if there was no chunk left to append
+        """
+        start = self._pos
+        pieces = [self._buffer[start:]]
+        size = len(pieces[0])
+        appended = False
+        while not self._exhausted and (not appended or size < minimum_size):
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+            else:
+                pieces.append(chunk)
+                size += len(chunk)
+                appended = True
+        self._buffer = "".join(pieces)
+        self._pos = 0
+        return appended
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or an empty string at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _consume(self, expected: str) -> str:
+        """Consume and return the next character, which should be one of the expected ones."""
+        char = self._peek()
+        if not char or char not in expected:
+            raise json.JSONDecodeError(f"Expecting one of '{expected}'", self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    # ---------------------------------------------------------------------------------------------
+    def read_value(self) -> Any:
+        """Decode and return the value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # the value is incomplete: at least double the text to decode, which keeps the
+                # total cost of the retries linear in the size of the value
+                unconsumed = len(self._buffer) - self._pos
+                if not self._fill(minimum_size=2 * unconsumed):
+                    raise
+                continue
+            if (
+                isinstance(value, (int, float))
+                and _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)
+                and self._fill()
+            ):
+                # a number at the end of the buffer may continue in the next chunk
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Move past the value at the current position without decoding it."""
+        char = self._peek()
+        if char not in '"[{':
+            self.read_value()
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            if self._pos >= len(self._buffer) and not self._fill():
+                raise json.JSONDecodeError("Unterminated value", self._buffer, self._pos)
+            if escaped:
+                self._pos += 1
+                escaped = False
+            elif in_string:
+                match = _STRING_SPECIAL.search(self._buffer, self._pos)
+                if match is None:
+                    self._pos = len(self._buffer)
+                    continue
+                self._pos = match.end()
+                if match.group() == "\\":
+                    escaped = True
+                else:
+                    in_string = False
+                    if depth == 0:
+                        return
+            else:
+                match = _STRUCTURE.search(self._buffer, self._pos)
+                if match is None:
+                    self._pos = len(self._buffer)
+                    continue
+                self._pos = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+
+    # ---------------------------------------------------------------------------------------------
+    def move_to(self, path: List[str]) -> bool:
+        """Move to the value at the given path.
+
+        :return: False if and only if the document is not a JSON object, in which case the
+            current position is left at the start of the document
+        :raises RestResourceMissingContentError: when the path is not in the document
+        """
+        if self._peek() != "{":
+            return False
+        for element in path:
+            if self._peek() != "{" or not self._move_to_key(element):
+                raise RestResourceMissingContentError(f"Element {element} could not be found")
+        return True
+
+    def _move_to_key(self, key: str) -> bool:
+        """Move to the value of the given key of the object at the current position.
+
+        :return: False if and only if the object does not contain the key
+        """
+        self._consume("{")
+        if self._peek() == "}":
+            return False
+        while True:
+            name = self.read_value()
+            self._consume(":")
+            if name == key:
+                return True
+            self.skip_value()
+            if self._consume(",}") == "}":
+                return False
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the decoded elements of the array at the current position."""
+        if self._peek() != "[":
+            raise RestResourceMissingContentError("the selected JSON section is not an array")
+        self._consume("[")
+        if self._peek() == "]":
+            return
+        while True:
+            yield self.read_value()
+            if self._consume(",]") == "]":
+                return
@@ -1,25 +1,63 @@
 """Implements ModuleClassRegistry."""
-import inspect
+
+import threading
+import weakref
+from typing import List, Tuple
+
+# the classes defined in a module, by module, see ModuleClassRegistry.classes
+_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_cache_lock = threading.Lock()
 
 
 class ModuleClassRegistry:
-    """Allows you to retrieve the classes that are defined in an imported module."""
+    """Allows you to retrieve the classes that are defined in an imported module.
+
+    The classes of a module are collected in a single walk of the module namespace, which is
+    cached per module. The cache is refreshed when a name in the module namespace has been added,
+    removed or bound to another object, for example when the module has been reloaded.
+
+    """
 
     def __init__(self, imported_module):
         """Store the module from which the classes should be retrieved."""
         self._module = imported_module
 
+    def classes(self) -> List[type]:
+        """Return all classes that are defined in the imported module, in order of definition."""
+        namespace = vars(self._module)
+        with _cache_lock:
+            cached = _cache.get(self._module)
+        if cached is not None and _is_current(namespace, cached[0]):
+            return [value for _, value in cached[1]]
+
+        entries = _collect_classes(self._module.__name__, namespace)
+        with _cache_lock:
+            _cache[self._module] = (tuple(namespace.items()), entries)
+        return [value for _, value in entries]
+
     def retrieve(self, base_class):
         """Return all subclasses of the given base class.
 
         The classes returned are defined in the imported module.
 
         """
-        classes = []
-        for name, value in inspect.getmembers(self._module):
-            # the member should be defined in the given module
-            if inspect.getmodule(value) == self._module:
-                # issubclass requires its first argument to be a class
-                if inspect.isclass(value) and issubclass(value, base_class):
-                    classes.append(value)
-        return classes
+        return [value for value in self.classes() if issubclass(value, base_class)]
+
+
+def _collect_classes(module_name: str, namespace: dict) -> Tuple[Tuple[str, type], ...]:
+    """Return the name and class of each class in the namespace that is defined in the module."""
+    return tuple(
+        (name, value)
+        for name, value in namespace.items()
+        # the member should be defined in the given module
+        if isinstance(value, type) and value.__module__ == module_name
+    )
+
+
+def _is_current(namespace: dict, snapshot: Tuple[Tuple[str, object], ...]) -> bool:
+    """Return True if and only if the namespace still binds the names of the snapshot, and only
+    those names, to the same objects."""
+    return len(namespace) == len(snapshot) and all(
+        name == cached_name and value is cached_value
+        for (name, value), (cached_name, cached_value) in zip(namespace.items(), snapshot)
+    )
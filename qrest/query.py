@@ -0,0 +1,40 @@
+"""This module contains the Query object. A query holds the validated input of a
+single call to a Resource, so no state of a call has to be stored on the
+Resource itself.
+
+"""
+
+from typing import Any, Iterator, Mapping
+
+
+# =================================================================================================
+class Query(Mapping):
+    """Read-only mapping of parameter name to value for a single call to a Resource.
+
+    A Query is created by :meth:`qrest.resource.Resource.check` and then handed to the methods that
+    build the request. As it cannot be modified, it can be shared between threads without any
+    locking.
+
+    """
+
+    __slots__ = ("resource_name", "_data")
+
+    def __init__(self, resource_name: str, data: Mapping[str, Any]):
+        """
+        :param resource_name: the pythonic name of the resource that is queried
+        :param data: the validated parameters, including the defaults of omitted parameters
+        """
+        self.resource_name = resource_name
+        self._data = dict(data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Query({self.resource_name!r}, {self._data!r})"
@@ -7,12 +7,15 @@ to add functionality such as complex pagination or response processing
 
 import requests
 import logging
-import jsonschema
-from urllib.parse import quote, urljoin
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from collections import deque
+from types import MethodType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
 from _io import BufferedReader
 
+from requests.adapters import HTTPAdapter
 from requests.packages.urllib3 import disable_warnings
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
@@ -20,10 +23,13 @@ from requests.packages.urllib3.exceptions import InsecureRequestWarning
 # local imports
 if TYPE_CHECKING:
     # we import ResourceConfig for type checking only to avoid a circular import
-    from .conf import ResourceConfig
+    from .conf import APIConfig, ResourceConfig, ValidationPlan
+    from .response import Response
 from .module_class_registry import ModuleClassRegistry
-from .response import Response
-from .utils import URLValidator
+from .query import Query
+from .json_backend import JSONBackend, get_json_backend
+from .retry import RetryBudget, RetryPolicy
+from .utils import URLTemplate
 from .exception import (
     RestClientQueryError,
     RestClientConfigurationError,
@@ -33,14 +39,74 @@ from .exception import (
     RestTimeoutError,
     raise_on_response_error,
 )
-from .response import CSVResponse, JSONResponse
-from .auth import AuthConfig
 
 disable_warnings(InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
 
+# =================================================================================================
+def create_api_config(
+    imported_module, lazy: bool = False, cache_file: Optional[str] = None
+) -> "APIConfig":
+    """Return the APIConfig defined in the given imported module, for the ResourceConfig
+    subclasses defined in that module.
+
+    :param lazy: if True, create and validate the ResourceConfig of an endpoint only when it is
+        requested for the first time, see :class:`qrest.conf.LazyEndpoints`
+    :param cache_file: the path of the file to restore the validated endpoints from and, if the
+        file is missing or outdated, to store them in, see :mod:`qrest.config_cache`
+    :raises RestClientConfigurationError: when the module does not contain exactly one subclass of
+        APIConfig or when the configuration is not valid
+    """
+    from .conf import APIConfig, LazyEndpoints, ResourceConfig
+
+    registry = ModuleClassRegistry(imported_module)
+
+    api_configs = registry.retrieve(APIConfig)
+    if not api_configs:
+        raise RestClientConfigurationError(
+            f"Imported module '{imported_module.__name__}' does not contain a subclass of "
+            "APIConfig."
+        )
+    elif len(api_configs) > 1:
+        raise RestClientConfigurationError(
+            f"Imported module '{imported_module.__name__}' contains more than 1 subclass of "
+            "APIConfig."
+        )
+
+    resource_configs = registry.retrieve(ResourceConfig)
+    for c in resource_configs:
+        if "name" not in dir(c):
+            raise RestClientConfigurationError(
+                f"Imported class '{c.__name__}' does not have a 'name' attribute."
+            )
+    if lazy:
+        if cache_file is not None:
+            raise RestClientConfigurationError("lazy and cache_file can't be combined")
+        return api_configs[0](LazyEndpoints({c.name: c for c in resource_configs}))
+
+    key = None
+    if cache_file is not None:
+        from . import config_cache
+
+        key = config_cache.cache_key(imported_module)
+        states = config_cache.load(cache_file, key) if key else None
+        if states is not None and set(states) == {c.name for c in resource_configs}:
+            try:
+                endpoints = {c.name: c.restore(states[c.name]) for c in resource_configs}
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug("configuration cache %s is not valid: %s", cache_file, e)
+            else:
+                return api_configs[0](endpoints, validated=True)
+
+    api_config = api_configs[0]({c.name: c.create() for c in resource_configs})
+    if key is not None:
+        states = {name: endpoint.get_state() for name, endpoint in api_config.endpoints.items()}
+        config_cache.store(cache_file, key, states)
+    return api_config
+
+
 # ================================================================================================
 class API:
     """
@@ -50,8 +116,18 @@ class API:
     # placeholder for subclassed resources
     config = None
     auth = None
+    verifySSL = True
+    _session: Optional[requests.Session] = None
+    _retry_budget: Optional[RetryBudget] = None
+    _executor = None
 
-    def __init__(self, imported_module):
+    def __init__(
+        self,
+        imported_module,
+        compiled_module=None,
+        lazy: bool = False,
+        cache_file: Optional[str] = None,
+    ):
         """Initialize an API from the configurations in the given imported module.
 
         An API describes a REST server, and contains a list of resources. We
@@ -61,33 +137,18 @@ class API:
         non-standard responses such as pagination or a specific response format
         from which the payload needs to be derived
 
-        """
-
-        from .conf import APIConfig, ResourceConfig
-
-        registry = ModuleClassRegistry(imported_module)
-
-        api_configs = registry.retrieve(APIConfig)
-        if not api_configs:
-            raise RestClientConfigurationError(
-                f"Imported module '{imported_module.__name__}' does not contain a subclass of "
-                "APIConfig."
-            )
-        elif len(api_configs) > 1:
-            raise RestClientConfigurationError(
-                f"Imported module '{imported_module.__name__}' contains more than 1 subclass of "
-                "APIConfig."
-            )
+        :param compiled_module: the module generated by :mod:`qrest.compile` for the imported
+            module, see :meth:`use_compiled`
+        :param lazy: if True, create, validate and configure a resource only when it is accessed
+            for the first time, which keeps the construction of an API with many endpoints fast
+        :param cache_file: the path of the file to cache the validated endpoints in, so the next
+            API for the same, unchanged module does not validate them again
 
-        resource_configs = registry.retrieve(ResourceConfig)
-        for c in resource_configs:
-            if "name" not in dir(c):
-                raise RestClientConfigurationError(
-                    f"Imported class '{c.__name__}' does not have a 'name' attribute."
-                )
-        endpoints = {c.name: c.create() for c in resource_configs}
+        """
 
-        self._initialize(api_configs[0](endpoints))
+        self._initialize(create_api_config(imported_module, lazy=lazy, cache_file=cache_file))
+        if compiled_module is not None:
+            self.use_compiled(compiled_module)
 
     def _initialize(self, config):
         """Initialize the current API from the given APIConfig.
@@ -98,25 +159,164 @@ class API:
         """
 
         # check
-        from .conf import APIConfig
+        from .conf import APIConfig, LazyEndpoints
 
         if not isinstance(config, APIConfig):
             raise RestClientConfigurationError("configuration is not a APIConfig instance")
 
         self.config = config
         self.verifySSL = config.verify_ssl
+        self._session = self._create_session()
         self.auth = self._get_authentication_module()
-
-        #  process the endpoints
-        for name, item_config in self.config.endpoints.items():
-            if not isinstance(item_config.processor, Resource):
-                raise RestClientConfigurationError(
-                    f"defined resource class for {name} is not a Resource instance"
-                )
-            new_resource = self._create_rest_resource(
-                item_config.processor, resource_name=name, config=item_config, auth=self.auth
+        if config.retry_budget is not None:
+            self._retry_budget = RetryBudget(config.retry_budget, config.retry_budget_reserve)
+        self._executor = self._create_executor()
+        self._compiled_endpoints = {}
+        self._lock = threading.Lock()
+
+        #  process the endpoints, if the endpoints are lazy only when they are accessed
+        if not isinstance(self.config.endpoints, LazyEndpoints):
+            for name in self.config.endpoints:
+                self._materialize(name)
+
+    def _materialize(self, name: str) -> "Resource":
+        """Create and configure the resource with the given name and set it as attribute."""
+        item_config = self.config.endpoints[name]
+        if not isinstance(item_config.processor, Resource):
+            raise RestClientConfigurationError(
+                f"defined resource class for {name} is not a Resource instance"
             )
-            setattr(self, name, new_resource)
+        new_resource = self._create_rest_resource(
+            item_config.processor, resource_name=name, config=item_config, auth=self.auth
+        )
+        if name in self._compiled_endpoints:
+            self._apply_compiled(new_resource, *self._compiled_endpoints[name])
+        setattr(self, name, new_resource)
+        return new_resource
+
+    def __getattr__(self, name: str):
+        # only called for attributes that do not exist (yet), such as lazy resources
+        endpoints = getattr(self.config, "endpoints", None)
+        if name.startswith("_") or endpoints is None or name not in endpoints:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        with self._lock:
+            resource = self.__dict__.get(name)
+            if resource is None:
+                try:
+                    resource = self._materialize(name)
+                except RestClientConfigurationError as e:
+                    # as the attribute does not exist, hasattr and getattr with a default work
+                    raise AttributeError(f"resource '{name}' is not valid: {e}") from e
+        return resource
+
+    # ---------------------------------------------------------------------------------------------
+    def use_compiled(self, compiled_module):
+        """Let the resources validate and assemble their calls with the generated functions of
+        the given module, see :mod:`qrest.compile`.
+
+        A resource whose configuration differs from the configuration that the functions were
+        generated for keeps using the generic methods, so an outdated module is never used.
+
+        """
+        for name, functions in compiled_module.ENDPOINTS.items():
+            if name not in self.config.endpoints:
+                logger.warning("compiled module contains unknown resource '%s'", name)
+                continue
+            self._compiled_endpoints[name] = functions
+            # a lazy resource that does not exist yet gets the functions on creation
+            resource = self.__dict__.get(name)
+            if isinstance(resource, Resource):
+                self._apply_compiled(resource, *functions)
+
+    @staticmethod
+    def _apply_compiled(resource: "Resource", expected: str, check, query_parameters):
+        """Bind the given generated functions to the given resource if they are up to date."""
+        from .compile import fingerprint
+
+        if fingerprint(resource.config) != expected:
+            logger.warning("compiled functions of resource '%s' are outdated", resource.name)
+            return
+        resource.check = MethodType(check, resource)
+        resource.query_parameters = MethodType(query_parameters, resource)
+
+    # ---------------------------------------------------------------------------------------------
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """The requests.Session that all resources of this API share."""
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """Return the requests.Session that all resources of this API share.
+
+        The session keeps a pool of connections per host, so consecutive
+        requests to the same server reuse an open TCP/TLS connection instead of
+        doing a new handshake. The pool is configured by the APIConfig.
+
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _create_executor(self):
+        """Return the executor that sends the requests of the asynchronous calls of this API.
+
+        The executor has a worker per connection of the pool of the session, so the requests that
+        are sent from an event loop neither wait for a connection nor for a worker of the default
+        executor of the loop, which is shared with the rest of the application.
+
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        return ThreadPoolExecutor(max_workers=self.config.pool_maxsize, thread_name_prefix="qrest")
+
+    def close(self):
+        """Close the session and with that, all pooled connections of this API, and stop the
+        refresher of the credentials and the executor of the asynchronous calls, if any."""
+        stop_refresher = getattr(self.auth, "stop_refresher", None)
+        if stop_refresher is not None:
+            stop_refresher()
+        if self._executor is not None:
+            self._executor.shutdown()
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ---------------------------------------------------------------------------------------------
+    def gather(
+        self, queries: Iterable[Tuple[Union[str, "Resource"], dict]], concurrency: int = 4
+    ) -> List[Any]:
+        """Execute the given queries concurrently and return their results in the same order.
+
+        :param queries: pairs of a resource, or the name of a resource, and the keyword arguments
+            to query that resource with
+        :param concurrency: the maximum number of requests that are sent at the same time
+
+        :return: for each query the content of interest of its response or, if the query failed,
+            the exception it raised
+        """
+        batch = []
+        for resource, kwargs in queries:
+            if isinstance(resource, str):
+                name, resource = resource, getattr(self, resource, None)
+                if not isinstance(resource, Resource):
+                    raise InvalidResourceError(name=type(self).__name__, resource=name)
+            elif not isinstance(resource, Resource):
+                raise RestClientQueryError(f"{resource} is not a Resource")
+            batch.append((resource, kwargs))
+        return _execute_batch(batch, concurrency)
 
     # ---------------------------------------------------------------------------------------------
     @property
@@ -126,17 +326,8 @@ class API:
             :return: A list of the available resources for this REST API
             :rtype: ``list(string_type)``
         """
-
-        resources = []
-        fieldnames = dir(self)
-        for fieldname in fieldnames:
-            # this exclusion is to prevent endless loops
-            if fieldname == "resources":
-                continue
-            field = getattr(self, fieldname)
-            if isinstance(field, Resource):
-                resources.append(field.name)
-        return resources
+        # served from the endpoint index, so lazy resources are not created
+        return sorted(self.config.endpoints)
 
     # ---------------------------------------------------------------------------------------------
     def _create_rest_resource(self, processor, resource_name, config, auth=None):
@@ -171,7 +362,15 @@ class API:
             raise RestClientConfigurationError(msg)
 
         processor.configure(
-            name=resource_name, config=config, server_url=self.config.url, auth=auth
+            name=resource_name,
+            config=config,
+            server_url=self.config.url,
+            auth=auth,
+            session=self._session,
+            json_backend=self.config.json_backend,
+            retry=config.retry if config.retry is not None else self.config.retry,
+            retry_budget=self._retry_budget,
+            executor=self._executor,
         )
         return processor
 
@@ -185,6 +384,8 @@ class API:
         else:
             if auth_config is None:
                 return None
+            from .auth import AuthConfig
+
             if not isinstance(auth_config, AuthConfig):
                 raise RestClientConfigurationError(
                     "authentication attribute is not an instance of AuthConfig"
@@ -199,7 +400,8 @@ class Resource(ABC):
     This class wraps functionality of creating and querying the resource, starting with a
     configuration string
 
-    :param response: object that wraps the return value of requests.request
+    :param response: prototype of the object that wraps the return value of requests.request:
+        each call processes its return value in a new copy of this prototype
 
     """
 
@@ -207,12 +409,17 @@ class Resource(ABC):
     config: Optional["ResourceConfig"] = None
 
     server_url = None
+    _url_template: Optional[URLTemplate] = None
     request_parameters = None
     verify_ssl = False
     auth = None
-    cleaned_data: Optional[Dict[str, Any]] = None
+    session: Optional[requests.Session] = None
+    # set by configure, so the JSON library is not imported with this module
+    json_backend: Optional[JSONBackend] = None
+    retry: Optional[RetryPolicy] = None
+    retry_budget: Optional[RetryBudget] = None
 
-    response: Response
+    response: "Response"
 
     @abstractmethod
     def create_new(self):
@@ -235,6 +442,11 @@ class Resource(ABC):
         config: "ResourceConfig",
         auth=None,
         verify_ssl: bool = False,
+        session: Optional[requests.Session] = None,
+        json_backend: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        executor=None,
     ):
         """Configure the resource. This is a required procedure to set all parameters.
         Setting these parameters is not possible by using __init__, because
@@ -249,16 +461,30 @@ class Resource(ABC):
         :type auth: subclass of AuthConfig
         :param config: which ResourceConfig to use
         :type config: subclass of ResourceConfig
+        :param session: the requests.Session to send the requests with. If None, every request
+            is sent with a new session, i.e. without reuse of connections
+        :param json_backend: the name of the JSON library to encode the body with. If None, the
+            JSON module of the standard library is used
+        :param retry: the policy to retry failed requests with. If None, requests are not retried
+        :param retry_budget: the budget that limits the retries of all resources of the API. If
+            None, the retries are only limited by the retry policy
+        :param executor: the concurrent.futures.Executor to send the requests of asynchronous
+            calls from. If None, the default executor of the event loop is used
 
         """
 
         self.name = name
         self.server_url = server_url
         self.config = config
+        self._url_template = URLTemplate(server_url, config.path)
         self.auth = auth
         self.verify_ssl = verify_ssl
+        self.session = session
+        self.json_backend = get_json_backend(json_backend)
+        self.retry = retry
+        self.retry_budget = retry_budget
+        self.executor = executor
 
-        self.cleaned_data = {}
         self.request_parameters = None
         self.is_configured = True
 
@@ -275,9 +501,43 @@ class Resource(ABC):
         input quality and formats the REST parameters.
 
         """
-        self.cleaned_data = {}
-        self.check(**kwargs)
-        return self._get()
+        query = self.check(**kwargs)
+        return self._get(query)
+
+    # ---------------------------------------------------------------------------------------------
+    def map(self, kwargs_sets: Iterable[dict], concurrency: int = 4) -> List[Any]:
+        """Execute the REST query for each set of keyword arguments concurrently.
+
+        The queries are validated and their responses processed in the calling thread, only the
+        HTTP requests are sent from a pool of worker threads. A query that fails does not abort
+        the other queries: its exception is returned in place of its result.
+
+        :param kwargs_sets: the keyword arguments of each query
+        :param concurrency: the maximum number of requests that are sent at the same time
+
+        :return: for each query the content of interest of its response or, if the query failed,
+            the exception it raised, in the order of the given keyword arguments
+        """
+        return _execute_batch(((self, kwargs) for kwargs in kwargs_sets), concurrency)
+
+    # ---------------------------------------------------------------------------------------------
+    async def acall(self, *args, **kwargs):
+        """Asynchronous version of :meth:`__call__` for use in an asyncio event loop."""
+        response = await self.aget_response(*args, **kwargs)
+        return response.fetch()
+
+    async def aget_response(self, *args, **kwargs):
+        """Asynchronous version of :meth:`get_response` for use in an asyncio event loop.
+
+        The blocking HTTP request is sent from the executor of the API, so the loop can run other
+        coroutines, e.g. other queries, in the meantime.
+
+        A streamed response is also processed in the executor, but the generator of a response
+        with stream_items or of a streamed CSV response reads the response while it is iterated.
+
+        """
+        query = self.check(**kwargs)
+        return await self._aget(query)
 
     # ---------------------------------------------------------------------------------------------
     @property
@@ -329,17 +589,19 @@ class Resource(ABC):
         return "ERROR: not yet implemented"
 
     # ---------------------------------------------------------------------------------------------
-    def check(self, **kwargs):
+    def check(self, **kwargs) -> Query:
         """
         check the input request parameters before sending it to the remote service
+
+        :return: the validated parameters, including the defaults of omitted parameters
         """
 
-        conf = self.config
+        plan = self.config.validation_plan
 
         # ----------------------------------
         # deny superfluous input
-        diff = list(set(kwargs.keys()).difference(conf.all_parameters))
-        if diff:
+        if not plan.all_parameters.issuperset(kwargs):
+            diff = list(set(kwargs.keys()).difference(plan.all_parameters))
             raise RestClientQueryError(
                 "parameters {difference} are supplied but not usable for "
                 "resource '{resource}'".format(difference=diff, resource=self.name)
@@ -347,64 +609,79 @@ class Resource(ABC):
 
         # ----------------------------------
         # Check required parameters
-        for parameter in conf.required_parameters:
-            if parameter not in kwargs:
-                raise RestClientQueryError(
-                    "parameter '{parameter}' is missing or empty for resource '{resource}'".format(
-                        parameter=parameter, resource=self.name
+        if not plan.required_set.issubset(kwargs):
+            for parameter in plan.required:
+                if parameter not in kwargs:
+                    raise RestClientQueryError(
+                        "parameter '{parameter}' is missing or empty for resource "
+                        "'{resource}'".format(parameter=parameter, resource=self.name)
                     )
-                )
+
+        if plan.is_simple:
+            # only the check on multiple values applies
+            for kwarg, value in kwargs.items():
+                if (
+                    isinstance(value, list)
+                    and kwarg not in plan.multiple
+                    and kwarg in plan.config_parameters
+                ):
+                    raise RestClientQueryError(
+                        "parameter '{kwarg}' is not multiple".format(kwarg=kwarg)
+                    )
+        else:
+            self._check_values(plan, kwargs)
+
+        # apply defaults for missing optional parameters that do have default values
+        for item, value in plan.defaults.items():
+            if item not in kwargs:
+                kwargs[item] = value
+
+        return Query(self.name, kwargs)
+
+    # ---------------------------------------------------------------------------------------------
+    def _check_values(self, plan: "ValidationPlan", kwargs: dict):
+        """Check the values of the given parameters against the choices, schemas, exclusion
+        groups and file requirements of the given plan.
+        """
 
         # ----------------------------------
         # check choices
         for parameter in kwargs:
-            if parameter not in self.config.parameters:
-                continue
-            config = self.config.parameters[parameter]
-            if config.choices:
-                if not kwargs[parameter] in config.choices:
+            choices = plan.choices.get(parameter)
+            if choices:
+                if not kwargs[parameter] in choices:
                     raise RestClientQueryError(
                         "value '{val}' for parameter '{parameter}' is not a valid choice: pick "
                         "from {choices}".format(
-                            val=kwargs[parameter],
-                            parameter=parameter,
-                            choices=", ".join(config.choices),
+                            val=kwargs[parameter], parameter=parameter, choices=", ".join(choices),
                         )
                     )
 
         # ----------------------------------
         # Check schemas
         for parameter in kwargs:
-            if parameter not in self.config.parameters:
-                continue
-            config = self.config.parameters[parameter]
-            if config.schema:
-                instance = kwargs[parameter]
-                schema_validator_cls = jsonschema.validators.validator_for(config.schema)
-                try:
-                    schema_validator_cls(config.schema).validate(instance)
-                except jsonschema.ValidationError:
-                    msg = "value for {} does not obey schema".format(parameter)
-                    raise RestClientValidationError(msg)
+            config = plan.schemas.get(parameter)
+            if config is not None and not config.obeys_schema(kwargs[parameter]):
+                msg = "value for {} does not obey schema".format(parameter)
+                raise RestClientValidationError(msg)
 
         # ----------------------------------
         # check query parameters
-        intersection = set(conf.all_query_parameters).intersection(kwargs.keys())
+        intersection = plan.config_parameters.intersection(kwargs.keys())
         groups_used = {}
         for kwarg in intersection:
-            for group in conf.query_parameter_groups:
-                if kwarg in conf.query_parameter_groups[group]:
-                    if group in groups_used:
-                        raise RestClientQueryError(
-                            "parameter '{kwarg1}' and '{kwarg2}' from group '{group}' can't be "
-                            "used together".format(
-                                kwarg1=kwarg, kwarg2=groups_used[group], group=group
-                            )
+            group = plan.groups.get(kwarg)
+            if group is not None:
+                if group in groups_used:
+                    raise RestClientQueryError(
+                        "parameter '{kwarg1}' and '{kwarg2}' from group '{group}' can't be "
+                        "used together".format(
+                            kwarg1=kwarg, kwarg2=groups_used[group], group=group
                         )
-                    else:
-                        groups_used[group] = kwarg
-                    break
-            if isinstance(kwargs[kwarg], list) and kwarg not in conf.multiple_parameters:
+                    )
+                else:
+                    groups_used[group] = kwarg
+            if isinstance(kwargs[kwarg], list) and kwarg not in plan.multiple:
                 raise RestClientQueryError(
                     "parameter '{kwarg}' is not multiple".format(kwarg=kwarg)
                 )
@@ -412,9 +689,7 @@ class Resource(ABC):
         # ----------------------------------
         # check file parameters
         for parameter in kwargs:
-            if parameter not in self.config.parameters:
-                continue
-            if self.config.parameters[parameter].call_location != "file":
+            if parameter not in plan.files:
                 continue
             val = kwargs[parameter]
             if not isinstance(val, tuple):
@@ -439,47 +714,16 @@ class Resource(ABC):
                     )
                 )
 
-        # apply defaults for missing optional parameters that do have default values
-        defaults = self.config.defaults
-        for item, value in defaults.items():
-            if item not in kwargs:
-                kwargs[item] = value
-
-        self.cleaned_data = kwargs
-
     # ---------------------------------------------------------------------------------------------
-    @property
-    def query_url(self):
+    def query_url(self, query: Query) -> str:
         """
-        returns the URL that is actually queried
+        returns the URL that is actually queried for the given validated parameters
         """
 
-        # url and parameters
-        if "cleaned_data" not in dir(self):
-            raise KeyError("request data is not cleaned. Run validate_request first")
-
-        resolved_path = "/".join(self.config.path)
-        selected_params = [
-            parameter
-            for parameter in self.cleaned_data
-            if parameter in self.config.path_parameters
-        ]
-        path_para = {p: quote(str(self.cleaned_data[p]), safe="") for p in selected_params}
-        resolved_path = resolved_path.format(**path_para)
-
-        # Construct URL using base URL and path
-        url = urljoin(base=self.server_url, url=resolved_path)
-
-        # Check if valid URL
-        # Only allow http or https schemes for the REST API base URL
-        url_validator = URLValidator(schemes=["http", "https"])
-        url_validator.check(url)
-
-        return url
+        return self._url_template.build(query)
 
     # ---------------------------------------------------------------------------------------------
-    @property
-    def query_parameters(self):
+    def query_parameters(self, query: Query) -> dict:
         """
         generate the request and body parameters based on the validated input and the config
         """
@@ -489,8 +733,9 @@ class Resource(ABC):
 
         # process via the config
         config_parameters = self.config.parameters
-        for para_name, para_val in self.cleaned_data.items():
-            if para_name in self.config.path_parameters:
+        path_parameters = self.config.validation_plan.path_parameters
+        for para_name, para_val in query.items():
+            if para_name in path_parameters:
                 continue
             rest_name = config_parameters[para_name].name
             if config_parameters[para_name].call_location == "query":
@@ -517,25 +762,54 @@ class Resource(ABC):
         return return_structure
 
     # ---------------------------------------------------------------------------------------------
-    def _get(self, extra_request=None, extra_body=None, extra_file=None):
+    def _get(self, query: Query, extra_request=None, extra_body=None, extra_file=None):
         """ This function builds and sends a request for a specified REST API resource.
-            The parameters are validated in a previous call to validate_query().
+            The parameters are validated in a previous call to check().
             It returns a dictionary of the response or throws an appropriate
             error, depending on the HTTP return code.
 
-            This should be the *only* place in the module where the Requests module is called!
+        """
+        params = self._prepare_request(query, extra_request, extra_body, extra_file)
+        response = self._send(params)
+        return self._process_response(response)
+
+    # ---------------------------------------------------------------------------------------------
+    async def _aget(self, query: Query, extra_request=None, extra_body=None, extra_file=None):
+        """Asynchronous version of :meth:`_get`.
+
+        The HTTP request, including its retries, is run in the executor of the resource. The
+        processing of the response is run in the event loop, unless the response is streamed:
+        its body is then read while it is processed, so the processing is run in the executor
+        as well.
 
         """
+        import asyncio
+
+        params = self._prepare_request(query, extra_request, extra_body, extra_file)
+        loop = asyncio.get_running_loop()
+        if params.get("stream"):
+            return await loop.run_in_executor(self.executor, self._get_prepared, params)
+        response = await loop.run_in_executor(self.executor, self._send, params)
+        return self._process_response(response)
+
+    def _get_prepared(self, params: dict):
+        """Send the HTTP request for the given keyword arguments and process its response."""
+        return self._process_response(self._send(params))
+
+    # ---------------------------------------------------------------------------------------------
+    def _prepare_request(
+        self, query: Query, extra_request=None, extra_body=None, extra_file=None
+    ) -> dict:
+        """Return the keyword arguments for the HTTP request of the validated query."""
 
         # check if user is logged in
         if self.auth and not self.auth.credentials_are_set:
             raise RestCredentailsError("user credentials are not set")
 
-        # url and parameters
-        if "cleaned_data" not in dir(self):
-            raise KeyError("request data is not cleaned. Run validate_query first")
+        if not isinstance(query, Query):
+            raise RestClientQueryError("request data is not validated. Run check first")
 
-        query_parameters = self.query_parameters
+        query_parameters = self.query_parameters(query)
 
         # add hooks to extend get function
         for location, data_dict in [("request", extra_request), ("body", extra_body)]:
@@ -575,30 +849,118 @@ class Resource(ABC):
         # Convert timeout to requests format
         timeout = tuple(None if value == 0 else value / 1000 for value in self.config.timeout)
 
-        # Do HTTP request to REST API
-        logger.debug(" running %s" % self.query_url)
-
         params = {
             "method": self.config.method,
             "auth": self.auth,
             "verify": self.verify_ssl,
             "timeout": timeout,
-            "url": self.query_url,
+            "url": self.query_url(query),
             "headers": self.config.headers,
         }
 
         # some backends (e.g. TIBCO) cannot handle empty parameter sets:
         params_optional = {
             "params": query_parameters["request"] or None,
-            "json": query_parameters["body"] or None,
             "files": query_parameters["file"] or None,
         }
         params.update({k: v for k, v in params_optional.items() if v})
 
+        if self.response.stream:
+            params["stream"] = True
+
+        body = query_parameters["body"]
+        if body:
+            if "files" in params:
+                # requests encodes the body as a multipart form when files are uploaded
+                params["json"] = body
+            else:
+                params["data"] = self.json_backend.dumps(body)
+                params["headers"] = self._json_headers(params["headers"])
+        return params
+
+    # ---------------------------------------------------------------------------------------------
+    @staticmethod
+    def _json_headers(headers: dict) -> dict:
+        """Return the given headers with a JSON content type if they do not specify one."""
+        if any(name.lower() == "content-type" for name in headers):
+            return headers
+        return dict(headers, **{"Content-Type": "application/json"})
+
+    # ---------------------------------------------------------------------------------------------
+    def _request(self, params: dict) -> requests.Response:
+        """Send the HTTP request for the given keyword arguments and return its response.
+
+        This should be the *only* place in the module where the Requests module is called!
+
+        """
+
+        # Do HTTP request to REST API
+        logger.debug(" running %s" % params["url"])
+
         try:
-            response = requests.request(**params)
-            assert isinstance(response, requests.Response)
+            if self.session is None:
+                response = requests.request(**params)
+            else:
+                response = self.session.request(**params)
+        except requests.Timeout as timeout:
+            # Catch-all for both connection timeout and read timeout
+            err_msg = "Request to client timed out for resource %s. requests exception: %s"
+            raise RestTimeoutError(err_msg % (params["url"], timeout.args[0]))
+        assert isinstance(response, requests.Response)
+        return response
+
+    # ---------------------------------------------------------------------------------------------
+    def _send(self, params: dict) -> requests.Response:
+        """Send the HTTP request for the given keyword arguments and return its response, and
+        retry it according to the retry policy of the resource.
+
+        A request is retried when it times out, when the connection fails or when the status code
+        of the response is one of the retryable status codes, as long as the retry budget of the
+        API allows it. The response or the exception of the last attempt is returned or raised.
+        Requests that upload files are not retried, as their files have been read.
+
+        """
+        policy = self.retry
+        if policy is None or "files" in params or not policy.allows(params["method"]):
+            return self._request(params)
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                response = self._request(params)
+            except (RestTimeoutError, requests.ConnectionError) as error:
+                delay = policy.delay(attempt)
+                if delay is None or not self._withdraw_retry():
+                    raise
+                logger.debug("attempt %d of %s failed: %s", attempt, params["url"], error)
+            else:
+                delay = policy.delay(attempt, response)
+                if delay is None or not self._withdraw_retry():
+                    return response
+                logger.debug(
+                    "attempt %d of %s failed with status %d",
+                    attempt,
+                    params["url"],
+                    response.status_code,
+                )
+                # release the connection to the pool
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _withdraw_retry(self) -> bool:
+        """Return True if and only if the retry budget of the API allows another retry."""
+        if self.retry_budget is None or self.retry_budget.withdraw():
+            return True
+        logger.warning("retry budget of resource %s is exhausted, not retrying", self.name)
+        return False
 
+    # ---------------------------------------------------------------------------------------------
+    def _process_response(self, response: requests.Response):
+        """Raise on an error response, otherwise return the processed response."""
+        try:
             raise_on_response_error(response)
         except ValueError:
             # Weird response errors: just give back the raw data. This has the risk of dismissing
@@ -608,15 +970,53 @@ class Resource(ABC):
             # This is a back-catcher for HTTP errors that were not caught before. Code shoul
             # not get here
             raise http
-        except requests.Timeout as timeout:
-            # Catch-all for both connection timeout and read timeout
-            err_msg = "Request to client timed out for resource %s. requests exception: %s"
-            raise RestTimeoutError(err_msg % (self.query_url, timeout.args[0]))
         else:
-            r = self.response(response)
+            r = self.response.create_new()(response)
             return r
 
 
+# ---------------------------------------------------------------------------------------------
+def _execute_batch(queries: Iterable[Tuple[Resource, dict]], concurrency: int) -> List[Any]:
+    """Execute the given queries with at most ``concurrency`` requests in flight.
+
+    The results are collected in order of the queries, which also bounds the number of
+    responses that wait to be processed.
+
+    """
+    if not isinstance(concurrency, int) or isinstance(concurrency, bool) or concurrency < 1:
+        raise RestClientQueryError("concurrency must be a positive integer")
+    from concurrent.futures import ThreadPoolExecutor
+
+    results: List[Any] = []
+    pending: deque = deque()
+
+    def collect():
+        resource, outcome = pending.popleft()
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            response = outcome.result()
+            results.append(resource._process_response(response).fetch())
+        except Exception as e:
+            logger.debug("query of batch for resource %s failed: %s", resource.name, e)
+            results.append(e)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for resource, kwargs in queries:
+            try:
+                query = resource.check(**kwargs)
+                params = resource._prepare_request(query)
+            except Exception as e:
+                pending.append((resource, e))
+            else:
+                pending.append((resource, executor.submit(resource._send, params)))
+            if len(pending) >= 2 * concurrency:
+                collect()
+        while pending:
+            collect()
+    return results
+
+
 # ###############################################################
 class JSONResource(Resource):
     """ A REST Resource that expects a JSON return
@@ -628,6 +1028,12 @@ class JSONResource(Resource):
         *,
         extract_section: Optional[list] = None,
         create_attribute: Optional[str] = "results",
+        deep_copy: bool = False,
+        json_backend: Optional[str] = None,
+        stream: bool = False,
+        stream_items: bool = False,
+        columnar: Optional[str] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
     ):
         """
         :param extract_section: This indicates which part of the obtained JSON response contains
@@ -635,26 +1041,87 @@ class JSONResource(Resource):
             traverse
         :param create_attribute: The "results_name" which is the property that will be generated
             to contain the previously obtained subsection of the json tree
+        :param deep_copy: If True, the subsection is a deep copy of the subsection in the raw
+            data. By default the raw data and the subsection share the decoded JSON tree
+        :param json_backend: The name of the JSON library to decode the response and encode the
+            body with. This overrides the json_backend of the APIConfig
+        :param stream: If True, the subsection is extracted while the response is read, without
+            decoding the rest of the response
+        :param stream_items: If True, the subsection should be an array and the call returns a
+            generator that yields its elements one by one, while the response is read
+        :param columnar: If set, the subsection should be an array of objects and the call returns
+            a NumPy array per key, as a dict ("dict") or as a structured array ("structured")
+        :param dtypes: The NumPy dtype of some or all of the keys, by key
         """
 
         self.initial_kwargs = {
             "extract_section": extract_section,
             "create_attribute": create_attribute,
+            "deep_copy": deep_copy,
+            "json_backend": json_backend,
+            "stream": stream,
+            "stream_items": stream_items,
+            "columnar": columnar,
+            "dtypes": dtypes,
         }
-        self.response = JSONResponse(extract_section, create_attribute)
+        from .response import JSONResponse
+
+        self.response = JSONResponse(
+            extract_section,
+            create_attribute,
+            deep_copy,
+            json_backend,
+            stream=stream,
+            stream_items=stream_items,
+            columnar=columnar,
+            dtypes=dtypes,
+        )
 
     def create_new(self):
         """Return a new instance initialized with the same parameters as self."""
         return self.__class__(**self.initial_kwargs)
 
+    def configure(self, *args, json_backend: Optional[str] = None, **kwargs):
+        """Configure the resource and let its response use the same JSON library.
+
+        The JSON library configured for the current resource takes precedence over the given one.
+
+        """
+        json_backend = self.initial_kwargs["json_backend"] or json_backend
+        super().configure(*args, json_backend=json_backend, **kwargs)
+        self.response.json_backend = self.json_backend
+
 
 class CSVResource(Resource):
     """A REST Resource that expects a text/csv return"""
 
-    def __init__(self):
-        """Set the use of a CSVResponse."""
-        self.response = CSVResponse()
+    def __init__(
+        self,
+        *,
+        stream: bool = False,
+        rows_as_dict: bool = False,
+        encoding: str = "utf-8",
+        chunk_size: int = 65536,
+        columnar: Optional[str] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ):
+        """Set the use of a CSVResponse.
+
+        The arguments are passed to the CSVResponse, see :class:`qrest.response.CSVResponse`.
+
+        """
+        self.initial_kwargs = {
+            "stream": stream,
+            "rows_as_dict": rows_as_dict,
+            "encoding": encoding,
+            "chunk_size": chunk_size,
+            "columnar": columnar,
+            "dtypes": dtypes,
+        }
+        from .response import CSVResponse
+
+        self.response = CSVResponse(**self.initial_kwargs)
 
     def create_new(self):
         """Return a new instance initialized with the same parameters as self."""
-        return self.__class__()
+        return self.__class__(**self.initial_kwargs)
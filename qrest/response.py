@@ -4,17 +4,23 @@ around the data the comes from the REST server after the client asks for it.
 """
 
 import copy
+import csv
+import io
 import requests
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
 
 from requests.packages.urllib3 import disable_warnings
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 # ================================================================================================
 # local imports
+from .columnar import check_columnar_options, columns_from_records, columns_from_rows
 from .exception import RestResourceMissingContentError, RestClientConfigurationError
+from .json_backend import get_json_backend
+from .json_stream import extract_json_section, iter_json_section
+from .utils import decode_chunks, split_lines
 
 disable_warnings(InsecureRequestWarning)
 logger = logging.getLogger(__name__)
@@ -40,6 +46,9 @@ class Response(ABC):
 
     data = None
 
+    stream = False
+    """True if and only if the response content should be read while it is processed"""
+
     def __call__(self, response: Type[requests.models.Response]):
         """ RestResponse wrapper call
             :param response: The Requests Response object
@@ -53,7 +62,8 @@ class Response(ABC):
 
         self._response = response
         self.headers = response.headers
-        self.raw = response.content
+        if not self.stream:
+            self.raw = response.content
 
         # We also store the headers with lowercase field names so we become
         # independent of the case of each field name. For example, a response
@@ -69,6 +79,17 @@ class Response(ABC):
         """Return the data of interest of the REST response."""
         return self.data
 
+    def create_new(self):
+        """Return a new, unprocessed instance with the same options as self.
+
+        A Resource holds a single Response instance that serves as the prototype of the Response
+        of each call. This method creates the Response for a single call, so the result of one
+        call is never overwritten by the result of another call. The copy is shallow: the
+        options of the prototype are shared, not copied.
+
+        """
+        return copy.copy(self)
+
     @abstractmethod
     def _check_content(self):
         pass
@@ -82,7 +103,16 @@ class Response(ABC):
 #  =========================================================================================================
 class JSONResponse(Response):
     def __init__(
-        self, extract_section: Optional[list] = None, create_attribute: Optional[str] = "results"
+        self,
+        extract_section: Optional[list] = None,
+        create_attribute: Optional[str] = "results",
+        deep_copy: bool = False,
+        json_backend: Optional[str] = None,
+        stream: bool = False,
+        stream_items: bool = False,
+        chunk_size: int = 65536,
+        columnar: Optional[str] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
     ):
         """
         Special Wrapper to handle JSON responses. It takes the response object and creates a
@@ -95,13 +125,46 @@ class JSONResponse(Response):
             traverse
         :param create_attribute: The name of the attribute that will contain the aforementioned
             payload subsection.
+        :param deep_copy: If True, the payload subsection is a deep copy of the subsection in the
+            raw data, so modifying one does not affect the other. By default both share the same
+            decoded JSON tree, which avoids the cost of a copy.
+        :param json_backend: The name of the JSON library to decode the response with, see
+            :func:`qrest.json_backend.get_json_backend`. By default the JSON module of the standard
+            library is used.
+        :param stream: If True, the payload subsection is extracted while the response is read,
+            without decoding the rest of the response. The raw data is not available in this
+            mode.
+        :param stream_items: If True, the payload subsection should be an array and the data of
+            the response is a generator that decodes and yields the elements of that array one by
+            one, while the response is read. This implies stream.
+        :param chunk_size: The number of bytes read at a time in stream mode.
+        :param columnar: If set, the payload subsection should be an array of objects, which is
+            converted to a NumPy array per key of the first object, see
+            :mod:`qrest.columnar`. Value "dict" gives a dictionary of key to array, value
+            "structured" gives a single structured array. Requires numpy.
+        :param dtypes: The NumPy dtype of some or all of the columns, by key. The dtype of a
+            column that is not listed is inferred from its values.
 
         """
 
         if extract_section and not isinstance(extract_section, list):
             raise RestClientConfigurationError("extract_section option is not a list")
+        options = [("deep_copy", deep_copy), ("stream", stream), ("stream_items", stream_items)]
+        for name, value in options:
+            if not isinstance(value, bool):
+                raise RestClientConfigurationError(f"{name} option is not True or False")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise RestClientConfigurationError("chunk_size option is not a positive integer")
+        check_columnar_options(columnar, dtypes)
         self.extract_section = extract_section
         self.create_attribute = create_attribute
+        self.deep_copy = deep_copy
+        self.json_backend = get_json_backend(json_backend)
+        self.stream = stream or stream_items
+        self.stream_items = stream_items
+        self.chunk_size = chunk_size
+        self.columnar = columnar
+        self.dtypes = dtypes
 
     def _check_content(self):
         content_type = self._headers_lowercase.get("content-type", "unknown")
@@ -117,20 +180,60 @@ class JSONResponse(Response):
         :rtype: ``dict``
         """
 
-        # replace content by decoded content
-        self.raw = copy.deepcopy(self._response.json())
+        if self.stream:
+            self._parse_stream()
+            return
+
+        # replace content by decoded content, which is decoded only once
+        self.raw = self.json_backend.loads_response(self._response)
 
         # subset the response dictionary
-        json = copy.deepcopy(self._response.json())
+        json = self.raw
         if isinstance(json, dict) and self.extract_section:
             for element in self.extract_section:
                 if element in json:
                     json = json[element]
                 else:
                     raise RestResourceMissingContentError(f"Element {element} could not be found")
+        if self.columnar:
+            json = columns_from_records(json, self.columnar, self.dtypes)
+        elif self.deep_copy:
+            json = copy.deepcopy(json)
+        setattr(self, self.create_attribute, json)
+        self.data = json
+
+    def _parse_stream(self):
+        """Extract the payload subsection while the response content is read.
+
+        The JSON decoder of the standard library decodes the subsection, as it is the only one
+        that can decode a JSON value that is followed by other content.
+
+        """
+        chunks = decode_chunks(self._response.iter_content(chunk_size=self.chunk_size))
+        path = self.extract_section or []
+        if self.stream_items:
+            json = self._iter_stream_items(chunks, path)
+            if self.columnar:
+                # the elements are converted one block at a time
+                json = columns_from_records(json, self.columnar, self.dtypes)
+        else:
+            try:
+                json = extract_json_section(chunks, path)
+            finally:
+                # the remainder of the content is not needed
+                self._response.close()
+            if self.columnar:
+                json = columns_from_records(json, self.columnar, self.dtypes)
         setattr(self, self.create_attribute, json)
         self.data = json
 
+    def _iter_stream_items(self, chunks: Iterator[str], path: List[str]) -> Iterator[Any]:
+        """Yield the array elements of the payload subsection and close the response afterwards."""
+        try:
+            yield from iter_json_section(chunks, path)
+        finally:
+            self._response.close()
+
 
 class CSVResponse(Response):
     """Wrap a REST response for content type text/csv.
@@ -140,16 +243,92 @@ class CSVResponse(Response):
 
     """
 
+    def __init__(
+        self,
+        stream: bool = False,
+        rows_as_dict: bool = False,
+        encoding: str = "utf-8",
+        chunk_size: int = 65536,
+        columnar: Optional[str] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        The content is parsed according to RFC 4180, so a quoted field can contain commas, quotes
+        and line breaks. Empty lines are skipped.
+
+        :param stream: If True, the data of the response is a generator that parses and yields
+            the rows one by one, while the response is read. The raw data is not available in
+            this mode.
+        :param rows_as_dict: If True, the first row is the header and every other row is returned
+            as a dictionary of header field to value.
+        :param encoding: The encoding of the CSV content.
+        :param chunk_size: The number of bytes read at a time in stream mode.
+        :param columnar: If set, the first row is the header and the other rows are converted to
+            a NumPy array per column, see :mod:`qrest.columnar`. Value "dict" gives a dictionary
+            of header field to array, value "structured" gives a single structured array. In
+            stream mode, the rows are converted while the response is read. Requires numpy.
+        :param dtypes: The NumPy dtype of some or all of the columns, by header field. A column
+            that is not listed gets an integer or float dtype if all its values are integers or
+            numbers, and a string dtype otherwise.
+
+        """
+        for name, value in [("stream", stream), ("rows_as_dict", rows_as_dict)]:
+            if not isinstance(value, bool):
+                raise RestClientConfigurationError(f"{name} option is not True or False")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise RestClientConfigurationError("chunk_size option is not a positive integer")
+        check_columnar_options(columnar, dtypes)
+        if columnar and rows_as_dict:
+            raise RestClientConfigurationError("rows_as_dict and columnar options are exclusive")
+        self.stream = stream
+        self.rows_as_dict = rows_as_dict
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.columnar = columnar
+        self.dtypes = dtypes
+
     def _check_content(self):
         content_type = self._headers_lowercase.get("content-type", "unknown")
         if "text/csv" not in content_type:
             raise TypeError(f"the REST response did not give a CSV but a {content_type}")
 
-    def _parse(self) -> List[List[str]]:
-        """ processes a raw CSV into lines. For very large content this may be better served by a generator
-        """
-        content = self._response.content
-        self.raw = content.decode("UTF-8")
+    def _parse(self):
+        """Parse the CSV content into a list of rows, a generator of rows or columnar data."""
+        if self.stream:
+            chunks = self._response.iter_content(chunk_size=self.chunk_size)
+            lines = split_lines(decode_chunks(chunks, self.encoding))
+            if self.columnar:
+                try:
+                    self.data = self._read_columns(lines)
+                finally:
+                    self._response.close()
+            else:
+                self.data = self._iter_stream_rows(lines)
+            return
 
-        lines = self.raw.strip().split("\n")
-        self.data = [line.split(",") for line in lines]
+        content = self._response.content
+        self.raw = content.decode(self.encoding)
+        lines = io.StringIO(self.raw, newline="")
+        if self.columnar:
+            self.data = self._read_columns(lines)
+        else:
+            self.data = list(self._read_rows(lines))
+
+    def _read_columns(self, lines: Iterable[str]) -> Any:
+        """Return the rows in the given lines as columnar data with the first row as header."""
+        rows = (row for row in csv.reader(lines) if row)
+        names = next(rows, [])
+        return columns_from_rows(names, rows, self.columnar, self.dtypes, from_text=True)
+
+    def _read_rows(self, lines: Iterable[str]) -> Iterator[Any]:
+        """Return an iterator over the non-empty rows in the given lines."""
+        if self.rows_as_dict:
+            return csv.DictReader(lines)
+        return (row for row in csv.reader(lines) if row)
+
+    def _iter_stream_rows(self, lines: Iterable[str]) -> Iterator[Any]:
+        """Yield the rows in the given lines and close the response afterwards."""
+        try:
+            yield from self._read_rows(lines)
+        finally:
+            self._response.close()
@@ -0,0 +1,185 @@
+"""This module implements the retry policy of requests that fail because of a timeout, a connection
+error or a transient error response such as status 503.
+
+A :class:`RetryPolicy` is declared on an APIConfig for all its endpoints, or on a ResourceConfig
+for a single endpoint. Retries are spread out by exponential backoff with jitter and follow the
+Retry-After header of the response. A :class:`RetryBudget` per API limits the retries to a
+fraction of the requests, so a server that is down is not flooded with retries.
+
+"""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+import requests
+
+# ================================================================================================
+# local imports
+from .exception import RestClientConfigurationError
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+"""status codes of responses that are retried by default"""
+
+RETRY_METHODS = ("GET", "PUT")
+"""idempotent methods, i.e. the methods that are retried by default"""
+
+
+# =================================================================================================
+class RetryPolicy:
+    """Describes when and how often a request is sent again."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        methods: Iterable[str] = RETRY_METHODS,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        errors: bool = True,
+    ):
+        """
+        :param max_attempts: the maximum number of times a request is sent, including the first
+            time
+        :param status_codes: the status codes of the responses to retry
+        :param methods: the HTTP methods of the requests to retry. Only retry methods that are
+            idempotent, as a retried request may have been processed by the server already
+        :param backoff_factor: the delay in seconds before the first retry, which doubles for
+            each next retry
+        :param max_backoff: the maximum delay in seconds between two attempts
+        :param jitter: if True, the delay is a random duration up to the backoff, so clients that
+            failed at the same time do not retry at the same time
+        :param retry_after: if True, the delay is the one that the Retry-After header of the
+            response asks for, if any
+        :param max_retry_after: the maximum delay in seconds that a Retry-After header may ask
+            for. A response that asks for a longer delay is not retried
+        :param errors: if True, timeouts and connection errors are retried as well
+        :raises RestClientConfigurationError: when one of the options is invalid
+        """
+        if not isinstance(max_attempts, int) or isinstance(max_attempts, bool) or max_attempts < 1:
+            raise RestClientConfigurationError("max_attempts must be a positive integer")
+        for name, value in [
+            ("backoff_factor", backoff_factor),
+            ("max_backoff", max_backoff),
+            ("max_retry_after", max_retry_after),
+        ]:
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise RestClientConfigurationError(f"{name} must be a non-negative number")
+        for name, value in [("jitter", jitter), ("retry_after", retry_after), ("errors", errors)]:
+            if not isinstance(value, bool):
+                raise RestClientConfigurationError(f"{name} is not True or False")
+        self.max_attempts = max_attempts
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+        self.errors = errors
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(max_attempts={self.max_attempts}, "
+            f"status_codes={sorted(self.status_codes)}, methods={sorted(self.methods)})"
+        )
+
+    def allows(self, method: str) -> bool:
+        """Return True if and only if requests with the given method may be retried."""
+        return self.max_attempts > 1 and method.upper() in self.methods
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay in seconds after the given failed attempt, starting at 1."""
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay(self, attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+        """Return the delay in seconds before the given failed attempt is retried, or None if it
+        should not be retried.
+
+        :param attempt: the number of the failed attempt, starting at 1
+        :param response: the response of the failed attempt, or None if it failed with an error
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is None:
+            return self.backoff(attempt) if self.errors else None
+        if response.status_code not in self.status_codes:
+            return None
+        if self.retry_after:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+# =================================================================================================
+class RetryBudget:
+    """Limits the retries of an API to a fraction of its requests.
+
+    The budget is a balance of retries. Each request that may be retried adds the ratio to the
+    balance, up to the reserve, and each retry takes one from it. When the balance drops below
+    one, failed requests are no longer retried until enough new requests have been sent. So in a
+    short burst the API may retry up to the reserve, but in an outage the retries add at most the
+    ratio to the load of the server.
+
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        """
+        :param ratio: the number of retries that each request adds to the balance
+        :param reserve: the maximum, and initial, balance
+        :raises RestClientConfigurationError: when one of the options is invalid
+        """
+        if not isinstance(ratio, (int, float)) or isinstance(ratio, bool) or ratio < 0:
+            raise RestClientConfigurationError("retry_budget must be a non-negative number")
+        if not isinstance(reserve, int) or isinstance(reserve, bool) or reserve < 0:
+            raise RestClientConfigurationError(
+                "retry_budget_reserve must be a non-negative integer"
+            )
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        """the number of retries that are available"""
+        return self._balance
+
+    def deposit(self):
+        """Add the ratio to the balance for a request that may be retried."""
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the balance and return True, or return False if the budget is
+        exhausted."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+# =================================================================================================
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds of the given value of a Retry-After header, which is either a
+    number of seconds or an HTTP date, or None if there is no valid value."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None or retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
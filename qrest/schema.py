@@ -0,0 +1,65 @@
+"""This module compiles the JSON schema of a parameter into a reusable validator.
+Next to the jsonschema library, which qrest requires, qrest supports the faster
+fastjsonschema library, which generates Python code for each schema, but only if
+it is installed. Both libraries are only imported when a schema is compiled.
+
+"""
+
+from typing import Any, Callable, Dict
+
+# ================================================================================================
+# local imports
+from .exception import RestClientConfigurationError
+
+SCHEMA_BACKENDS = ("jsonschema", "fastjsonschema")
+"""names of the supported libraries to validate a JSON schema with"""
+
+
+# =================================================================================================
+def compile_schema(schema: Dict[str, Any], backend: str = "jsonschema") -> Callable[[Any], bool]:
+    """Return a function that returns True if and only if a value obeys the given schema.
+
+    The schema is checked with the jsonschema library, whatever the backend.
+
+    :param schema: a valid JSON schema
+    :param backend: the name of the library to validate values with, one of
+        :data:`SCHEMA_BACKENDS`
+    :raises RestClientConfigurationError: when the schema is not valid, when the backend is not
+        supported or when the library of the backend is not installed
+    """
+    if backend not in SCHEMA_BACKENDS:
+        raise RestClientConfigurationError(
+            "schema backend '{}' is not supported: pick from {}".format(
+                backend, ", ".join(SCHEMA_BACKENDS)
+            )
+        )
+
+    import jsonschema
+
+    #  Select the correct validator for the provided schema
+    validator_cls = jsonschema.validators.validator_for(schema)
+    try:
+        validator_cls.check_schema(schema)
+    except jsonschema.SchemaError:
+        raise RestClientConfigurationError("provided schema is not a valid schema")
+
+    if backend == "jsonschema":
+        return validator_cls(schema).is_valid
+
+    try:
+        import fastjsonschema
+    except ImportError:
+        raise RestClientConfigurationError("schema backend fastjsonschema is not installed")
+    try:
+        validate = fastjsonschema.compile(schema)
+    except fastjsonschema.JsonSchemaDefinitionException:
+        raise RestClientConfigurationError("provided schema is not a valid schema")
+
+    def is_valid(value: Any) -> bool:
+        try:
+            validate(value)
+        except fastjsonschema.JsonSchemaValueException:
+            return False
+        return True
+
+    return is_valid
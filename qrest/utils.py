@@ -1,12 +1,27 @@
 """ Contains a set of related and unrelated functions and classes used elsewhere in this module
 """
 
+import codecs
 import logging
-from urllib.parse import urlparse
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Mapping
+from urllib.parse import quote, urljoin, urlparse
 from .exception import RestClientConfigurationError
 
+try:
+    import fcntl
+except ImportError:
+    # no advisory file locks on this platform
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# the line endings that split_lines recognizes
+_LINE_ENDING = re.compile(r"\r\n|\r|\n")
+
 
 # ###############################################################
 class URLValidator:
@@ -34,3 +49,146 @@ class URLValidator:
             raise RestClientConfigurationError(f"the URL {url} is has no domain indication")
         if require_path and not final_url.path:
             raise RestClientConfigurationError(f"the URL {url} has no valid path")
+
+
+# ###############################################################
+class URLTemplate:
+    """
+    URL of a resource with a placeholder for each of its path parameters. The URL is joined and
+    validated once, when the template is created, so building the URL of a call only requires the
+    path parameters to be filled in.
+    """
+
+    def __init__(self, server_url: str, path: List[str]):
+        """
+        :param server_url: the base server URL (e.g. http://localhost:8080)
+        :param path: the components of the path, where a component in curly brackets is a path
+            parameter
+        """
+        self.server_url = server_url
+        self.path = "/".join(path)
+        self.path_parameters = tuple(
+            part[1:-1] for part in path if part.startswith("{") and part.endswith("}")
+        )
+
+        # escape curly brackets in the server URL, as only the path has placeholders
+        escaped_server_url = server_url.replace("{", "{{").replace("}", "}}")
+        self._template = urljoin(base=escaped_server_url, url=self.path)
+
+        # a path parameter cannot change the validity of the URL, so the URL is validated only
+        # once; if it is not valid, the error is raised when the URL of a call is requested
+        self._error = None
+        try:
+            self._check(self._template)
+        except RestClientConfigurationError as error:
+            self._error = error
+
+    # ------------------------------------------------------------------
+    def build(self, values: Mapping[str, Any]) -> str:
+        """
+        return the URL for the given parameter values, of which only the path parameters are used
+        """
+        if self._error is not None:
+            raise RestClientConfigurationError(*self._error.args)
+
+        path_para = {
+            name: quote(str(values[name]), safe="")
+            for name in self.path_parameters
+            if name in values
+        }
+        if any(value in ("", ".", "..") for value in path_para.values()):
+            # an empty or dot segment changes the result of urljoin, so the URL is joined as is
+            url = urljoin(base=self.server_url, url=self.path.format(**path_para))
+            self._check(url)
+            return url
+        return self._template.format(**path_para)
+
+    @staticmethod
+    def _check(url: str):
+        # Only allow http or https schemes for the REST API base URL
+        URLValidator(schemes=["http", "https"]).check(url)
+
+
+# ###############################################################
+def decode_chunks(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Return the text of the given byte chunks, decoded incrementally.
+
+    A character whose bytes are split over two chunks is returned as part of the text of the
+    second chunk.
+
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def split_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Return the lines of the given text chunks, each including its line ending.
+
+    A line ends with "\\n", "\\r\\n" or "\\r", as in a file that is opened with ``newline=""``.
+    A "\\r" at the end of a chunk may be followed by "\\n" in the next chunk, so its line is only
+    returned together with the next chunk.
+
+    """
+    remainder = ""
+    for chunk in chunks:
+        text = remainder + chunk
+        start = 0
+        for match in _LINE_ENDING.finditer(text):
+            end = match.end()
+            if end == len(text) and text.endswith("\r"):
+                break
+            yield text[start:end]
+            start = end
+        remainder = text[start:]
+    if remainder:
+        yield remainder
+
+
+# ###############################################################
+def write_file_atomically(path: str, content: str):
+    """Replace the file at the given path by a file with the given content.
+
+    The content is written to a new file in the same directory that is renamed to the path, so
+    other processes read either the old or the new content but never a partial file. The file is
+    only readable and writable by the current user.
+
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+    handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=".qrest-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+@contextmanager
+def lock_file(path: str):
+    """Context manager that holds an exclusive advisory lock on the file at the given path.
+
+    The lock synchronizes processes, and threads that lock the file separately, that use the
+    same path. On platforms without fcntl no lock is taken.
+
+    """
+    if fcntl is None:
+        yield
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as locked_file:
+        fcntl.flock(locked_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(locked_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,107 @@
+"""A local HTTP server that stands in for a REST service, or for the server that authenticates
+its clients, and an API that is configured for that server.
+
+"""
+
+import http.server
+import itertools
+import threading
+import types
+import unittest
+from typing import Iterable, Type
+
+import qrest
+from qrest import APIConfig, ResourceConfig
+
+_module_numbers = itertools.count(1)
+
+
+class LocalHandler(http.server.BaseHTTPRequestHandler):
+    """Base class of the handlers of the local servers."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length)
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LocalServer(http.server.ThreadingHTTPServer):
+    """Base class of the local servers, which listen on a free port of the loopback interface.
+
+    A subclass sets the class of its handler and holds the state that the handler keeps, such as
+    the requests that it has received.
+
+    """
+
+    handler_class: Type[LocalHandler] = LocalHandler
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), self.handler_class)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class Post(ResourceConfig):
+    name = "post"
+    path = ["posts", "{id}"]
+    method = "GET"
+
+
+def create_config_module(
+    resource_configs: Iterable[Type[ResourceConfig]] = (Post,), **attributes
+) -> types.ModuleType:
+    """Return a new configuration module that contains an APIConfig with the given attributes and
+    a subclass of each of the given ResourceConfig classes.
+
+    Each call creates new classes in a new module, so the configuration of one test does not leak
+    into another one.
+
+    """
+    module = types.ModuleType(f"local_server_config_{next(_module_numbers)}")
+
+    def add_subclass(base):
+        namespace = dict(attributes) if base is APIConfig else {}
+        namespace["__module__"] = module.__name__
+        setattr(module, base.__name__, type(base.__name__, (base,), namespace))
+
+    add_subclass(APIConfig)
+    for resource_config in resource_configs:
+        add_subclass(resource_config)
+    return module
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """Test case that starts a new local server for each test."""
+
+    server_class: Type[LocalServer] = LocalServer
+
+    def setUp(self):
+        self.server = self.server_class()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.server_url = self.server.url
+
+    def create_local_api(
+        self, resource_configs: Iterable[Type[ResourceConfig]] = (Post,), **attributes
+    ) -> qrest.API:
+        """Return an API for the local server, see :func:`create_config_module`."""
+        module = create_config_module(resource_configs, url=self.server_url, **attributes)
+        api = qrest.API(module)
+        self.addCleanup(api.close)
+        return api
@@ -0,0 +1,74 @@
+import threading
+import unittest
+
+from qrest.auth import CredentialRefresher, RESTAuthentication, UserPassAuth
+from qrest.exception import RestClientConfigurationError
+
+
+class TokenAuth(RESTAuthentication):
+    """Authentication with a token that expires after a second."""
+
+    def __init__(self, failures=0):
+        super().__init__(rest_client=None)
+        self.refreshed = threading.Event()
+        self.failures = failures
+        self.calls = 0
+
+    def set_credentials(self):
+        self.credentials_are_set = True
+
+    def refresh_credentials(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ValueError("login failed")
+        self.refreshed.set()
+
+    def credentials_lifetime(self):
+        return 1.0
+
+
+class CredentialRefresherTests(unittest.TestCase):
+    def test_credentials_are_refreshed_after_fraction_of_their_lifetime(self):
+        auth = TokenAuth()
+
+        refresher = auth.start_refresher(fraction=0.05)
+        self.addCleanup(auth.stop_refresher)
+
+        self.assertEqual(0.05, refresher._delay())
+        self.assertTrue(auth.refreshed.wait(5))
+
+    def test_failed_refresh_is_retried(self):
+        auth = TokenAuth(failures=2)
+        refresher = CredentialRefresher(auth, interval=0.01, retry_interval=0.01)
+        self.addCleanup(refresher.stop)
+
+        with self.assertLogs("qrest.auth", level="WARNING") as logs:
+            refresher.start()
+            self.assertTrue(auth.refreshed.wait(5))
+
+        self.assertEqual(3, auth.calls)
+        self.assertIn("could not refresh credentials: login failed", logs.output[0])
+
+    def test_stop_ends_the_thread(self):
+        auth = TokenAuth()
+        refresher = auth.start_refresher(interval=60)
+
+        auth.stop_refresher()
+
+        self.assertFalse(refresher._thread.is_alive())
+        self.assertIsNone(auth.refresher)
+
+    def test_authentication_without_refresh_support(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "does not support refreshing"):
+            UserPassAuth(rest_client=None).start_refresher(interval=1)
+
+    def test_interval_is_required_when_lifetime_is_unknown(self):
+        auth = TokenAuth()
+        auth.credentials_lifetime = lambda: None
+
+        with self.assertRaisesRegex(RestClientConfigurationError, "interval is required"):
+            auth.start_refresher()
+
+    def test_invalid_fraction(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "between 0 and 1"):
+            CredentialRefresher(TokenAuth(), fraction=1.5)
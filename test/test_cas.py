@@ -0,0 +1,281 @@
+import builtins
+import itertools
+import os
+import tempfile
+import threading
+import time
+import unittest.mock as mock
+from urllib.parse import parse_qs
+
+import ddt
+
+from qrest.auth.cas import CasAuthConfig
+from qrest.exception import RestAccessDeniedError, RestClientConfigurationError
+
+from . import local_server
+
+
+class CASHandler(local_server.LocalHandler):
+    """Handler of a CAS server and a service that accepts its service tickets."""
+
+    def do_POST(self):
+        server = self.server
+        form = parse_qs(self._read_body().decode())
+        if self.path == "/cas/v1/tickets":
+            server.requests.append("tgt")
+            server.tgt_count += 1
+            time.sleep(server.tgt_delay)
+            location = f"{server.url}/cas/v1/tickets/TGT-1"
+            self._send(201, headers={"Location": location})
+        elif self.path.startswith("/cas/v1/tickets/TGT-") and form["service"] == ["my-service"]:
+            server.requests.append("st")
+            server.granting_tickets.append(self.path.rsplit("/", 1)[1])
+            ticket = f"ST-{next(server.counter)}"
+            server.valid_tickets.add(ticket)
+            self._send(200, ticket.encode())
+        else:
+            self._send(404)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append("get")
+        ticket = self.headers.get("Authorization", "").partition(" ")[2]
+        cookie = self.headers.get("Cookie", "")
+        if cookie and cookie in server.valid_cookies:
+            self._send(200, b'{"id": 1}', {"Content-Type": "application/json"})
+        elif ticket in server.valid_tickets and server.accept_tickets:
+            headers = {"Content-Type": "application/json"}
+            if server.set_cookie:
+                session_cookie = f"session={ticket}"
+                server.valid_cookies.add(session_cookie)
+                headers["Set-Cookie"] = session_cookie + "; Path=/"
+            self._send(200, b'{"id": 1}', headers)
+        else:
+            self._send(401)
+
+
+class CASServer(local_server.LocalServer):
+    handler_class = CASHandler
+
+    def __init__(self):
+        super().__init__()
+        self.counter = itertools.count(1)
+        self.requests = []
+        self.granting_tickets = []
+        self.valid_tickets = set()
+        self.valid_cookies = set()
+        self.set_cookie = False
+        self.accept_tickets = True
+        self.tgt_delay = 0
+        self.tgt_count = 0
+
+
+@ddt.ddt
+class CASAuthTests(local_server.LocalServerTestCase):
+    server_class = CASServer
+
+    def create_api(
+        self,
+        ticket_reuse=None,
+        tgt_file=None,
+        netrc_path=None,
+        tgt_lifetime=None,
+        cookie_file=None,
+    ):
+        authentication = CasAuthConfig(
+            path=["cas", "v1", "tickets"],
+            service_name="my-service",
+            ticket_reuse=ticket_reuse,
+            tgt_lifetime=tgt_lifetime,
+            cookie_file=cookie_file,
+        )
+        api = self.create_local_api(authentication=authentication)
+        api.auth.set_credentials(
+            server_url=self.server_url,
+            username=None if netrc_path else "user",
+            password=None if netrc_path else "pw",
+            netrc_path=netrc_path,
+            tgt_volatile_storage=tgt_file is None,
+            granting_ticket_filepath=tgt_file,
+        )
+        self.server.requests.clear()
+        return api
+
+    @ddt.data(
+        (None, ["st", "get", "st", "get", "st", "get"]),
+        ("ticket", ["get", "get", "get"]),
+    )
+    @ddt.unpack
+    def test_service_ticket_reuse(self, ticket_reuse, expected_requests):
+        api = self.create_api(ticket_reuse)
+
+        for _ in range(3):
+            self.assertEqual({"id": 1}, api.post(id=1))
+
+        self.assertEqual(expected_requests, self.server.requests)
+
+    def test_rejected_ticket_is_replaced_and_request_is_retried(self):
+        api = self.create_api("ticket")
+        api.post(id=1)
+
+        self.server.valid_tickets.clear()
+        self.server.requests.clear()
+        self.assertEqual({"id": 1}, api.post(id=1))
+        self.assertEqual({"id": 1}, api.post(id=1))
+
+        self.assertEqual(["get", "st", "get", "get"], self.server.requests)
+
+    def test_session_cookie_replaces_ticket(self):
+        self.server.set_cookie = True
+        api = self.create_api("cookie")
+
+        for _ in range(3):
+            self.assertEqual({"id": 1}, api.post(id=1))
+        self.assertEqual(["st", "get", "get", "get"], self.server.requests)
+
+        self.server.valid_cookies.clear()
+        self.server.requests.clear()
+        self.assertEqual({"id": 1}, api.post(id=1))
+        self.assertEqual(["get", "st", "get"], self.server.requests)
+
+    def test_session_cookie_is_reused_by_later_process(self):
+        self.server.set_cookie = True
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cookie_file = os.path.join(directory.name, "cookies.json")
+        self.create_api("cookie", cookie_file=cookie_file).post(id=1)
+        self.assertEqual(["st", "get"], self.server.requests)
+
+        # a new API stands in for a later process
+        api = self.create_api("cookie", cookie_file=cookie_file)
+        self.assertEqual({"id": 1}, api.post(id=1))
+        self.assertEqual(["get"], self.server.requests)
+
+    def test_rejected_request_is_retried_once(self):
+        api = self.create_api("ticket")
+        self.server.accept_tickets = False
+
+        with self.assertRaises(RestAccessDeniedError):
+            api.post(id=1)
+        with self.assertRaises(RestAccessDeniedError):
+            api.post(id=1)
+
+        # each request is sent at most twice
+        self.assertEqual(["get", "st", "get", "get", "st", "get"], self.server.requests)
+
+    def test_tgt_file_is_read_only_when_it_changes(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        tgt_file = os.path.join(directory.name, "tgt")
+        api = self.create_api(tgt_file=tgt_file)
+
+        with mock.patch("qrest.auth.cas.open", create=True, wraps=builtins.open) as opened:
+            api.post(id=1)
+            api.post(id=1)
+            opened.assert_not_called()
+
+            # another process renews the TGT
+            with open(tgt_file, "w") as tgt:
+                tgt.write(f"{self.server_url}/cas/v1/tickets/TGT-2")
+            api.post(id=1)
+            api.post(id=1)
+            self.assertEqual(1, opened.call_count)
+
+        self.assertEqual(["TGT-1", "TGT-1", "TGT-2", "TGT-2"], self.server.granting_tickets[-4:])
+
+    def test_tgt_is_not_logged(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with self.assertLogs("qrest.auth.cas", level="DEBUG") as logs:
+            api = self.create_api(tgt_file=os.path.join(directory.name, "tgt"))
+            api.auth._tgt_file = None
+            api.post(id=1)
+
+        self.assertTrue(logs.output)
+        self.assertFalse([line for line in logs.output if "TGT-1" in line])
+
+    def test_single_process_renews_shared_tgt_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        tgt_file = os.path.join(directory.name, "tgt")
+        netrc_path = os.path.join(directory.name, "netrc")
+        with open(netrc_path, "w") as netrc_file:
+            netrc_file.write("machine 127.0.0.1 login user password pw\n")
+        self.server.tgt_delay = 0.2
+
+        # each API has its own CASAuth, so they only share the lock on the TGT file
+        barrier = threading.Barrier(8)
+        apis = []
+
+        def start_worker():
+            barrier.wait()
+            apis.append(self.create_api(tgt_file=tgt_file, netrc_path=netrc_path))
+
+        workers = [threading.Thread(target=start_worker) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(8, len(apis))
+        self.assertEqual(1, self.server.tgt_count)
+        with open(tgt_file) as tgt:
+            self.assertEqual(f"{self.server_url}/cas/v1/tickets/TGT-1", tgt.read())
+
+    def test_tgt_renewed_by_other_process_after_failure_is_reused(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        tgt_file = os.path.join(directory.name, "tgt")
+        netrc_path = os.path.join(directory.name, "netrc")
+        with open(netrc_path, "w") as netrc_file:
+            netrc_file.write("machine 127.0.0.1 login user password pw\n")
+        api = self.create_api(tgt_file=tgt_file, netrc_path=netrc_path)
+        with open(tgt_file, "w") as tgt:
+            tgt.write(f"{self.server_url}/cas/v1/tickets/TGT-0")
+        post = api.auth._post
+
+        def reject_expired_tgt(url, data):
+            if not url.endswith("/TGT-0"):
+                return post(url, data)
+            # another process renews the TGT while the service ticket is rejected
+            with open(tgt_file, "w") as tgt:
+                tgt.write(f"{self.server_url}/cas/v1/tickets/TGT-2")
+            return mock.Mock(ok=False, status_code=401)
+
+        with mock.patch.object(api.auth, "_post", side_effect=reject_expired_tgt):
+            api.auth.set_credentials(
+                server_url=self.server_url,
+                netrc_path=netrc_path,
+                tgt_volatile_storage=False,
+                granting_ticket_filepath=tgt_file,
+            )
+
+        self.assertEqual(1, self.server.tgt_count)
+        self.assertEqual("TGT-2", self.server.granting_tickets[-1])
+
+    def wait_for_tgt_count(self, count):
+        deadline = time.monotonic() + 5
+        while self.server.tgt_count < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.server.tgt_count
+
+    @ddt.data({"interval": 0.05}, {})
+    def test_refresher_renews_tgt_in_background(self, kwargs):
+        api = self.create_api("ticket", tgt_lifetime=0.1)
+        self.assertEqual(1, self.server.tgt_count)
+
+        api.auth.start_refresher(**kwargs)
+        self.assertGreaterEqual(self.wait_for_tgt_count(3), 3)
+        self.assertEqual({"id": 1}, api.post(id=1))
+
+        api.close()
+        count = self.server.tgt_count
+        time.sleep(0.2)
+        self.assertEqual(count, self.server.tgt_count)
+
+    def test_unsupported_ticket_reuse(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "ticket_reuse 'always'"):
+            CasAuthConfig(path=["cas"], service_name="my-service", ticket_reuse="always")
+        with self.assertRaisesRegex(RestClientConfigurationError, "require the reuse"):
+            CasAuthConfig(path=["cas"], service_name="my-service", cookie_file="cookies.json")
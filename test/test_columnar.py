@@ -0,0 +1,176 @@
+import io
+import json
+import tracemalloc
+import unittest
+import unittest.mock
+
+import requests
+
+from qrest.exception import RestClientConfigurationError, RestResourceMissingContentError
+from qrest.response import CSVResponse, JSONResponse
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _create_response(content: bytes, content_type: str):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-type"] = content_type
+    response._content = content
+    response.raw = io.BytesIO(content)
+    return response
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class CSVColumnarTests(unittest.TestCase):
+    CONTENT = b'id,score,name\n1,0.5,alpha\n2,1.5,"beta, gamma"\n'
+
+    def test_fetch_dict_of_arrays_with_inferred_dtypes(self):
+        response = _create_response(self.CONTENT, "text/csv")
+
+        columns = CSVResponse(columnar="dict")(response).fetch()
+
+        self.assertEqual(["id", "score", "name"], list(columns))
+        self.assertEqual(numpy.int64, columns["id"].dtype)
+        self.assertEqual(numpy.float64, columns["score"].dtype)
+        self.assertEqual(["alpha", "beta, gamma"], columns["name"].tolist())
+        self.assertEqual([0.5, 1.5], columns["score"].tolist())
+
+    def test_fetch_structured_array_with_declared_dtypes(self):
+        response = _create_response(self.CONTENT, "text/csv")
+
+        csv_response = CSVResponse(columnar="structured", dtypes={"id": numpy.float32})
+        array = csv_response(response).fetch()
+
+        self.assertEqual(("id", "score", "name"), array.dtype.names)
+        self.assertEqual(numpy.float32, array["id"].dtype)
+        self.assertEqual([1.0, 2.0], array["id"].tolist())
+
+    def test_fetch_columns_while_reading(self):
+        response = _create_response(self.CONTENT, "text/csv")
+
+        csv_response = CSVResponse(columnar="dict", stream=True, chunk_size=5)
+        columns = csv_response(response).fetch()
+
+        self.assertIsNone(csv_response.raw)
+        self.assertEqual([1, 2], columns["id"].tolist())
+
+    def test_raise_exception_on_row_with_missing_field(self):
+        response = _create_response(b"id,name\n1,alpha\n2\n", "text/csv")
+
+        with self.assertRaisesRegex(RestResourceMissingContentError, "row 1 has 1 values"):
+            CSVResponse(columnar="dict")(response)
+
+    def test_inferred_dtype_does_not_depend_on_blocks(self):
+        # the first block of 4096 rows only contains numbers
+        content = b"code,score\n" + b"007,1.50\n" * 5000 + b"abc,2\n"
+        response = _create_response(content, "text/csv")
+
+        columns = CSVResponse(columnar="dict")(response).fetch()
+
+        self.assertEqual(5001, len(columns["code"]))
+        self.assertEqual(["007", "abc"], numpy.unique(columns["code"]).tolist())
+        self.assertEqual(numpy.float64, columns["score"].dtype)
+        self.assertEqual([1.5, 2.0], numpy.unique(columns["score"]).tolist())
+
+    def test_numbers_that_do_not_fit_are_kept_as_strings(self):
+        content = b"big,huge,score\n99999999999999999999,1e400,1.5\n1,2,inf\n"
+        response = _create_response(content, "text/csv")
+
+        columns = CSVResponse(columnar="dict")(response).fetch()
+
+        self.assertEqual(["99999999999999999999", "1"], columns["big"].tolist())
+        self.assertEqual(["1e400", "2"], columns["huge"].tolist())
+        self.assertEqual([1.5, float("inf")], columns["score"].tolist())
+
+    def test_empty_values_are_missing(self):
+        content = b"id,name\n1,alpha\n,\n3,gamma\n"
+        response = _create_response(content, "text/csv")
+
+        columns = CSVResponse(columnar="dict")(response).fetch()
+
+        self.assertEqual(numpy.float64, columns["id"].dtype)
+        self.assertEqual([1.0, 3.0], columns["id"][[0, 2]].tolist())
+        self.assertTrue(numpy.isnan(columns["id"][1]))
+        self.assertEqual(["alpha", "", "gamma"], columns["name"].tolist())
+
+    def test_columns_need_less_memory_than_rows(self):
+        content = b"id,score\n" + b"".join(b"%d,%d.5\n" % (i, i) for i in range(100_000))
+
+        rows_peak = self._measure(CSVResponse(), content)
+        columns_peak = self._measure(CSVResponse(columnar="dict", stream=True), content)
+
+        self.assertLess(columns_peak, rows_peak / 5)
+
+    @staticmethod
+    def _measure(csv_response, content):
+        response = _create_response(content, "text/csv")
+        tracemalloc.start()
+        try:
+            data = csv_response(response).fetch()
+            if isinstance(data, list):
+                # convert the rows to columns as one would without the columnar option
+                data = {
+                    "id": numpy.array([int(row[0]) for row in data[1:]]),
+                    "score": numpy.array([float(row[1]) for row in data[1:]]),
+                }
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class JSONColumnarTests(unittest.TestCase):
+    RECORDS = [{"id": 1, "score": 0.5, "name": "alpha"}, {"id": 2, "score": 1.5, "name": "beta"}]
+
+    def _create_json_response(self):
+        content = json.dumps({"data": self.RECORDS}).encode("utf-8")
+        return _create_response(content, "application/json")
+
+    def test_fetch_dict_of_arrays(self):
+        json_response = JSONResponse(extract_section=["data"], columnar="dict")
+        columns = json_response(self._create_json_response()).fetch()
+
+        self.assertEqual(numpy.int64, columns["id"].dtype)
+        self.assertEqual([0.5, 1.5], columns["score"].tolist())
+        self.assertIs(columns, json_response.results)
+
+    def test_fetch_structured_array_from_streamed_items(self):
+        json_response = JSONResponse(
+            extract_section=["data"],
+            stream_items=True,
+            columnar="structured",
+            dtypes={"score": numpy.float32},
+        )
+        array = json_response(self._create_json_response()).fetch()
+
+        self.assertEqual(("id", "score", "name"), array.dtype.names)
+        self.assertEqual(numpy.float32, array["score"].dtype)
+        self.assertEqual(["alpha", "beta"], array["name"].tolist())
+
+    def test_raise_exception_on_section_that_is_not_an_array_of_objects(self):
+        json_response = JSONResponse(extract_section=["data", 0], columnar="dict")
+        json_response.extract_section = None
+
+        content = json.dumps([1, 2]).encode("utf-8")
+        with self.assertRaisesRegex(RestResourceMissingContentError, "not an array of objects"):
+            json_response(_create_response(content, "application/json"))
+
+
+class ColumnarConfigurationTests(unittest.TestCase):
+    def test_raise_exception_on_unsupported_format(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "columnar option 'list'"):
+            CSVResponse(columnar="list")
+
+    def test_raise_exception_on_dtypes_without_columnar(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "requires the columnar"):
+            JSONResponse(dtypes={"id": "int64"})
+
+    def test_raise_exception_when_numpy_is_missing(self):
+        with unittest.mock.patch.dict("sys.modules", {"numpy": None}):
+            with self.assertRaisesRegex(RestClientConfigurationError, "requires numpy"):
+                CSVResponse(columnar="dict")
@@ -0,0 +1,118 @@
+import io
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import ddt
+
+import qrest
+from qrest import APIConfig, BodyParameter, FileParameter, QueryParameter, ResourceConfig
+from qrest.compile import generate, main
+from qrest.exception import (
+    RestClientConfigurationError,
+    RestClientQueryError,
+    RestClientValidationError,
+)
+
+
+class CompileConfig(APIConfig):
+    url = "https://jsonplaceholder.typicode.com"
+
+
+class FilterPosts(ResourceConfig):
+    name = "filter_posts"
+    path = ["users", "{user}", "posts"]
+    method = "GET"
+
+    order = QueryParameter(name="_order", choices=["asc", "desc"], default="asc")
+    tags = QueryParameter(name="tag", multiple=True, exclusion_group="filter")
+    title = QueryParameter(name="title", exclusion_group="filter")
+    limit = QueryParameter(name="_limit", schema={"type": "integer", "minimum": 1})
+
+
+class CreatePost(ResourceConfig):
+    name = "create_post"
+    path = ["posts"]
+    method = "POST"
+
+    title = BodyParameter(name="title", required=True)
+    user_id = BodyParameter(name="userId", default=101)
+    attachment = FileParameter(name="file")
+
+
+def _load_compiled():
+    module = types.ModuleType("compiled")
+    exec(generate(sys.modules[__name__]), module.__dict__)
+    return module
+
+
+@ddt.ddt
+class CompileTests(unittest.TestCase):
+    def setUp(self):
+        self.api = qrest.API(sys.modules[__name__])
+        self.compiled_api = qrest.API(sys.modules[__name__], compiled_module=_load_compiled())
+
+    @ddt.data(
+        ("filter_posts", {"user": 1}),
+        ("filter_posts", {"user": 1, "order": "desc", "tags": ["a", "b"], "limit": 5}),
+        ("filter_posts", {"user": 1, "title": "t"}),
+        ("create_post", {"title": "t"}),
+        ("create_post", {"title": "t", "user_id": 7}),
+    )
+    @ddt.unpack
+    def test_compiled_functions_return_the_same_as_the_generic_methods(self, name, kwargs):
+        resource = getattr(self.api, name)
+        compiled_resource = getattr(self.compiled_api, name)
+
+        query = resource.check(**kwargs)
+        compiled_query = compiled_resource.check(**kwargs)
+
+        self.assertEqual(dict(query), dict(compiled_query))
+        self.assertEqual(list(query), list(compiled_query))
+        self.assertEqual(
+            resource.query_parameters(query), compiled_resource.query_parameters(compiled_query)
+        )
+
+    @ddt.data(
+        ("filter_posts", {}, RestClientQueryError, "parameter 'user' is missing"),
+        ("filter_posts", {"user": 1, "other": 2}, RestClientQueryError, "are supplied but"),
+        ("filter_posts", {"user": 1, "order": "up"}, RestClientQueryError, "not a valid choice"),
+        ("filter_posts", {"user": 1, "limit": 0}, RestClientValidationError, "obey schema"),
+        ("filter_posts", {"user": 1, "tags": [], "title": "t"}, RestClientQueryError, "together"),
+        ("filter_posts", {"user": 1, "title": ["t"]}, RestClientQueryError, "is not multiple"),
+        ("create_post", {"title": "t", "attachment": "f"}, RestClientConfigurationError, "tuple"),
+    )
+    @ddt.unpack
+    def test_compiled_functions_raise_the_same_exceptions(self, name, kwargs, exception, regex):
+        resource = getattr(self.compiled_api, name)
+
+        with self.assertRaisesRegex(exception, regex):
+            resource.check(**kwargs)
+
+    def test_outdated_functions_are_not_used(self):
+        compiled = _load_compiled()
+        fingerprint, check, query_parameters = compiled.ENDPOINTS["create_post"]
+        compiled.ENDPOINTS["create_post"] = ("outdated", check, query_parameters)
+
+        with self.assertLogs("qrest.resource", level="WARNING") as logs:
+            api = qrest.API(sys.modules[__name__], compiled_module=compiled)
+
+        self.assertIn("compiled functions of resource 'create_post' are outdated", logs.output[0])
+        self.assertNotIn("check", vars(api.create_post))
+        self.assertIn("check", vars(api.filter_posts))
+
+    def test_lazy_resources_use_compiled_functions(self):
+        api = qrest.API(sys.modules[__name__], compiled_module=_load_compiled(), lazy=True)
+
+        self.assertNotIn("filter_posts", vars(api))
+        self.assertIn("check", vars(api.filter_posts))
+
+    def test_main_writes_module(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "compiled.py")
+            main([__name__, "-o", path])
+
+            with io.open(path, encoding="utf-8") as source:
+                self.assertEqual(generate(sys.modules[__name__]), source.read())
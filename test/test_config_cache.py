@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock as mock
+
+import qrest
+from qrest import APIConfig, BodyParameter, QueryParameter, ResourceConfig
+from qrest.config_cache import cache_key
+from qrest.exception import RestClientConfigurationError, RestClientValidationError
+
+
+class CacheConfig(APIConfig):
+    url = "https://jsonplaceholder.typicode.com"
+    default_headers = {"Content-type": "application/json; charset=UTF-8"}
+    default_timeout = (2, 5)
+
+
+class FilterPosts(ResourceConfig):
+    name = "filter_posts"
+    path = ["users", "{user}", "posts"]
+    method = "GET"
+
+    order = QueryParameter(name="_order", choices=["asc", "desc"], default="asc")
+    tags = QueryParameter(name="tag", multiple=True, exclusion_group="filter")
+    title = QueryParameter(name="title", exclusion_group="filter")
+    limit = QueryParameter(name="_limit", schema={"type": "integer", "minimum": 1})
+
+
+class CreatePost(ResourceConfig):
+    name = "create_post"
+    path = ["posts"]
+    method = "POST"
+    timeout = (1, 1)
+
+    title = BodyParameter(name="title", required=True)
+
+
+class ConfigCacheTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_file = os.path.join(directory.name, "config.json")
+        self.module = sys.modules[__name__]
+
+    def test_restored_endpoints_equal_validated_endpoints(self):
+        api = qrest.API(self.module, cache_file=self.cache_file)
+
+        with mock.patch.object(ResourceConfig, "validate") as validate:
+            cached_api = qrest.API(self.module, cache_file=self.cache_file)
+        validate.assert_not_called()
+
+        for name, endpoint in api.config.endpoints.items():
+            cached_endpoint = cached_api.config.endpoints[name]
+            self.assertEqual(endpoint.validation_plan, cached_endpoint.validation_plan)
+            self.assertEqual(endpoint.headers, cached_endpoint.headers)
+            self.assertEqual(endpoint.timeout, cached_endpoint.timeout)
+        self.assertEqual((1, 1), cached_api.create_post.config.timeout)
+
+    def test_restored_endpoints_check_parameters(self):
+        qrest.API(self.module, cache_file=self.cache_file)
+        api = qrest.API(self.module, cache_file=self.cache_file)
+
+        query = api.filter_posts.check(user=1, limit=5)
+        self.assertEqual({"user": 1, "limit": 5, "order": "asc"}, dict(query))
+        with self.assertRaisesRegex(RestClientValidationError, "obey schema"):
+            api.filter_posts.check(user=1, limit=0)
+
+    def test_outdated_cache_is_replaced(self):
+        with open(self.cache_file, "w", encoding="utf-8") as cache_file:
+            json.dump({"key": "outdated", "endpoints": {}}, cache_file)
+
+        with mock.patch.object(
+            ResourceConfig, "validate", autospec=True, side_effect=ResourceConfig.validate
+        ) as validate:
+            qrest.API(self.module, cache_file=self.cache_file)
+        validate.assert_called()
+
+        with open(self.cache_file, encoding="utf-8") as cache_file:
+            content = json.load(cache_file)
+        self.assertEqual(cache_key(self.module), content["key"])
+        self.assertEqual({"filter_posts", "create_post"}, set(content["endpoints"]))
+
+    def test_invalid_cache_is_ignored(self):
+        with open(self.cache_file, "w", encoding="utf-8") as cache_file:
+            cache_file.write("{not json")
+
+        api = qrest.API(self.module, cache_file=self.cache_file)
+
+        self.assertEqual(["create_post", "filter_posts"], api.resources)
+
+    def test_lazy_and_cache_file_cannot_be_combined(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "can't be combined"):
+            qrest.API(self.module, lazy=True, cache_file=self.cache_file)
@@ -1,12 +1,20 @@
 import unittest
+import unittest.mock as mock
 
 from typing import Dict
 
+from jsonschema.validators import validator_for
+
 from qrest import APIConfig, RestClientConfigurationError
 from qrest import QueryParameter, BodyParameter, FileParameter, ResourceConfig
 from qrest import JSONResource
 from qrest.auth import UserPassAuthConfig
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 
 def _create_endpoints(**kwargs) -> Dict[str, ResourceConfig]:
     """Return endpoints for testing purposes.
@@ -44,6 +52,15 @@ class TestMinimal(unittest.TestCase):
 
             Config({"ep": ResourceConfig(path=[""], method="ERR")})
 
+    def test_resource_name_may_not_replace_api_attribute(self):
+        class Config(APIConfig):
+            url = "http://localhost"
+
+        for name in ["session", "close", "gather", "auth", "config", "_retry_budget"]:
+            with self.subTest(name=name):
+                with self.assertRaisesRegex(RestClientConfigurationError, "attribute of the API"):
+                    Config({name: ResourceConfig(path=[""], method="GET")})
+
 
 class TestParameters(unittest.TestCase):
     def setUp(self):
@@ -218,6 +235,38 @@ class TestParameters(unittest.TestCase):
 
         self.assertEqual(exc.exception.args[0], "default does not obey schema")
 
+    def test_schema_is_compiled_once(self):
+        with mock.patch("jsonschema.validators.validator_for", wraps=validator_for) as mocked:
+            parameter = QueryParameter(name="foo", schema={"type": "integer"}, default=4)
+
+            self.assertTrue(parameter.obeys_schema(5))
+            self.assertFalse(parameter.obeys_schema("bar"))
+
+        self.assertEqual(1, mocked.call_count)
+
+    @unittest.skipIf(fastjsonschema is None, "fastjsonschema is not installed")
+    def test_fastjsonschema_backend(self):
+        schema = {"type": "object", "properties": {"id": {"type": "integer"}}}
+        parameter = BodyParameter(name="foo", schema=schema, schema_backend="fastjsonschema")
+
+        self.assertTrue(parameter.obeys_schema({"id": 1}))
+        self.assertFalse(parameter.obeys_schema({"id": "1"}))
+
+        with self.assertRaises(RestClientConfigurationError) as exc:
+            parameter = BodyParameter(
+                name="foo", schema={"type": "ni"}, schema_backend="fastjsonschema"
+            )
+            parameter.compile()
+
+        self.assertEqual(exc.exception.args[0], "provided schema is not a valid schema")
+
+    def test_bad_schema_backend(self):
+        with self.assertRaises(RestClientConfigurationError) as exc:
+            QueryParameter(name="foo", schema={"type": "integer"}, schema_backend="other")
+
+        msg = 'parameter "schema_backend" must be one of jsonschema, fastjsonschema'
+        self.assertEqual(exc.exception.args[0], msg)
+
 
 class TestEndpoint(unittest.TestCase):
     def setUp(self):
@@ -428,6 +477,50 @@ class TestEndpoint(unittest.TestCase):
         ep1_endpoint = c.endpoints["ep1"]
         self.assertListEqual(expected, ep1_endpoint.path_parameters)
 
+    def test_validation_plan(self):
+        endpoints = {
+            "ep1": ResourceConfig(
+                path=["x", "{y}"],
+                method="POST",
+                parameters={
+                    "p1": QueryParameter("p1", choices=["a", "b"], default="a"),
+                    "p2": QueryParameter("p2", multiple=True, exclusion_group="g"),
+                    "p3": QueryParameter("p3", required=True, exclusion_group="g"),
+                    "p4": FileParameter("p4"),
+                    "p5": BodyParameter("p5", schema={"type": "integer"}),
+                },
+            ),
+            "ep2": ResourceConfig(path=["x"], method="GET"),
+        }
+        c = self.UrlApiConfig(endpoints)
+
+        plan = c.endpoints["ep1"].validation_plan
+        self.assertEqual(frozenset(["p1", "p2", "p3", "p4", "p5", "y"]), plan.all_parameters)
+        self.assertEqual(frozenset(["y"]), plan.path_parameters)
+        self.assertEqual(("y", "p3"), plan.required)
+        self.assertEqual(frozenset(["p2"]), plan.multiple)
+        self.assertEqual({"p2": "g", "p3": "g"}, plan.groups)
+        self.assertEqual({"p1": ["a", "b"]}, plan.choices)
+        self.assertEqual(["p5"], list(plan.schemas))
+        self.assertEqual(frozenset(["p4"]), plan.files)
+        self.assertEqual({"p1": "a"}, plan.defaults)
+        self.assertFalse(plan.is_simple)
+        self.assertTrue(c.endpoints["ep2"].validation_plan.is_simple)
+
+        with self.assertRaises(TypeError):
+            plan.defaults["p2"] = "b"
+
+    def test_validation_plan_is_compiled_once(self):
+        c = self.UrlApiConfig({"ep1": ResourceConfig(path=["x"], method="GET")})
+
+        endpoint = c.endpoints["ep1"]
+        self.assertIs(endpoint.validation_plan, endpoint.validation_plan)
+
+        # a change of the configuration is picked up after its validation
+        endpoint.parameters["p1"] = QueryParameter("p1")
+        endpoint.validate()
+        self.assertIn("p1", endpoint.validation_plan.all_parameters)
+
 
 class TestAuthentication(unittest.TestCase):
     def setUp(self):
@@ -482,6 +575,30 @@ class TestMainConfiguration(unittest.TestCase):
 
         Config(_create_endpoints())
 
+    def test_bad_connection_pool(self):
+        for attribute, value in [
+            ("pool_connections", 0),
+            ("pool_maxsize", "10"),
+            ("pool_block", 1),
+            ("keep_alive", None),
+        ]:
+            with self.assertRaises(RestClientConfigurationError):
+
+                class Config(self.UrlApiConfig):
+                    url = "http://localhost"
+
+                setattr(Config, attribute, value)
+                Config(_create_endpoints())
+
+    def test_bad_json_backend(self):
+        with self.assertRaises(RestClientConfigurationError):
+
+            class Config(self.UrlApiConfig):
+                url = "http://localhost"
+                json_backend = "yaml"
+
+            Config(_create_endpoints())
+
     def test_bad_server(self):
         with self.assertRaises(RestClientConfigurationError):
 
@@ -0,0 +1,137 @@
+import base64
+import itertools
+import json
+import os
+import tempfile
+
+import ddt
+
+from qrest.auth import NetrcOrUserPassAuthConfig
+from qrest.exception import RestAccessDeniedError, RestClientConfigurationError
+
+from . import local_server
+
+
+class LoginHandler(local_server.LocalHandler):
+    """Handler of a service that sets a session cookie after a basic authentication login."""
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/login":
+            self._send(200, b"<html>login</html>", {"Content-Type": "text/html"})
+            return
+        cookie = self.headers.get("Cookie", "")
+        authorization = self.headers.get("Authorization", "")
+        json_headers = {"Content-Type": "application/json"}
+        if authorization == "Basic " + base64.b64encode(b"user:pw").decode():
+            server.requests.append("login")
+            session_cookie = f"session={next(server.counter)}"
+            server.valid_cookies.add(session_cookie)
+            json_headers["Set-Cookie"] = session_cookie + "; Path=/"
+            self._send(200, b'{"id": 1}', json_headers)
+        elif cookie in server.valid_cookies:
+            server.requests.append("cookie")
+            self._send(200, b'{"id": 1}', json_headers)
+        elif server.redirect_to_login:
+            server.requests.append("redirect")
+            self._send(302, headers={"Location": "/login"})
+        else:
+            server.requests.append("denied")
+            self._send(401)
+
+
+class LoginServer(local_server.LocalServer):
+    handler_class = LoginHandler
+
+    def __init__(self):
+        super().__init__()
+        self.counter = itertools.count(1)
+        self.requests = []
+        self.valid_cookies = set()
+        self.redirect_to_login = False
+
+
+@ddt.ddt
+class SessionCookieTests(local_server.LocalServerTestCase):
+    server_class = LoginServer
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cookie_file = os.path.join(directory.name, "cookies.json")
+
+    def create_api(self, **kwargs):
+        api = self.create_local_api(authentication=NetrcOrUserPassAuthConfig(**kwargs))
+        api.auth.set_credentials(username="user", password="pw")
+        return api
+
+    @ddt.data(
+        ({}, ["login", "login", "login"]),
+        ({"session_cookies": True}, ["login", "cookie", "cookie"]),
+    )
+    @ddt.unpack
+    def test_session_cookie_replaces_login(self, kwargs, expected_requests):
+        api = self.create_api(**kwargs)
+
+        for _ in range(3):
+            self.assertEqual({"id": 1}, api.post(id=1))
+
+        self.assertEqual(expected_requests, self.server.requests)
+
+    @ddt.data(
+        (False, {}, ["denied", "login", "cookie"]),
+        (True, {"login_url": "http://127.0.0.1"}, ["redirect", "login", "cookie"]),
+    )
+    @ddt.unpack
+    def test_expired_session_logs_in_again(self, redirect_to_login, kwargs, expected_requests):
+        self.server.redirect_to_login = redirect_to_login
+        api = self.create_api(session_cookies=True, **kwargs)
+        api.post(id=1)
+
+        self.server.valid_cookies.clear()
+        self.server.requests.clear()
+        self.assertEqual({"id": 1}, api.post(id=1))
+        self.assertEqual({"id": 1}, api.post(id=1))
+
+        self.assertEqual(expected_requests, self.server.requests)
+
+    def test_rejected_login_is_not_retried(self):
+        api = self.create_api(session_cookies=True)
+        api.post(id=1)
+
+        self.server.valid_cookies.clear()
+        api.auth.password = "wrong"
+        self.server.requests.clear()
+        with self.assertRaises(RestAccessDeniedError):
+            api.post(id=1)
+
+        self.assertEqual(["denied", "denied"], self.server.requests)
+
+    def test_cookie_file_shares_session_between_processes(self):
+        api = self.create_api(session_cookies=True, cookie_file=self.cookie_file)
+        api.post(id=1)
+        self.assertEqual(0o600, os.stat(self.cookie_file).st_mode & 0o777)
+
+        # a new API stands in for a later process
+        other_api = self.create_api(session_cookies=True, cookie_file=self.cookie_file)
+        other_api.post(id=1)
+        other_api.post(id=1)
+
+        self.assertEqual(["login", "cookie", "cookie"], self.server.requests)
+
+    def test_invalid_cookie_file_is_ignored(self):
+        with open(self.cookie_file, "w", encoding="utf-8") as cookie_file:
+            cookie_file.write("{not json")
+
+        api = self.create_api(session_cookies=True, cookie_file=self.cookie_file)
+        api.post(id=1)
+
+        self.assertEqual(["login"], self.server.requests)
+        with open(self.cookie_file, encoding="utf-8") as cookie_file:
+            content = json.load(cookie_file)
+        self.assertEqual([f"127.0.0.1:{self.server.server_port}"], content["hosts"])
+
+    def test_cookie_file_requires_session_cookies(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "require the reuse"):
+            NetrcOrUserPassAuthConfig(cookie_file=self.cookie_file)
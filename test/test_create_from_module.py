@@ -1,4 +1,5 @@
 import inspect
+import types
 import unittest
 import unittest.mock as mock
 
@@ -29,6 +30,43 @@ class CreateAPIFromModuleTests(unittest.TestCase):
         api = qrest.API(inspect.getmodule(self))
         self.assertIsInstance(api.all_posts, JSONResource)
 
+    def test_lazy_api_creates_resources_on_first_access(self):
+        with mock.patch.object(AllPosts, "create", wraps=AllPosts.create) as create:
+            api = qrest.API(inspect.getmodule(self), lazy=True)
+
+            self.assertEqual(["all_posts"], api.resources)
+            self.assertNotIn("all_posts", vars(api))
+            create.assert_not_called()
+
+            resource = api.all_posts
+            self.assertIs(resource, api.all_posts)
+            create.assert_called_once()
+
+        self.assertIsInstance(resource, JSONResource)
+        self.assertEqual(
+            "application/json; charset=UTF-8", resource.config.headers["Content-type"]
+        )
+
+    def test_lazy_api_raises_attribute_error_for_unknown_resource(self):
+        api = qrest.API(inspect.getmodule(self), lazy=True)
+        with self.assertRaises(AttributeError):
+            _ = api.unknown
+
+    def test_lazy_api_raises_attribute_error_for_invalid_resource(self):
+        module = types.ModuleType("invalid_module")
+        module.APIConfig, module.ResourceConfig = APIConfig, ResourceConfig
+        exec(
+            "class Config(APIConfig):\n    url = 'https://jsonplaceholder.typicode.com'\n"
+            "class Post(ResourceConfig):\n    name, path, method = 'post', ['posts'], 'FETCH'\n",
+            vars(module),
+        )
+        api = qrest.API(module, lazy=True)
+
+        self.assertFalse(hasattr(api, "post"))
+        with self.assertRaises(AttributeError) as context:
+            _ = api.post
+        self.assertIsInstance(context.exception.__cause__, RestClientConfigurationError)
+
     def test_raise_proper_exception_when_multiple_APIConfig_classes_are_present(self):
         registry = mock.Mock()
         registry.retrieve.return_value = [mock.Mock(), mock.Mock()]
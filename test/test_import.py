@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+# modules that are only imported when they are used for the first time
+DEFERRED_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "jsonschema",
+    "fastjsonschema",
+    "numpy",
+    "orjson",
+    "ujson",
+    "qrest.auth",
+    "qrest.compile",
+    "qrest.response",
+    "qrest.columnar",
+    "qrest.json_stream",
+]
+
+# budget in microseconds for the import of the qrest modules themselves, so excluding the
+# libraries they import; generous to allow for slow machines
+QREST_IMPORT_BUDGET = 100000
+
+
+def _import_qrest():
+    """Import qrest in a new interpreter and return the import time of each module and the
+    modules that have been imported."""
+    code = "import sys, qrest; print('\\n'.join(sorted(sys.modules)))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    self_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line.split(":", 1)[1].split("|")
+        self_times[name.strip()] = int(self_time)
+    return self_times, set(process.stdout.split())
+
+
+class ImportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.self_times, cls.modules = _import_qrest()
+
+    def test_deferred_modules_are_not_imported(self):
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, self.modules)
+
+    def test_import_time_of_qrest_modules_is_within_budget(self):
+        total = sum(t for name, t in self.self_times.items() if name.split(".")[0] == "qrest")
+        self.assertLess(total, QREST_IMPORT_BUDGET)
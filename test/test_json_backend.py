@@ -0,0 +1,67 @@
+import importlib
+import json
+import math
+import unittest
+import unittest.mock as mock
+
+import requests
+
+from qrest.exception import RestClientConfigurationError
+from qrest.json_backend import JSON_BACKENDS, get_json_backend
+
+
+class GetJSONBackendTests(unittest.TestCase):
+    def test_select_standard_library_on_request(self):
+        backend = get_json_backend("json")
+
+        self.assertEqual("json", backend.name)
+        self.assertEqual({"a": [1, 2]}, backend.loads(b'{"a": [1, 2]}'))
+        self.assertEqual(b'{"a": [1, 2]}', backend.dumps({"a": [1, 2]}))
+
+    def test_select_standard_library_by_default(self):
+        backend = get_json_backend()
+
+        self.assertEqual("json", backend.name)
+        self.assertEqual({"a": "é"}, backend.loads(backend.dumps({"a": "é"})))
+
+    def test_default_decodes_as_requests_does(self):
+        response = requests.Response()
+        response._content = b'{"big": 123456789012345678901234567890, "nan": NaN}'
+
+        data = get_json_backend().loads_response(response)
+
+        self.assertEqual(123456789012345678901234567890, data["big"])
+        self.assertTrue(math.isnan(data["nan"]))
+
+    def test_default_encodes_as_requests_does(self):
+        backend = get_json_backend()
+
+        self.assertEqual(b'{"1": 2}', backend.dumps({1: 2}))
+        with self.assertRaises(ValueError):
+            backend.dumps({"a": float("nan")})
+
+    def test_fall_back_when_library_is_not_installed(self):
+        real_import_module = importlib.import_module
+
+        def import_module(name):
+            if name == "ujson":
+                raise ImportError(name)
+            return real_import_module(name)
+
+        with mock.patch("qrest.json_backend._backends", {}):
+            with mock.patch("importlib.import_module", side_effect=import_module):
+                backend = get_json_backend("ujson")
+
+        self.assertNotEqual("ujson", backend.name)
+        self.assertIn(backend.name, JSON_BACKENDS)
+
+    def test_raise_on_unsupported_library(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "json backend 'yaml' .*"):
+            get_json_backend("yaml")
+
+    def test_decode_response(self):
+        response = requests.Response()
+        response._content = json.dumps({"a": 1}).encode("utf-8")
+
+        for name in JSON_BACKENDS:
+            self.assertEqual({"a": 1}, get_json_backend(name).loads_response(response))
@@ -0,0 +1,94 @@
+import json
+import re
+import unittest
+
+import ddt
+
+from qrest.exception import RestResourceMissingContentError
+from qrest.json_stream import extract_json_section, iter_json_section
+
+_DOCUMENT = {
+    "meta": {"blob": 'a "quoted" \\ blob with } and ]' * 100, "numbers": [1, -2.5e3, {"a": "}"}]},
+    "data": {"items": [{"id": i, "title": 'é\n"ü"'} for i in range(20)], "count": 12345},
+    "empty": {"items": []},
+    "tail": None,
+}
+
+
+def _split(text, size):
+    """Return the given text in chunks of the given size."""
+    return re.findall(".{1,%d}" % size, text, re.DOTALL)
+
+
+@ddt.ddt
+class ExtractJSONSectionTests(unittest.TestCase):
+    def setUp(self):
+        self.text = json.dumps(_DOCUMENT, indent=1)
+
+    @ddt.data(1, 3, 17, 4096)
+    def test_extract_section(self, size):
+        chunks = _split(self.text, size)
+
+        self.assertEqual(
+            _DOCUMENT["data"]["items"], extract_json_section(chunks, ["data", "items"])
+        )
+        self.assertEqual(12345, extract_json_section(chunks, ["data", "count"]))
+        self.assertIsNone(extract_json_section(chunks, ["tail"]))
+
+    @ddt.data(1, 3, 17, 4096)
+    def test_extract_complete_document_without_path(self, size):
+        self.assertEqual(_DOCUMENT, extract_json_section(_split(self.text, size), []))
+
+    def test_extract_complete_document_that_is_not_an_object(self):
+        chunks = _split(json.dumps([1, 2, 3]), 2)
+
+        self.assertEqual([1, 2, 3], extract_json_section(chunks, ["data"]))
+
+    def test_split_document_at_every_offset(self):
+        document = {
+            "meta": {"scale": 1.25, "exponents": [3e-2, -4.5e10, 1e5], "flag": True},
+            "data": {"items": [12.5, -0.001, 7, 2.5e-3, None, False, "1.5"], "count": 10},
+        }
+        text = json.dumps(document, separators=(",", ":"))
+
+        for offset in range(1, len(text)):
+            with self.subTest(offset=offset):
+                chunks = [text[:offset], text[offset:]]
+                self.assertEqual(
+                    document["data"]["items"], extract_json_section(chunks, ["data", "items"])
+                )
+                self.assertEqual(
+                    document["data"]["items"], list(iter_json_section(chunks, ["data", "items"]))
+                )
+                self.assertEqual(document["meta"], extract_json_section(chunks, ["meta"]))
+
+    def test_raise_on_missing_element(self):
+        with self.assertRaisesRegex(RestResourceMissingContentError, "Element items .*"):
+            extract_json_section(_split(self.text, 5), ["meta", "items"])
+
+    def test_raise_on_invalid_document(self):
+        with self.assertRaises(json.JSONDecodeError):
+            extract_json_section(['{"data": [1, 2'], ["data"])
+
+
+@ddt.ddt
+class IterJSONSectionTests(unittest.TestCase):
+    def setUp(self):
+        self.text = json.dumps(_DOCUMENT)
+
+    @ddt.data(1, 3, 17, 4096)
+    def test_iterate_array_elements(self, size):
+        items = iter_json_section(_split(self.text, size), ["data", "items"])
+
+        self.assertEqual(_DOCUMENT["data"]["items"][0], next(items))
+        self.assertEqual(_DOCUMENT["data"]["items"][1:], list(items))
+
+    def test_iterate_empty_array(self):
+        self.assertEqual([], list(iter_json_section(_split(self.text, 7), ["empty", "items"])))
+
+    def test_iterate_document_that_is_an_array(self):
+        self.assertEqual([1, 22, 333], list(iter_json_section(["[1, 2", "2, 33", "3]"], [])))
+
+    def test_raise_on_section_that_is_not_an_array(self):
+        with self.assertRaises(RestResourceMissingContentError):
+            list(iter_json_section(_split(self.text, 7), ["data", "count"]))
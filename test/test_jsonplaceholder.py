@@ -1,11 +1,22 @@
+import asyncio
+import json
+import threading
 import unittest
 import unittest.mock as mock
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
 import qrest
+from qrest.json_backend import get_json_backend
+from qrest.query import Query
 from qrest.response import Response
-from qrest.exception import RestClientValidationError, RestTimeoutError
+from qrest.exception import (
+    InvalidResourceError,
+    RestClientQueryError,
+    RestClientValidationError,
+    RestTimeoutError,
+)
 
 from . import jsonplaceholderconfig
 
@@ -51,7 +62,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.all_posts.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             posts = api.all_posts()
 
             mock_request.assert_called_with(
@@ -72,7 +85,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.all_posts.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             posts = api.all_posts()
 
             mock_request.assert_called_with(
@@ -90,7 +105,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.single_post.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             post = api.single_post(item=1)
 
             mock_request.assert_called_with(
@@ -111,7 +128,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.filter_posts.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             posts = api.filter_posts(user_id=1)
 
             mock_request.assert_called_with(
@@ -130,15 +149,18 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.filter_posts.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response):
+        with mock.patch("requests.Session.request", return_value=self.mock_response):
             response = api.filter_posts.get_response(user_id=1)
-            self.assertIs(api.filter_posts.response, response)
+            self.assertIsInstance(response, ContentResponse)
+            self.assertIsNot(api.filter_posts.response, response)
 
     def test_comments_queries_the_right_endpoint(self):
         api = qrest.API(jsonplaceholderconfig)
         api.comments.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             comments = api.comments(post_id=1)
 
             mock_request.assert_called_with(
@@ -164,7 +186,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         content = "this is the new data posted using qREST"
         user_id = 200
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             response = api.create_post.get_response(title=title, content=content, user_id=user_id)
 
             mock_request.assert_called_with(
@@ -172,18 +196,23 @@ class TestJsonPlaceHolder(unittest.TestCase):
                 auth=None,
                 verify=False,
                 url="https://jsonplaceholder.typicode.com/posts",
-                json={"title": title, "body": content, "userId": user_id},
+                data=mock.ANY,
                 timeout=(None, None),
                 headers={"Content-type": "application/json; charset=UTF-8"},
             )
-            self.assertIs(api.create_post.response, response)
+            body = json.loads(mock_request.call_args[1]["data"])
+            self.assertEqual({"title": title, "body": content, "userId": user_id}, body)
+            self.assertIsInstance(response, ContentResponse)
+            self.assertIsNot(api.create_post.response, response)
 
     def test_upload_file_accesses_the_right_endpoint_when_called(self):
         api = qrest.API(jsonplaceholderconfig)
         api.upload_file.response = ContentResponse()
 
         with open(qrest.__file__, "rb") as file:
-            with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+            with mock.patch(
+                "requests.Session.request", return_value=self.mock_response
+            ) as mock_request:
                 response = api.upload_file.get_response(file=("__init__.py", file))
 
                 mock_request.assert_called_with(
@@ -195,7 +224,8 @@ class TestJsonPlaceHolder(unittest.TestCase):
                     headers={"Content-type": "application/json; charset=UTF-8"},
                     files=[("file", ("__init__.py", file))],
                 )
-                self.assertIs(api.upload_file.response, response)
+                self.assertIsInstance(response, ContentResponse)
+                self.assertIsNot(api.upload_file.response, response)
 
     def test_create_post_with_schema(self):
         api = qrest.API(jsonplaceholderconfig)
@@ -203,7 +233,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
 
         post = {"user": "Alice", "body": "Something about bob"}
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             response = api.create_post_with_schema.get_response(post=post)
 
             mock_request.assert_called_with(
@@ -211,11 +243,13 @@ class TestJsonPlaceHolder(unittest.TestCase):
                 auth=None,
                 verify=False,
                 url="https://jsonplaceholder.typicode.com/posts",
-                json=post,
+                data=mock.ANY,
                 timeout=(None, None),
                 headers={"Content-type": "application/json; charset=UTF-8"},
             )
-            self.assertIs(api.create_post_with_schema.response, response)
+            self.assertEqual(post, json.loads(mock_request.call_args[1]["data"]))
+            self.assertIsInstance(response, ContentResponse)
+            self.assertIsNot(api.create_post_with_schema.response, response)
 
     def test_bad_create_post_with_schema(self):
         api = qrest.API(jsonplaceholderconfig)
@@ -232,7 +266,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
     def test_timeout_exception(self):
         api = qrest.API(jsonplaceholderconfig)
 
-        with mock.patch("requests.request", side_effect=requests.exceptions.Timeout("foo")):
+        with mock.patch(
+            "requests.Session.request", side_effect=requests.exceptions.Timeout("foo")
+        ):
             with self.assertRaises(RestTimeoutError):
                 api.all_posts()
 
@@ -240,7 +276,9 @@ class TestJsonPlaceHolder(unittest.TestCase):
         api = qrest.API(jsonplaceholderconfig)
         api.all_posts_with_valid_timeout_values.response = ContentResponse()
 
-        with mock.patch("requests.request", return_value=self.mock_response) as mock_request:
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
             posts = api.all_posts_with_valid_timeout_values()
 
             mock_request.assert_called_with(
@@ -253,3 +291,242 @@ class TestJsonPlaceHolder(unittest.TestCase):
             )
 
             self.assertEqual(self.mock_response.content, posts)
+
+    def test_resources_share_the_session_of_the_api(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        self.assertIsInstance(api.session, requests.Session)
+        self.assertIs(api.session, api.all_posts.session)
+        self.assertIs(api.session, api.single_post.session)
+
+    def test_session_pools_connections_as_configured(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        adapter = api.session.get_adapter("https://jsonplaceholder.typicode.com/posts")
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter._pool_connections, 10)
+        self.assertNotEqual("close", api.session.headers.get("Connection"))
+
+    def test_session_closes_connections_without_keep_alive(self):
+        with mock.patch.object(jsonplaceholderconfig.JsonPlaceHolderConfig, "keep_alive", False):
+            api = qrest.API(jsonplaceholderconfig)
+
+        self.assertEqual("close", api.session.headers["Connection"])
+
+    def test_single_post_queries_the_right_endpoint_asynchronously(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
+            post = asyncio.run(api.single_post.acall(item=1))
+
+            mock_request.assert_called_with(
+                method="GET",
+                auth=None,
+                verify=False,
+                url="https://jsonplaceholder.typicode.com/posts/1",
+                timeout=(None, None),
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "X-test-post": "qREST python ORM",
+                },
+            )
+
+            self.assertEqual(self.mock_response.content, post)
+
+    def test_concurrent_asynchronous_queries_use_their_own_parameters(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+
+        async def query_all():
+            return await asyncio.gather(*(api.single_post.acall(item=i) for i in range(5)))
+
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
+            posts = asyncio.run(query_all())
+
+            urls = sorted(call[1]["url"] for call in mock_request.call_args_list)
+            expected_urls = [f"https://jsonplaceholder.typicode.com/posts/{i}" for i in range(5)]
+            self.assertEqual(expected_urls, urls)
+            self.assertEqual([self.mock_response.content] * 5, posts)
+
+    def test_asynchronous_queries_run_in_executor_of_api(self):
+        api = qrest.API(jsonplaceholderconfig)
+        self.addCleanup(api.close)
+        api.single_post.response = ContentResponse()
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return self.mock_response
+
+        with mock.patch("requests.Session.request", side_effect=record_thread):
+            asyncio.run(api.single_post.acall(item=1))
+            api.single_post.response.stream = True
+            with mock.patch.object(ContentResponse, "_check_content", side_effect=record_thread):
+                asyncio.run(api.single_post.acall(item=1))
+
+        self.assertEqual(10, api._executor._max_workers)
+        # the request and, for a streamed response, the processing
+        self.assertEqual(3, len(threads))
+        self.assertTrue(all(name.startswith("qrest") for name in threads), threads)
+
+    def test_timeout_exception_asynchronously(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        with mock.patch(
+            "requests.Session.request", side_effect=requests.exceptions.Timeout("foo")
+        ):
+            with self.assertRaises(RestTimeoutError):
+                asyncio.run(api.all_posts.acall())
+
+    def test_map_returns_the_results_in_order_of_the_queries(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+
+        def create_response(**kwargs):
+            response = mock.Mock(spec=requests.Response)
+            response.status_code = 200
+            response.content = kwargs["url"].encode()
+            response.headers = {}
+            return response
+
+        with mock.patch("requests.Session.request", side_effect=create_response):
+            posts = api.single_post.map([{"item": i} for i in range(10)], concurrency=3)
+
+        expected = [f"https://jsonplaceholder.typicode.com/posts/{i}".encode() for i in range(10)]
+        self.assertEqual(expected, posts)
+
+    def test_map_collects_the_errors_of_failed_queries(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+
+        with mock.patch(
+            "requests.Session.request",
+            side_effect=[self.mock_response, requests.exceptions.Timeout("foo")],
+        ):
+            posts = api.single_post.map([{"item": 1}, {}, {"item": 2}], concurrency=1)
+
+        self.assertEqual(self.mock_response.content, posts[0])
+        self.assertIsInstance(posts[1], RestClientQueryError)
+        self.assertIsInstance(posts[2], RestTimeoutError)
+
+    def test_gather_queries_different_resources(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+        api.comments.response = ContentResponse()
+
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
+            results = api.gather([("single_post", {"item": 1}), (api.comments, {"post_id": 1})])
+
+            urls = sorted(call[1]["url"] for call in mock_request.call_args_list)
+            expected_urls = [
+                "https://jsonplaceholder.typicode.com/posts/1",
+                "https://jsonplaceholder.typicode.com/posts/1/comments",
+            ]
+            self.assertEqual(expected_urls, urls)
+            self.assertEqual([self.mock_response.content] * 2, results)
+
+    def test_gather_raises_on_unknown_resource(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        with self.assertRaises(InvalidResourceError):
+            api.gather([("unknown", {})])
+
+    def test_check_returns_the_validated_parameters_as_read_only_query(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        query = api.create_post.check(title="title", content="content")
+
+        self.assertIsInstance(query, Query)
+        self.assertEqual({"title": "title", "content": "content", "user_id": 101}, dict(query))
+        with self.assertRaises(TypeError):
+            query["title"] = "another title"
+
+    def test_resource_can_be_queried_from_multiple_threads(self):
+        api = qrest.API(jsonplaceholderconfig)
+
+        def prepare_url(item):
+            query = api.single_post.check(item=item)
+            return api.single_post._prepare_request(query)["url"]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            urls = list(executor.map(prepare_url, range(50)))
+
+        expected_urls = [f"https://jsonplaceholder.typicode.com/posts/{i}" for i in range(50)]
+        self.assertEqual(expected_urls, urls)
+
+    def test_each_call_returns_its_own_response(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.single_post.response = ContentResponse()
+
+        other_response = mock.Mock(spec=requests.Response)
+        other_response.status_code = 200
+        other_response.content = b"Goodbye World!"
+        other_response.headers = {}
+
+        with mock.patch(
+            "requests.Session.request", side_effect=[self.mock_response, other_response]
+        ):
+            first = api.single_post.get_response(item=1)
+            second = api.single_post.get_response(item=2)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(b"Hello World!", first.fetch())
+        self.assertEqual(b"Goodbye World!", second.fetch())
+
+    def test_body_is_encoded_by_the_configured_json_backend(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.create_post.response = ContentResponse()
+        api.create_post.json_backend = get_json_backend("json")
+
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
+            api.create_post(title="title", content="content")
+
+            data = mock_request.call_args[1]["data"]
+            self.assertEqual(b'{"title": "title", "body": "content", "userId": 101}', data)
+
+    def test_body_without_content_type_header_is_sent_as_json(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.create_post.response = ContentResponse()
+        api.create_post.config.headers = {}
+
+        with mock.patch(
+            "requests.Session.request", return_value=self.mock_response
+        ) as mock_request:
+            api.create_post(title="title", content="content")
+
+            headers = mock_request.call_args[1]["headers"]
+            self.assertEqual({"Content-Type": "application/json"}, headers)
+            self.assertEqual({}, api.create_post.config.headers)
+
+    def test_json_backend_of_resource_overrides_that_of_api(self):
+        resource = qrest.JSONResource(json_backend="json")
+        resource.configure(
+            name="all_posts",
+            server_url="https://jsonplaceholder.typicode.com",
+            config=qrest.ResourceConfig(path=["posts"], method="GET"),
+            json_backend="orjson",
+        )
+
+        self.assertEqual("json", resource.json_backend.name)
+        self.assertEqual("json", resource.response.json_backend.name)
+
+    def test_streaming_resource_streams_the_request(self):
+        api = qrest.API(jsonplaceholderconfig)
+        api.all_posts.response.stream = True
+
+        with mock.patch(
+            "requests.Session.request", side_effect=requests.exceptions.Timeout("foo")
+        ) as mock_request:
+            with self.assertRaises(RestTimeoutError):
+                api.all_posts()
+
+            self.assertTrue(mock_request.call_args[1]["stream"])
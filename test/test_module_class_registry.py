@@ -1,5 +1,7 @@
 import inspect
+import types
 import unittest
+import unittest.mock as mock
 
 from qrest import APIConfig, ResourceConfig
 from qrest.module_class_registry import ModuleClassRegistry
@@ -47,3 +49,41 @@ class ModuleClassRegistryTests(unittest.TestCase):
                 issubclass(config_class, ResourceConfig),
                 f"Class {config_class} should be a subclass of ResourceConfig",
             )
+
+    def test_classes_are_collected_once(self):
+        classes = ModuleClassRegistry(self.current_module).classes()
+
+        with mock.patch("qrest.module_class_registry._collect_classes") as collect_classes:
+            self.assertEqual(classes, ModuleClassRegistry(self.current_module).classes())
+            self.assertEqual(
+                [MyAPIConfig], ModuleClassRegistry(self.current_module).retrieve(APIConfig)
+            )
+        collect_classes.assert_not_called()
+
+    def test_classes_are_collected_again_when_module_changes(self):
+        module = types.ModuleType("changing_module")
+        exec("from qrest import APIConfig\nclass First(APIConfig): pass", module.__dict__)
+        first = ModuleClassRegistry(module).retrieve(APIConfig)
+
+        exec("class First(APIConfig): pass\nclass Second(APIConfig): pass", module.__dict__)
+        second = ModuleClassRegistry(module).retrieve(APIConfig)
+
+        self.assertEqual(["First"], [c.__name__ for c in first])
+        self.assertEqual(["First", "Second"], [c.__name__ for c in second])
+        self.assertIsNot(first[0], second[0])
+
+    def test_classes_are_collected_again_when_name_is_bound_to_class(self):
+        module = types.ModuleType("changing_module")
+        module.APIConfig = APIConfig
+        exec("class First(APIConfig): pass\nSecond = 1", module.__dict__)
+        first = ModuleClassRegistry(module).retrieve(APIConfig)
+
+        # the namespace keeps its size
+        exec("class Second(APIConfig): pass", module.__dict__)
+        second = ModuleClassRegistry(module).retrieve(APIConfig)
+        exec("del First\nclass Third(APIConfig): pass", module.__dict__)
+        third = ModuleClassRegistry(module).retrieve(APIConfig)
+
+        self.assertEqual(["First"], [c.__name__ for c in first])
+        self.assertEqual(["First", "Second"], [c.__name__ for c in second])
+        self.assertEqual(["Second", "Third"], [c.__name__ for c in third])
@@ -0,0 +1,223 @@
+import base64
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest.mock as mock
+from urllib.parse import parse_qs
+
+import ddt
+
+from qrest import ResourceConfig
+from qrest.auth.oauth2 import OAuth2ClientCredentialsAuthConfig, OAuth2TokenError
+from qrest.exception import RestClientConfigurationError
+
+from . import local_server
+
+
+class OAuth2Handler(local_server.LocalHandler):
+    """Handler of a token endpoint and a service that accepts its bearer tokens."""
+
+    def do_POST(self):
+        server = self.server
+        form = parse_qs(self._read_body().decode())
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Basic "):
+            client_id, client_secret = (
+                base64.b64decode(authorization.partition(" ")[2]).decode().split(":", 1)
+            )
+        else:
+            client_id = form.get("client_id", [None])[0]
+            client_secret = form.get("client_secret", [None])[0]
+        if self.path != "/oauth2/token" or form.get("grant_type") != ["client_credentials"]:
+            self._send(404)
+            return
+        server.token_requests.append((client_id, form.get("scope", [None])[0]))
+        time.sleep(server.token_delay)
+        if (client_id, client_secret) != ("client", "secret"):
+            self._send(401, b'{"error": "invalid_client"}', {"Content-Type": "application/json"})
+            return
+        token = f"token-{next(server.counter)}"
+        server.valid_tokens.add(token)
+        body = json.dumps(
+            {"access_token": token, "token_type": "Bearer", "expires_in": server.expires_in}
+        ).encode()
+        self._send(200, body, {"Content-Type": "application/json"})
+
+    def do_GET(self):
+        server = self.server
+        token = self.headers.get("Authorization", "").partition(" ")[2]
+        server.used_tokens.append(token)
+        if token in server.valid_tokens:
+            self._send(200, b'{"id": 1}', {"Content-Type": "application/json"})
+        else:
+            self._send(401)
+
+
+class OAuth2Server(local_server.LocalServer):
+    handler_class = OAuth2Handler
+
+    def __init__(self):
+        super().__init__()
+        self.counter = itertools.count(1)
+        self.token_requests = []
+        self.used_tokens = []
+        self.valid_tokens = set()
+        self.expires_in = 3600
+        self.token_delay = 0
+
+
+class Comment(ResourceConfig):
+    name = "comment"
+    path = ["comments", "{id}"]
+    method = "GET"
+
+
+@ddt.ddt
+class OAuth2AuthTests(local_server.LocalServerTestCase):
+    server_class = OAuth2Server
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def create_api(self, client_secret="secret", **kwargs):
+        authentication = OAuth2ClientCredentialsAuthConfig(
+            token_url=f"{self.server_url}/oauth2/token", **kwargs
+        )
+        api = self.create_local_api([local_server.Post, Comment], authentication=authentication)
+        api.auth.set_credentials(client_id="client", client_secret=client_secret)
+        return api
+
+    @ddt.data(False, True)
+    def test_token_is_shared_by_resources(self, credentials_in_body):
+        api = self.create_api(scope="read", credentials_in_body=credentials_in_body)
+
+        for _ in range(3):
+            self.assertEqual({"id": 1}, api.post(id=1))
+            self.assertEqual({"id": 1}, api.comment(id=1))
+
+        self.assertEqual([("client", "read")], self.server.token_requests)
+        self.assertEqual(["token-1"] * 6, self.server.used_tokens)
+
+    def test_token_is_renewed_when_it_expires(self):
+        self.server.expires_in = 60
+        now = time.time()
+        with mock.patch("qrest.auth.oauth2.time.time", return_value=now) as clock:
+            api = self.create_api(expiry_margin=10)
+
+            api.post(id=1)
+            clock.return_value = now + 45
+            api.post(id=1)
+            clock.return_value = now + 55
+            api.post(id=1)
+
+        self.assertEqual(2, len(self.server.token_requests))
+        self.assertEqual(["token-1", "token-1", "token-2"], self.server.used_tokens)
+
+    def test_refresh_of_expired_token_requests_one_token(self):
+        self.server.expires_in = 60
+        now = time.time()
+        with mock.patch("qrest.auth.oauth2.time.time", return_value=now) as clock:
+            api = self.create_api(expiry_margin=10)
+
+            clock.return_value = now + 55
+            api.auth.refresh_credentials()
+            api.post(id=1)
+
+        self.assertEqual(2, len(self.server.token_requests))
+        self.assertEqual(["token-2"], self.server.used_tokens)
+
+    def test_margin_is_at_most_half_the_lifetime(self):
+        self.server.expires_in = 2
+        api = self.create_api(expiry_margin=30)
+
+        for _ in range(3):
+            api.post(id=1)
+
+        self.assertEqual(1, len(self.server.token_requests))
+        self.assertEqual(["token-1"] * 3, self.server.used_tokens)
+
+    def test_lifetime_of_token_from_cache_file_is_known(self):
+        cache_file = os.path.join(self.directory, "token.json")
+        api = self.create_api(cache_file=cache_file)
+        other_api = self.create_api(cache_file=cache_file)
+
+        self.assertEqual(1, len(self.server.token_requests))
+        self.assertEqual(3600, api.auth.credentials_lifetime())
+        self.assertEqual(3600, other_api.auth.credentials_lifetime())
+
+    def test_cache_file_shares_token_between_apis(self):
+        cache_file = os.path.join(self.directory, "token.json")
+        api = self.create_api(cache_file=cache_file)
+        other_api = self.create_api(cache_file=cache_file)
+
+        api.post(id=1)
+        other_api.post(id=1)
+
+        self.assertEqual(1, len(self.server.token_requests))
+        self.assertEqual(["token-1", "token-1"], self.server.used_tokens)
+        self.assertEqual(0o600, os.stat(cache_file).st_mode & 0o777)
+
+    def test_single_process_renews_shared_cache_file(self):
+        cache_file = os.path.join(self.directory, "token.json")
+        self.server.token_delay = 0.2
+
+        # each API has its own token cache, so they only share the lock on the cache file
+        barrier = threading.Barrier(8)
+        apis = []
+
+        def start_worker():
+            barrier.wait()
+            apis.append(self.create_api(cache_file=cache_file))
+
+        workers = [threading.Thread(target=start_worker) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(8, len(apis))
+        self.assertEqual(1, len(self.server.token_requests))
+
+    @ddt.data(
+        "{not json",
+        '{"key": "other client", "access_token": "token-0", "expires_at": null}',
+        '{"key": "%(key)s", "access_token": "token-0", "expires_at": 0}',
+    )
+    def test_unusable_cache_file_is_replaced(self, content):
+        cache_file = os.path.join(self.directory, "token.json")
+        api = self.create_api(cache_file=cache_file)
+        with open(cache_file, "w", encoding="utf-8") as token_file:
+            token_file.write(content % {"key": api.auth.token_cache.key})
+
+        self.create_api(cache_file=cache_file).post(id=1)
+
+        self.assertEqual(2, len(self.server.token_requests))
+        with open(cache_file, encoding="utf-8") as token_file:
+            self.assertEqual("token-2", json.load(token_file)["access_token"])
+
+    def test_rejected_credentials_raise_error(self):
+        with self.assertRaisesRegex(OAuth2TokenError, "HTTP status code: '401'"):
+            self.create_api(client_secret="wrong")
+
+    def test_refresher_renews_token_in_background(self):
+        self.server.expires_in = 0.1
+        api = self.create_api(expiry_margin=0)
+
+        api.auth.start_refresher()
+        deadline = time.monotonic() + 5
+        while len(self.server.token_requests) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(len(self.server.token_requests), 3)
+        self.assertEqual({"id": 1}, api.post(id=1))
+
+    def test_invalid_configuration(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "expiry_margin"):
+            OAuth2ClientCredentialsAuthConfig(
+                token_url=f"{self.server_url}/oauth2/token", expiry_margin=-1
+            )
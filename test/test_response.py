@@ -1,3 +1,8 @@
+import copy
+import io
+import json as _json
+import tracemalloc
+import types
 import unittest
 import unittest.mock as mock
 
@@ -43,6 +48,7 @@ class JSONResponseTests(unittest.TestCase):
         mock_response = mock.Mock(spec=requests.Response)
         mock_response.headers = {"Content-type": "application/json; charset=UTF-8"}
         mock_response.json = mock.Mock(return_value=json)
+        mock_response.content = _json.dumps(json).encode("utf-8")
         return mock_response
 
     def test_raise_exception_on_incorrect_content_type(self):
@@ -101,6 +107,139 @@ class JSONResponseTests(unittest.TestCase):
         self.assertEqual(expected_content, response.fetch())
         self.assertEqual(expected_content, response.results)
 
+    def test_create_new_leaves_prototype_untouched(self):
+        prototype = JSONResponse(extract_section=["body"], create_attribute="body")
+        first = prototype.create_new()(self._create_mock_response(_POSTS[0]))
+        second = prototype.create_new()(self._create_mock_response(_POSTS[1]))
+
+        self.assertEqual(_POSTS[0]["body"], first.body)
+        self.assertEqual(_POSTS[1]["body"], second.body)
+        self.assertIsNone(prototype.fetch())
+        self.assertFalse(hasattr(prototype, "body"))
+
+    def test_decode_response_only_once(self):
+        mock_response = self._create_mock_response(_POSTS[0])
+
+        JSONResponse(extract_section=["body"], json_backend="json")(mock_response)
+
+        mock_response.json.assert_called_once_with()
+
+    def test_share_decoded_tree_between_raw_and_data(self):
+        mock_response = self._create_mock_response(copy.deepcopy(_POSTS[0]))
+
+        response = JSONResponse(extract_section=["body"])(mock_response)
+
+        self.assertIs(response.raw["body"], response.fetch())
+
+    def test_deep_copy_decoded_tree_on_request(self):
+        mock_response = self._create_mock_response(copy.deepcopy(_POSTS[0]))
+
+        response = JSONResponse(extract_section=["body"], deep_copy=True)(mock_response)
+
+        self.assertIsNot(response.raw["body"], response.fetch())
+        response.fetch()["intro"] = "veni, vidi, vici"
+        self.assertEqual(_POSTS[0]["body"]["intro"], response.raw["body"]["intro"])
+
+
+class JSONResponseBenchmarkTests(unittest.TestCase):
+    """Compare the memory use of parsing a large JSON response with and without copies.
+
+    The durations are not compared, as they depend too much on the load of the machine.
+
+    """
+
+    def setUp(self):
+        posts = [dict(post, id=index) for index in range(2000) for post in _POSTS]
+        self.content = _json.dumps({"data": {"posts": posts}}).encode("utf-8")
+
+    def _create_response(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-type"] = "application/json; charset=UTF-8"
+        response._content = self.content
+        return response
+
+    def _measure(self, parse):
+        """Return the peak memory in bytes of the given parse."""
+        response = self._create_response()
+        tracemalloc.start()
+        try:
+            parse(response)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    @staticmethod
+    def _parse_with_copies(response):
+        """Parse the response as JSONResponse did before, i.e. decode and copy it twice."""
+        raw = copy.deepcopy(response.json())
+        data = copy.deepcopy(response.json())["data"]["posts"]
+        return raw, data
+
+    def test_parse_without_copies_reduces_memory(self):
+        lean_peak = self._measure(JSONResponse(extract_section=["data", "posts"]))
+        copies_peak = self._measure(self._parse_with_copies)
+
+        self.assertLess(lean_peak, 0.6 * copies_peak)
+
+    def test_opt_in_deep_copy_only_copies_the_section(self):
+        lean_peak = self._measure(JSONResponse(extract_section=["data", "posts"]))
+        deep_copy_peak = self._measure(
+            JSONResponse(extract_section=["data", "posts"], deep_copy=True)
+        )
+        copies_peak = self._measure(self._parse_with_copies)
+
+        self.assertLess(lean_peak, deep_copy_peak)
+        self.assertLess(deep_copy_peak, copies_peak)
+
+
+class JSONResponseStreamTests(unittest.TestCase):
+    def _create_response(self, content: bytes):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-type"] = "application/json; charset=UTF-8"
+        response.raw = io.BytesIO(content)
+        return response
+
+    def test_extract_section_while_reading(self):
+        content = _json.dumps({"data": {"posts": _POSTS}, "count": 2}).encode("utf-8")
+        response = self._create_response(content)
+
+        json_response = JSONResponse(extract_section=["data", "posts"], stream=True, chunk_size=16)
+        json_response = json_response(response)
+
+        self.assertEqual(_POSTS, json_response.fetch())
+        self.assertEqual(_POSTS, json_response.results)
+        self.assertIsNone(json_response.raw)
+
+    def test_yield_elements_of_section_while_reading(self):
+        content = _json.dumps({"data": {"posts": _POSTS}, "count": 2}).encode("utf-8")
+        response = self._create_response(content)
+
+        json_response = JSONResponse(extract_section=["data", "posts"], stream_items=True)
+        posts = json_response(response).fetch()
+
+        self.assertIsInstance(posts, types.GeneratorType)
+        self.assertEqual(_POSTS, list(posts))
+
+    def test_memory_does_not_depend_on_skipped_content(self):
+        blob = "x" * 10_000_000
+        content = _json.dumps({"blob": blob, "data": {"posts": _POSTS}}).encode("utf-8")
+        del blob
+
+        response = self._create_response(content)
+        tracemalloc.start()
+        try:
+            json_response = JSONResponse(extract_section=["data", "posts"], stream=True)
+            posts = json_response(response).fetch()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(_POSTS, posts)
+        self.assertLess(peak, len(content) / 10)
+
 
 class CSVResponseTests(unittest.TestCase):
     def test_fetch_multiline_text_with_commas(self):
@@ -135,3 +274,64 @@ consequat."""
         regex = ".* response did not give a CSV but a application/json;.*"
         with self.assertRaisesRegex(TypeError, regex):
             _ = CSVResponse()(mock_response)  # noqa
+
+    def test_fetch_quoted_fields_according_to_rfc_4180(self):
+        mock_response = self._create_mock_response()
+        mock_response.content = b'id,text\r\n1,"a, b"\r\n2,"say ""hi""\r\nbye"\r\n'
+
+        response = CSVResponse()(mock_response)
+
+        expected_content = [["id", "text"], ["1", "a, b"], ["2", 'say "hi"\r\nbye']]
+        self.assertEqual(expected_content, response.fetch())
+
+    def test_fetch_rows_as_dict(self):
+        mock_response = self._create_mock_response()
+        mock_response.content = b"id,name\n1,alpha\n\n2,beta\n"
+
+        response = CSVResponse(rows_as_dict=True)(mock_response)
+
+        expected_content = [{"id": "1", "name": "alpha"}, {"id": "2", "name": "beta"}]
+        self.assertEqual(expected_content, response.fetch())
+
+
+class CSVResponseStreamTests(unittest.TestCase):
+    def _create_response(self, content: bytes):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-type"] = "text/csv; charset=UTF-8"
+        response.raw = io.BytesIO(content)
+        return response
+
+    def test_yield_rows_while_reading(self):
+        content = 'id,text\n1,"a,\nb"\n2,é\n'.encode("utf-8")
+        response = self._create_response(content)
+
+        csv_response = CSVResponse(stream=True, chunk_size=3)
+        rows = csv_response(response).fetch()
+
+        self.assertIsInstance(rows, types.GeneratorType)
+        self.assertIsNone(csv_response.raw)
+        self.assertEqual([["id", "text"], ["1", "a,\nb"], ["2", "é"]], list(rows))
+
+    def test_yield_rows_as_dict_while_reading(self):
+        response = self._create_response(b"id,name\n1,alpha\n2,beta")
+
+        csv_response = CSVResponse(stream=True, rows_as_dict=True)
+        rows = csv_response(response).fetch()
+
+        self.assertEqual([{"id": "1", "name": "alpha"}, {"id": "2", "name": "beta"}], list(rows))
+
+    def test_memory_does_not_depend_on_number_of_rows(self):
+        content = b"id,name\n" + b"".join(b"%d,name %d\n" % (i, i) for i in range(200_000))
+        response = self._create_response(content)
+
+        tracemalloc.start()
+        try:
+            rows = CSVResponse(stream=True)(response).fetch()
+            count = sum(1 for _ in rows)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(200_001, count)
+        self.assertLess(peak, len(content) / 10)
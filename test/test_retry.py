@@ -0,0 +1,254 @@
+import email.utils
+import time
+import unittest
+import unittest.mock as mock
+
+import ddt
+
+import qrest
+from qrest import BodyParameter, ResourceConfig
+from qrest.exception import (
+    RestClientConfigurationError,
+    RestTimeoutError,
+    RestUnspecificResponseError,
+)
+from qrest.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+from . import local_server
+
+
+class FlakyHandler(local_server.LocalHandler):
+    """Handler of a service that fails the first requests it receives."""
+
+    def _respond(self):
+        server = self.server
+        self._read_body()
+        server.requests.append(self.command)
+        if len(server.requests) <= server.failures:
+            if server.delay:
+                time.sleep(server.delay)
+            self._send(server.status, headers=server.headers)
+        else:
+            self._send(200, b'{"id": 1}', {"Content-Type": "application/json"})
+
+    do_GET = do_POST = do_PUT = _respond
+
+
+class FlakyServer(local_server.LocalServer):
+    handler_class = FlakyHandler
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self.failures = 0
+        self.status = 503
+        self.headers = {}
+        self.delay = 0
+
+
+class Post(local_server.Post):
+    timeout = (1000, 100)
+
+
+class CreatePost(ResourceConfig):
+    name = "create_post"
+    path = ["posts"]
+    method = "POST"
+
+    title = BodyParameter(name="title", required=True)
+
+
+class UpdatePost(ResourceConfig):
+    name = "update_post"
+    path = ["posts", "{id}"]
+    method = "PUT"
+    retry = RetryPolicy(max_attempts=2, backoff_factor=0.01)
+
+    title = BodyParameter(name="title", required=True)
+
+
+@ddt.ddt
+class RetryTests(local_server.LocalServerTestCase):
+    server_class = FlakyServer
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.create_api()
+
+    def create_api(self, retry=RetryPolicy(backoff_factor=0.01)):
+        return self.create_local_api([Post, CreatePost, UpdatePost], retry=retry)
+
+    @ddt.data(503, 429, 502, 504)
+    def test_retryable_status_is_retried(self, status):
+        self.server.status = status
+        self.server.failures = 2
+
+        self.assertEqual({"id": 1}, self.api.post(id=1))
+        self.assertEqual(["GET"] * 3, self.server.requests)
+
+    def test_last_response_is_raised_after_max_attempts(self):
+        self.server.failures = 5
+
+        with self.assertRaises(RestUnspecificResponseError):
+            self.api.post(id=1)
+        self.assertEqual(3, len(self.server.requests))
+
+    def test_other_status_is_not_retried(self):
+        self.server.status = 500
+        self.server.failures = 1
+
+        with self.assertRaises(qrest.exception.RestInternalServerError):
+            self.api.post(id=1)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_timeout_is_retried(self):
+        self.server.delay = 0.5
+        self.server.failures = 1
+
+        self.assertEqual({"id": 1}, self.api.post(id=1))
+        self.assertEqual(2, len(self.server.requests))
+
+    def test_timeout_is_raised_without_retries(self):
+        api = self.create_api(retry=RetryPolicy(errors=False))
+        self.server.delay = 0.5
+        self.server.failures = 1
+
+        with self.assertRaises(RestTimeoutError):
+            api.post(id=1)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_post_is_not_retried_by_default(self):
+        self.server.failures = 1
+
+        with self.assertRaises(RestUnspecificResponseError):
+            self.api.create_post(title="title")
+        self.assertEqual(["POST"], self.server.requests)
+
+    def test_resource_policy_overrides_api_policy(self):
+        self.server.failures = 2
+
+        with self.assertRaises(RestUnspecificResponseError):
+            self.api.update_post(id=1, title="title")
+        self.assertEqual(["PUT", "PUT"], self.server.requests)
+
+    @ddt.data(("seconds", 2.0), ("date", 30.0))
+    @ddt.unpack
+    def test_retry_after_sets_delay(self, retry_after_format, expected_delay):
+        if retry_after_format == "date":
+            retry_after = email.utils.formatdate(time.time() + expected_delay, usegmt=True)
+        else:
+            retry_after = str(int(expected_delay))
+        self.server.headers = {"Retry-After": retry_after}
+        self.server.failures = 1
+
+        with mock.patch("qrest.resource.time") as resource_time:
+            self.assertEqual({"id": 1}, self.api.post(id=1))
+
+        delay = resource_time.sleep.call_args.args[0]
+        self.assertAlmostEqual(expected_delay, delay, delta=2)
+
+    def test_long_retry_after_is_not_retried(self):
+        self.server.headers = {"Retry-After": "3600"}
+        self.server.failures = 1
+
+        with self.assertRaises(RestUnspecificResponseError):
+            self.api.post(id=1)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_retry_budget_limits_retries_of_api(self):
+        self.api._retry_budget._balance = 2
+        self.server.failures = 100
+
+        for _ in range(3):
+            with self.assertRaises(RestUnspecificResponseError):
+                self.api.post(id=1)
+
+        # 3 requests and the 2 retries of the balance
+        self.assertEqual(5, len(self.server.requests))
+
+    def test_retries_in_map_and_async_calls(self):
+        import asyncio
+
+        self.server.failures = 1
+        self.assertEqual([{"id": 1}], self.api.post.map([{"id": 1}]))
+
+        self.server.requests.clear()
+        self.server.failures = 1
+        self.assertEqual({"id": 1}, asyncio.run(self.api.post.acall(id=1)))
+        self.assertEqual(2, len(self.server.requests))
+
+
+@ddt.ddt
+class RetryPolicyTests(unittest.TestCase):
+    def test_backoff_doubles_up_to_maximum(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([1, 2, 4, 5], [policy.backoff(attempt) for attempt in range(1, 5)])
+
+    def test_jitter_stays_below_backoff(self):
+        policy = RetryPolicy(backoff_factor=1)
+
+        delays = [policy.backoff(3) for _ in range(100)]
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_delay_stops_at_max_attempts(self):
+        policy = RetryPolicy(max_attempts=2, jitter=False)
+
+        self.assertEqual(0.5, policy.delay(1))
+        self.assertIsNone(policy.delay(2))
+
+    def test_allows_idempotent_methods_by_default(self):
+        policy = RetryPolicy()
+
+        self.assertEqual([True, True, False], [policy.allows(m) for m in ["GET", "PUT", "POST"]])
+        self.assertTrue(RetryPolicy(methods=["post"]).allows("POST"))
+        self.assertFalse(RetryPolicy(max_attempts=1).allows("GET"))
+
+    @ddt.data(
+        {"max_attempts": 0},
+        {"max_attempts": 1.5},
+        {"backoff_factor": -1},
+        {"max_backoff": "1"},
+        {"jitter": 1},
+    )
+    def test_invalid_policy(self, kwargs):
+        with self.assertRaises(RestClientConfigurationError):
+            RetryPolicy(**kwargs)
+
+    def test_invalid_policy_in_configuration(self):
+        with self.assertRaisesRegex(RestClientConfigurationError, "retry must be a RetryPolicy"):
+            ResourceConfig(path=["posts"], method="GET", retry=3)
+
+    @ddt.data((None, None), ("", None), ("120", 120.0), ("soon", None), ("-1", None))
+    @ddt.unpack
+    def test_parse_retry_after(self, value, expected):
+        self.assertEqual(expected, parse_retry_after(value))
+
+    def test_parse_retry_after_date_in_past(self):
+        self.assertEqual(0.0, parse_retry_after(email.utils.formatdate(0, usegmt=True)))
+
+
+class RetryBudgetTests(unittest.TestCase):
+    def test_requests_refill_budget_up_to_reserve(self):
+        budget = RetryBudget(ratio=0.5, reserve=2)
+
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+        for _ in range(10):
+            budget.deposit()
+        self.assertEqual(2, budget.balance)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(RestClientConfigurationError):
+            RetryBudget(ratio=-0.1)
+        with self.assertRaisesRegex(RestClientConfigurationError, "non-negative integer"):
+            RetryBudget(reserve=1.5)
+        self.assertEqual(0, RetryBudget(reserve=0).balance)
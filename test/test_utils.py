@@ -1,5 +1,7 @@
 import unittest
-from qrest.utils import URLValidator
+from unittest import mock
+
+from qrest.utils import URLTemplate, URLValidator, decode_chunks, split_lines
 from qrest.exception import RestClientConfigurationError
 
 
@@ -28,3 +30,61 @@ class TestURLValidator(unittest.TestCase):
 
         with self.assertRaises(RestClientConfigurationError):
             self.validator.check("test", require_path=True)
+
+
+class TestURLTemplate(unittest.TestCase):
+    def test_build_url_with_quoted_path_parameters(self):
+        template = URLTemplate("http://localhost/api/", ["posts", "{item}", "comments"])
+
+        self.assertEqual(
+            "http://localhost/api/posts/a%2Fb/comments", template.build({"item": "a/b"})
+        )
+        self.assertEqual(
+            "http://localhost/api/posts/1/comments", template.build({"item": 1, "other": 2})
+        )
+
+    def test_build_url_with_dot_segments_as_before(self):
+        template = URLTemplate("http://localhost/api/", ["posts", "{item}"])
+
+        self.assertEqual("http://localhost/api/", template.build({"item": ".."}))
+        self.assertEqual("http://localhost/api/posts/", template.build({"item": ""}))
+
+    def test_validate_url_only_once(self):
+        with mock.patch.object(URLValidator, "check") as check:
+            template = URLTemplate("http://localhost", ["posts", "{item}"])
+            template.build({"item": 1})
+            template.build({"item": 2})
+
+        self.assertEqual(1, check.call_count)
+
+    def test_raise_exception_on_build_of_invalid_url(self):
+        template = URLTemplate("http://localhost", [""])
+
+        for _ in range(2):
+            with self.assertRaisesRegex(RestClientConfigurationError, "has no valid path"):
+                template.build({})
+
+
+class TestChunks(unittest.TestCase):
+    def test_decode_characters_split_over_chunks(self):
+        content = "é ü ∑".encode("utf-8")
+        chunks = [bytes([byte]) for byte in content]
+
+        self.assertEqual("é ü ∑", "".join(decode_chunks(chunks)))
+
+    def test_split_lines_over_chunks(self):
+        chunks = ["a,b\r", "\nc,", "d\n\ne", ",f"]
+
+        self.assertEqual(["a,b\r\n", "c,d\n", "\n", "e,f"], list(split_lines(chunks)))
+
+    def test_split_lines_with_carriage_returns(self):
+        chunks = ["a,b\r", "c,d\r", "\r", "\ne,f\r"]
+
+        self.assertEqual(["a,b\r", "c,d\r", "\r\n", "e,f\r"], list(split_lines(chunks)))
+
+    def test_split_lines_at_every_offset(self):
+        text = "a\r\nb\rc\n\r\r\nd\r"
+
+        for offset in range(len(text) + 1):
+            chunks = [text[:offset], text[offset:]]
+            self.assertEqual(text.splitlines(keepends=True), list(split_lines(chunks)))